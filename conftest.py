@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def thumbnails_in_committing_thread(settings):
+    """Generate post thumbnails without worker threads, like the project
+    test runner: they would race test database flushes and media
+    cleanup."""
+    settings.THUMBNAIL_ASYNC = False
@@ -0,0 +1,6 @@
+"""JSON API exceptions."""
+
+
+class BadRequest(Exception):
+    """Invalid request parameter, returned as 400 response with the
+    exception message."""
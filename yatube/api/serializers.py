@@ -0,0 +1,108 @@
+"""Serializers of ``values()`` rows.
+
+Rows are fetched with ``values()`` of only requested fields, related
+fields (e.g. ``author__username``) are joined by the same query, so
+model instances are never created for big pages.
+"""
+from django.core.files.storage import default_storage
+
+from .exceptions import BadRequest
+
+
+def image_url(name):
+    return default_storage.url(name) if name else None
+
+
+def counter(value):
+    # Counters row is created lazily
+    return value or 0
+
+
+class Serializer:
+    """Serialize queryset rows to dicts of requested fields.
+
+    ``fields`` maps public field names to ORM lookups, ``transforms``
+    maps public field names to functions converting their values.
+    """
+
+    fields = {}
+    transforms = {}
+
+    def __init__(self, fields=None):
+        """Optional arguments: fields (comma separated field names,
+        all fields by default). Raise BadRequest on unknown field."""
+        names = fields.split(',') if fields else list(self.fields)
+        unknown = set(names) - set(self.fields)
+        if unknown:
+            raise BadRequest(f'Unknown fields: {", ".join(sorted(unknown))}')
+        self.names = names
+        self.lookups = [self.fields[name] for name in names]
+
+    def values(self, queryset, *extra):
+        """Return values queryset of requested and extra lookups."""
+        return queryset.values(*dict.fromkeys(self.lookups + list(extra)))
+
+    def serialize(self, rows):
+        pairs = list(zip(self.names, self.lookups))
+        data = [{name: row[lookup] for name, lookup in pairs}
+                for row in rows]
+        for name, transform in self.transforms.items():
+            if name in self.names:
+                for item in data:
+                    item[name] = transform(item[name])
+        return data
+
+    def serialize_one(self, row):
+        return self.serialize([row])[0]
+
+
+class PostSerializer(Serializer):
+    fields = {
+        'id': 'pk',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'updated_at': 'updated_at',
+        'author': 'author__username',
+        'group': 'group__slug',
+        'image': 'image',
+        'comments_count': 'stats__comments_count',
+    }
+    transforms = {
+        'image': image_url,
+        'comments_count': counter,
+    }
+
+
+class CommentSerializer(Serializer):
+    fields = {
+        'id': 'pk',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created': 'created',
+    }
+
+
+class GroupSerializer(Serializer):
+    fields = {
+        'id': 'pk',
+        'slug': 'slug',
+        'title': 'title',
+        'description': 'description',
+    }
+
+
+class UserSerializer(Serializer):
+    fields = {
+        'username': 'username',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'posts_count': 'stats__posts_count',
+        'followers_count': 'stats__followers_count',
+        'following_count': 'stats__following_count',
+    }
+    transforms = {
+        'posts_count': counter,
+        'followers_count': counter,
+        'following_count': counter,
+    }
@@ -0,0 +1,207 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+@override_settings(API_PAGE_LIMIT=3)
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Group', slug='group', description='Description'
+        )
+        Post.objects.bulk_create([
+            Post(author=cls.author, group=cls.group, text=f'Post {i}')
+            for i in range(7)
+        ])
+        call_command('reconcile_counters', stdout=StringIO())
+        cls.posts = list(Post.objects.order_by('-pub_date', '-pk'))
+        cls.post = cls.posts[0]
+        Comment.objects.create(
+            post=cls.post, author=cls.reader, text='Comment'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.reader_client = Client()
+        self.reader_client.force_login(ApiTests.reader)
+
+    def get_all(self, url, client=None):
+        """Return ids of items of all pages following next links."""
+        client = client or self.client
+        ids = []
+        while url:
+            data = client.get(url).json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_cursor_pagination(self):
+        """Lists return all items through next links."""
+        post_ids = [post.pk for post in ApiTests.posts]
+        urls = {
+            reverse('api:post_list'): post_ids,
+            reverse('api:group_posts', kwargs={'slug': 'group'}): post_ids,
+            reverse('api:user_posts', kwargs={'username': 'author'}):
+                post_ids,
+            reverse('api:user_posts', kwargs={'username': 'reader'}): [],
+            reverse('api:group_list'): [ApiTests.group.pk],
+        }
+        for url, expected in urls.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.get_all(url), expected)
+
+    def test_sparse_fields(self):
+        """Only requested fields are returned."""
+        data = self.client.get(
+            reverse('api:post_list'), {'fields': 'id,author'}
+        ).json()
+        self.assertEqual(
+            data['results'][0],
+            {'id': ApiTests.post.pk, 'author': 'author'},
+            'Incorrect sparse fields'
+        )
+        response = self.client.get(
+            reverse('api:post_list'), {'fields': 'id,password'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_detail(self):
+        """Post detail has related fields and counters."""
+        data = self.client.get(
+            reverse('api:post_detail', kwargs={'post_id': ApiTests.post.pk})
+        ).json()
+        expected = {
+            'id': ApiTests.post.pk,
+            'text': ApiTests.post.text,
+            'author': 'author',
+            'group': 'group',
+            'image': None,
+            'comments_count': 1,
+        }
+        for field, value in expected.items():
+            with self.subTest(field=field):
+                self.assertEqual(data[field], value)
+
+    def test_user_detail(self):
+        """User detail has counters."""
+        data = self.client.get(
+            reverse('api:user_detail', kwargs={'username': 'author'})
+        ).json()
+        self.assertEqual(data['posts_count'], 7, 'Incorrect posts count')
+
+    def test_user_without_counters(self):
+        """User created in bulk without counters row has zero counters."""
+        User.objects.bulk_create([User(username='bulk')])
+        data = self.client.get(
+            reverse('api:user_detail', kwargs={'username': 'bulk'})
+        ).json()
+        for field in ('posts_count', 'followers_count', 'following_count'):
+            with self.subTest(field=field):
+                self.assertEqual(data[field], 0)
+
+    def test_unexpected_error_not_hidden(self):
+        """Only invalid parameters are returned as 400, other errors are
+        raised."""
+        with mock.patch(
+            'api.views.get_cursor_page_object', side_effect=ValueError
+        ):
+            with self.assertRaises(ValueError):
+                self.client.get(reverse('api:post_list'))
+
+    def test_not_found(self):
+        """Missing objects return JSON 404."""
+        urls = (
+            reverse('api:post_detail', kwargs={'post_id': 0}),
+            reverse('api:comments', kwargs={'post_id': 0}),
+            reverse('api:group_posts', kwargs={'slug': 'missing'}),
+            reverse('api:user_detail', kwargs={'username': 'missing'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertIn('detail', response.json())
+
+    def test_etag(self):
+        """Unchanged list returns 304, changed list new ETag."""
+        url = reverse('api:post_list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Post.objects.create(author=ApiTests.author, text='New post')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag, 'ETag is not changed')
+
+    def test_follow_and_feed(self):
+        """Follow and unfollow change follow feed."""
+        url = reverse('api:user_follow', kwargs={'username': 'author'})
+        feed_url = reverse('api:feed')
+        self.assertEqual(self.client.get(feed_url).status_code, 401)
+        etag = self.reader_client.get(feed_url)['ETag']
+        self.assertEqual(
+            self.reader_client.post(url).json(),
+            {'following': True, 'changed': True}
+        )
+        self.assertTrue(
+            Follow.objects.filter(
+                user=ApiTests.reader, author=ApiTests.author
+            ).exists(),
+            'Follow is not created'
+        )
+        response = self.reader_client.get(
+            feed_url, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200, 'Feed is not changed')
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertEqual(
+            self.reader_client.delete(url).json(),
+            {'following': False, 'changed': True}
+        )
+
+    def test_suggestions(self):
+        """Authors followed by followees are suggested to the user."""
+        url = reverse('api:suggestions')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        other = User.objects.create_user(username='other')
+        Follow.objects.create(user=ApiTests.reader, author=other)
+        Follow.objects.create(user=other, author=ApiTests.author)
+        response = self.reader_client.get(f'{url}?fields=username')
+        self.assertEqual(
+            response.json(), {'results': [{'username': 'author'}]}
+        )
+
+    def test_comments(self):
+        """Comments are listed and added by authenticated user."""
+        url = reverse('api:comments', kwargs={'post_id': ApiTests.post.pk})
+        self.assertEqual(len(self.get_all(url)), 1)
+        response = self.client.post(
+            url, json.dumps({'text': 'New'}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 401)
+        response = self.reader_client.post(
+            url, json.dumps({'text': 'New'}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['author'], 'reader')
+        response = self.reader_client.post(
+            url, json.dumps({'text': ''}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.get_all(url)), 2)
@@ -0,0 +1,30 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.post_list, name='post_list'),
+    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.comments,
+        name='comments'
+    ),
+    path('groups/', views.group_list, name='group_list'),
+    path('groups/<slug:slug>/posts/', views.group_posts, name='group_posts'),
+    path('users/<str:username>/', views.user_detail, name='user_detail'),
+    path(
+        'users/<str:username>/posts/',
+        views.user_posts,
+        name='user_posts'
+    ),
+    path(
+        'users/<str:username>/follow/',
+        views.user_follow,
+        name='user_follow'
+    ),
+    path('feed/', views.feed, name='feed'),
+    path('suggestions/', views.suggestions, name='suggestions'),
+]
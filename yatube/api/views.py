@@ -0,0 +1,250 @@
+import json
+from functools import wraps
+
+from core.cache import versioned_condition
+from core.paginator import get_cursor_page_object
+from core.transaction import atomic
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods
+from posts.feed import get_feed
+from posts.follows import follow, unfollow
+from posts.graph import suggest_authors
+from posts.forms import CommentForm
+from posts.models import Comment, Group, Post
+from posts.versions import (FEEDS_VERSION, POSTS_VERSION, comments_version,
+                            feed_version, profile_version)
+
+from .exceptions import BadRequest
+from .serializers import (CommentSerializer, GroupSerializer, PostSerializer,
+                          UserSerializer)
+
+User = get_user_model()
+
+POSTS_ORDERING = ('-pub_date', '-pk')
+COMMENTS_ORDERING = ('-created', '-pk')
+
+
+def error(status, detail):
+    return JsonResponse({'detail': detail}, status=status)
+
+
+def api_view(methods, login=False):
+    """JSON API view decorator.
+
+    Required arguments: methods (list of allowed HTTP methods).
+    Optional arguments: login (Boolean) - view requires authenticated
+    user. Errors are returned as JSON ``{"detail": message}``.
+    """
+    def decorator(view):
+        @require_http_methods(methods)
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if login and not request.user.is_authenticated:
+                return error(401, 'Authentication required.')
+            try:
+                return view(request, *args, **kwargs)
+            except Http404:
+                return error(404, 'Not found.')
+            except BadRequest as exception:
+                return error(400, str(exception))
+        return wrapper
+    return decorator
+
+
+def posts_versions(request, *args, **kwargs):
+    return (POSTS_VERSION,)
+
+
+def post_versions(request, post_id):
+    return (POSTS_VERSION, comments_version(post_id))
+
+
+def user_versions(request, username):
+    return (POSTS_VERSION, profile_version(username))
+
+
+def feed_versions(request):
+    return (POSTS_VERSION, FEEDS_VERSION, feed_version(request.user.pk))
+
+
+def get_limit(request):
+    """Return page size from 'limit' GET parameter."""
+    limit = request.GET.get('limit')
+    if limit is None:
+        return settings.API_PAGE_LIMIT
+    if not limit.isdigit() or not 0 < int(limit) <= settings.API_MAX_LIMIT:
+        raise BadRequest(
+            f'Limit must be from 1 to {settings.API_MAX_LIMIT}.'
+        )
+    return int(limit)
+
+
+def get_page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+def paginate(request, queryset, serializer_class, ordering):
+    """Return JSON response with cursor page of serialized rows.
+
+    Only fields from 'fields' GET parameter are fetched and returned.
+    """
+    serializer = serializer_class(request.GET.get('fields'))
+    rows = serializer.values(
+        queryset, *(name.lstrip('-') for name in ordering)
+    )
+    page = get_cursor_page_object(
+        request, rows, get_limit(request), ordering=ordering
+    )
+    return JsonResponse({
+        'results': serializer.serialize(page),
+        'next': get_page_url(request, page.next_cursor()),
+        'previous': get_page_url(request, page.previous_cursor()),
+    })
+
+
+def detail(request, queryset, serializer_class, **lookup):
+    """Return JSON response with one serialized row."""
+    serializer = serializer_class(request.GET.get('fields'))
+    row = serializer.values(queryset.filter(**lookup)).first()
+    if row is None:
+        raise Http404
+    return JsonResponse(serializer.serialize_one(row))
+
+
+@api_view(['GET', 'HEAD'])
+@versioned_condition(posts_versions, vary_on_user=False)
+def post_list(request):
+    """All posts."""
+    return paginate(
+        request, Post.objects.all(), PostSerializer, POSTS_ORDERING
+    )
+
+
+@api_view(['GET', 'HEAD'])
+@versioned_condition(post_versions, vary_on_user=False)
+def post_detail(request, post_id):
+    """Post."""
+    return detail(request, Post.objects.all(), PostSerializer, pk=post_id)
+
+
+@api_view(['GET', 'HEAD'])
+@versioned_condition(posts_versions, vary_on_user=False)
+def group_list(request):
+    """All groups."""
+    return paginate(
+        request, Group.objects.all(), GroupSerializer, ('title', 'pk')
+    )
+
+
+@api_view(['GET', 'HEAD'])
+@versioned_condition(posts_versions, vary_on_user=False)
+def group_posts(request, slug):
+    """Posts of the group."""
+    group = get_object_or_404(Group.objects.only('pk'), slug=slug)
+    return paginate(
+        request, group.posts.all(), PostSerializer, POSTS_ORDERING
+    )
+
+
+@api_view(['GET', 'HEAD'])
+@versioned_condition(user_versions, vary_on_user=False)
+def user_detail(request, username):
+    """User profile with counters."""
+    return detail(
+        request, User.objects.all(), UserSerializer, username=username
+    )
+
+
+@api_view(['GET', 'HEAD'])
+@versioned_condition(posts_versions, vary_on_user=False)
+def user_posts(request, username):
+    """Posts of the user."""
+    author = get_object_or_404(User.objects.only('pk'), username=username)
+    return paginate(
+        request, author.posts.all(), PostSerializer, POSTS_ORDERING
+    )
+
+
+@api_view(['GET', 'HEAD'], login=True)
+@versioned_condition(feed_versions)
+def feed(request):
+    """Posts of authors followed by the user."""
+    return paginate(
+        request, get_feed(request.user), PostSerializer, POSTS_ORDERING
+    )
+
+
+@api_view(['GET', 'HEAD'], login=True)
+def suggestions(request):
+    """Authors followed by followees of the user, most followed first.
+
+    Not conditional: suggestions change with follows of followees.
+    """
+    serializer = UserSerializer(request.GET.get('fields'))
+    author_ids = suggest_authors(request.user.pk)[:get_limit(request)]
+    rows = {
+        row['pk']: row for row in serializer.values(
+            User.objects.filter(pk__in=author_ids), 'pk'
+        )
+    }
+    return JsonResponse({'results': serializer.serialize(
+        rows[pk] for pk in author_ids if pk in rows
+    )})
+
+
+@api_view(['GET', 'HEAD'])
+@versioned_condition(post_versions, vary_on_user=False)
+def comment_list(request, post_id):
+    """Comments of the post."""
+    get_object_or_404(Post.objects.only('pk'), pk=post_id)
+    return paginate(
+        request, Comment.objects.filter(post_id=post_id),
+        CommentSerializer, COMMENTS_ORDERING
+    )
+
+
+def comments(request, post_id):
+    """Comments of the post: list (GET) or add comment (POST)."""
+    if request.method == 'POST':
+        return comment_create(request, post_id)
+    return comment_list(request, post_id)
+
+
+@api_view(['POST'], login=True)
+@atomic(immediate=True)
+def comment_create(request, post_id):
+    """Add comment to the post, comment text is sent as JSON object."""
+    post = get_object_or_404(Post.objects.only('pk'), pk=post_id)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return error(400, 'Invalid JSON.')
+    form = CommentForm(data if isinstance(data, dict) else None)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    comment = form.save(commit=False)
+    comment.author = request.user
+    comment.post = post
+    comment.save()
+    serializer = CommentSerializer()
+    row = serializer.values(Comment.objects.filter(pk=comment.pk)).get()
+    return JsonResponse(serializer.serialize_one(row), status=201)
+
+
+@api_view(['POST', 'DELETE'], login=True)
+@atomic(immediate=True)
+def user_follow(request, username):
+    """Follow (POST) or unfollow (DELETE) the user."""
+    author = get_object_or_404(User, username=username)
+    if request.method == 'POST':
+        state = follow(request.user, author)
+    else:
+        state = unfollow(request.user, author)
+    return JsonResponse(state._asdict())
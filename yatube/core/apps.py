@@ -1,5 +1,18 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .sqlite import apply_pragmas
+        connection_created.connect(apply_pragmas)
+        from .metrics import instrument_templates
+        instrument_templates()
+        from .url_builder import compile_urls
+        compile_urls()
+        if settings.PRECOMPILED_TEMPLATES:
+            from .template_loaders import warm_templates
+            warm_templates()
@@ -0,0 +1,168 @@
+"""ASGI adapter of the Django WSGI handler.
+
+Django 2.2 has no ASGI support, ``ASGIHandler`` runs the WSGI
+application in a pool of ``settings.ASGI_THREADS`` threads. The event
+loop only receives request bodies and sends responses, so slow clients
+and idle keep-alive connections hold no request thread.
+"""
+import asyncio
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+# Marks exhausted streaming response iterator
+_DONE = object()
+
+
+def get_environ(scope, body):
+    """Return WSGI environ of the ASGI HTTP connection scope."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        # WSGI strings are bytes decoded as latin-1
+        'PATH_INFO': scope['path'].encode().decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin-1')
+        if name in environ:
+            value = f'{environ[name]},{value}'
+        environ[name] = value
+    return environ
+
+
+class ASGIHandler:
+    """ASGI 3 application serving Django in worker threads."""
+
+    def __init__(self, wsgi_application=None):
+        self.wsgi_application = wsgi_application or get_wsgi_application()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.ASGI_THREADS,
+                    thread_name_prefix='asgi'
+                )
+            return self._executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported scope type {scope['type']}")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                    self._executor = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        """Return request body file or None if client disconnected."""
+        body = tempfile.SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            body.write(message.get('body', b''))
+            if not message.get('more_body', False):
+                body.seek(0)
+                return body
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            status, headers, content, chunks = await loop.run_in_executor(
+                self.executor, self.respond, get_environ(scope, body)
+            )
+            await send({
+                'type': 'http.response.start',
+                'status': status,
+                'headers': headers,
+            })
+            if chunks is None:
+                await send({'type': 'http.response.body', 'body': content})
+                return
+            try:
+                await self.stream(loop, chunks, send)
+            finally:
+                await loop.run_in_executor(self.executor, chunks.close)
+        finally:
+            body.close()
+
+    def respond(self, environ):
+        """Run WSGI application, return (status, headers, content,
+        None) or (status, headers, None, iterable) for streaming
+        responses."""
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        response = self.wsgi_application(environ, start_response)
+        if getattr(response, 'streaming', False):
+            return started['status'], started['headers'], None, response
+        try:
+            content = b''.join(response)
+        finally:
+            # Sends request_finished signal closing old connections
+            if hasattr(response, 'close'):
+                response.close()
+        return started['status'], started['headers'], content, None
+
+    async def stream(self, loop, chunks, send):
+        iterator = iter(chunks)
+        while True:
+            chunk = await loop.run_in_executor(
+                self.executor, next, iterator, _DONE
+            )
+            if chunk is _DONE:
+                break
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': True,
+            })
+        await send({'type': 'http.response.body', 'body': b''})
@@ -0,0 +1,194 @@
+"""Versioned cache helpers.
+
+Cached data is keyed by version stamps of the objects it depends on.
+Changing an object bumps its version, so dependent cache entries are
+never read again and expire by LRU/timeout instead of explicit delete.
+Versions are kept for ``settings.VERSION_CACHE_TIMEOUT``: a process-local
+cache does not see bumps of other processes, its versions expire and
+restart from the current time.
+"""
+import hashlib
+import math
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.views.decorators.http import condition
+
+from . import metrics
+
+VERSION_KEY = 'version:{}'
+MODIFIED_KEY = 'modified:{}'
+PAGE_KEY = 'page:{}:{}:{}:{}'
+
+
+def _initial_version():
+    # Lost version must not restart from a value used before,
+    # start from current time in milliseconds instead of 1.
+    return int(time.time() * 1000)
+
+
+def get_versions(*names):
+    """Return {name: version} dict for names, fetched in one cache call."""
+    keys = {VERSION_KEY.format(name): name for name in names}
+    versions = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        for key, version in missing.items():
+            cache.add(key, version, settings.VERSION_CACHE_TIMEOUT)
+        versions.update(cache.get_many(missing))
+    return {keys[key]: versions.get(key) for key in keys}
+
+
+def bump_version(name):
+    """Change version of the name to invalidate dependent cache entries."""
+    _incr_version(name)
+    # Bump again after commit: page cached by concurrent request
+    # from not yet committed data must not be reused.
+    transaction.on_commit(lambda: _incr_version(name))
+
+
+def _incr_version(name):
+    key = VERSION_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), settings.VERSION_CACHE_TIMEOUT)
+    cache.set(
+        MODIFIED_KEY.format(name), time.time(),
+        settings.VERSION_CACHE_TIMEOUT
+    )
+
+
+def get_last_modified(*names):
+    """Return time of the last change of data with version names.
+
+    Unknown change time (lost or never bumped version) is taken as now,
+    so stale pages are never reported as not modified.
+    """
+    keys = [MODIFIED_KEY.format(name) for name in names]
+    stamps = cache.get_many(keys)
+    now = time.time()
+    for key in keys:
+        if key not in stamps:
+            cache.add(key, now, settings.VERSION_CACHE_TIMEOUT)
+            stamps[key] = cache.get(key, now)
+    # Last-Modified has seconds precision, round up so a change made
+    # in the same second as the previous one is not hidden.
+    return datetime.fromtimestamp(
+        math.ceil(max(stamps.values())), tz=timezone.utc
+    )
+
+
+def get_page_key(request, view_name, versions, vary_on_user=True):
+    """Return page cache key.
+
+    Anonymous users share cached pages, authenticated users pages are
+    cached separately as they show user specific header and buttons.
+    Pages without user specific content are shared if vary_on_user
+    is False.
+    """
+    user_id = 0
+    if vary_on_user and request.user.is_authenticated:
+        user_id = request.user.pk
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    stamp = '.'.join(
+        f'{name}={version}' for name, version in sorted(versions.items())
+    )
+    return PAGE_KEY.format(view_name, user_id, path, stamp)
+
+
+def get_etag(request, versions, vary_on_user=True, vary_on_csrf=False):
+    """Return ETag of the page for the user built from data versions.
+
+    ETag of a page with CSRF token changes with the CSRF cookie, so
+    a form cached by browser is not reused after the token is rotated
+    (e.g. on login).
+    """
+    key = get_page_key(request, 'etag', versions, vary_on_user)
+    if vary_on_csrf:
+        key += ':' + request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def versioned_etag(get_version_names, vary_on_user=True, vary_on_csrf=False):
+    """Return ETag function for ``condition()`` view decorator.
+
+    Required arguments: get_version_names (function taking the view
+    arguments and returning names of versions the page depends on).
+    Optional arguments: vary_on_user (Boolean) - page content depends
+    on the user, vary_on_csrf (Boolean) - page has a form with CSRF
+    token. ETag is computed from cached versions without database
+    queries.
+    """
+    def etag(request, *args, **kwargs):
+        return get_etag(
+            request,
+            get_versions(*get_version_names(request, *args, **kwargs)),
+            vary_on_user,
+            vary_on_csrf
+        )
+    return etag
+
+
+def versioned_condition(get_version_names, vary_on_user=True,
+                        vary_on_csrf=False):
+    """Answer conditional GET requests with 304 Not Modified.
+
+    Required arguments: get_version_names (function taking the view
+    arguments and returning names of versions the page depends on).
+    Optional arguments: vary_on_user (Boolean) - page content depends
+    on the user, vary_on_csrf (Boolean) - page has a form with CSRF
+    token.
+    ETag and Last-Modified validators are computed from cached versions
+    and change times, so the view is not run for unchanged pages. Pages
+    with CSRF token have ETag only: change time does not tell that the
+    token is rotated.
+    """
+    def last_modified(request, *args, **kwargs):
+        return get_last_modified(
+            *get_version_names(request, *args, **kwargs)
+        )
+    return condition(
+        etag_func=versioned_etag(
+            get_version_names, vary_on_user, vary_on_csrf
+        ),
+        last_modified_func=None if vary_on_csrf else last_modified
+    )
+
+
+def versioned_cache_page(get_version_names, timeout, vary_on_user=True):
+    """Cache view response until versions of its data are changed.
+
+    Required arguments: get_version_names (function taking the view
+    arguments and returning names of versions the page depends on),
+    timeout (Integer, cache timeout in seconds).
+    Optional arguments: vary_on_user (Boolean) - page content depends
+    on the user.
+    """
+    def decorator(view):
+        view_name = f'{view.__module__}.{view.__name__}'
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            versions = get_versions(
+                *get_version_names(request, *args, **kwargs)
+            )
+            key = get_page_key(request, view_name, versions, vary_on_user)
+            response = cache.get(key)
+            if response is not None:
+                metrics.record_cache(hits=1)
+                return response
+            metrics.record_cache(misses=1)
+            response = view(request, *args, **kwargs)
+            if (response.status_code == 200 and not response.streaming
+                    and not response.cookies):
+                cache.set(key, response, timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,251 @@
+"""SQLite cache backend shared by worker processes of one host.
+
+Entries are kept in one SQLite database file in WAL mode, so readers of
+all worker processes do not block each other and the writer. When
+``MAX_ENTRIES`` is exceeded least recently used entries are evicted.
+Hit/miss counters are shared by processes and returned by ``stats()``.
+
+Settings example::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache_backends.SQLiteCache',
+            'LOCATION': '/var/tmp/yatube/cache.sqlite3',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache ('
+    ' key TEXT PRIMARY KEY, value BLOB NOT NULL,'
+    ' expires REAL, accessed REAL NOT NULL) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)',
+    'CREATE TABLE IF NOT EXISTS stats ('
+    ' id INTEGER PRIMARY KEY CHECK (id = 1),'
+    ' hits INTEGER NOT NULL, misses INTEGER NOT NULL)',
+    'INSERT OR IGNORE INTO stats (id, hits, misses) VALUES (1, 0, 0)',
+)
+# Access time of the entry is updated not more often, LRU is approximate
+# but reads do not turn into writes.
+ACCESS_RESOLUTION = 10
+# Entries count is checked once per number of writes
+CULL_CHECK_INTERVAL = 100
+# Local hit/miss counters are added to shared ones once per number of reads
+STATS_FLUSH_INTERVAL = 100
+
+
+class SQLiteCache(BaseCache):
+    """SQLite file cache backend with LRU eviction."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.path = location
+        options = params.get('OPTIONS', {})
+        self.busy_timeout = options.get('BUSY_TIMEOUT', 5)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def _connection(self):
+        # Connections must not be shared by threads and forked processes
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = self._connect()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, isolation_level=None
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def _get_entry(self, key, now):
+        row = self._connection.execute(
+            'SELECT value, expires, accessed FROM cache WHERE key = ?',
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires, accessed = row
+        if expires is not None and expires <= now:
+            self._connection.execute(
+                'DELETE FROM cache WHERE key = ? AND expires <= ?',
+                (key, now)
+            )
+            return None
+        if now - accessed > ACCESS_RESOLUTION:
+            self._connection.execute(
+                'UPDATE cache SET accessed = ? WHERE key = ?', (now, key)
+            )
+        return value
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            if self._hits + self._misses < STATS_FLUSH_INTERVAL:
+                return
+            hits, misses = self._hits, self._misses
+            self._hits = self._misses = 0
+        self._flush_stats(hits, misses)
+
+    def _flush_stats(self, hits, misses):
+        self._connection.execute(
+            'UPDATE stats SET hits = hits + ?, misses = misses + ?',
+            (hits, misses)
+        )
+
+    def _cull(self, now):
+        with self._lock:
+            self._writes += 1
+            if self._writes % CULL_CHECK_INTERVAL:
+                return
+        connection = self._connection
+        connection.execute(
+            'DELETE FROM cache WHERE expires <= ?', (now,)
+        )
+        count = connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count <= self._max_entries:
+            return
+        # Evict least recently used entries as LocMemCache does:
+        # 1 / CULL_FREQUENCY of entries, all of them when it is 0.
+        evict = count
+        if self._cull_frequency:
+            evict = count - self._max_entries + count // self._cull_frequency
+        connection.execute(
+            'DELETE FROM cache WHERE key IN ('
+            ' SELECT key FROM cache ORDER BY accessed LIMIT ?)',
+            (evict,)
+        )
+
+    def _set(self, key, value, timeout, mode):
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        cursor = self._connection.execute(
+            f'{mode} INTO cache (key, value, expires, accessed) '
+            'VALUES (?, ?, ?, ?)',
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires, now)
+        )
+        self._cull(now)
+        return cursor.rowcount > 0
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        self._connection.execute(
+            'DELETE FROM cache WHERE key = ? AND expires <= ?',
+            (key, time.time())
+        )
+        return self._set(key, value, timeout, 'INSERT OR IGNORE')
+
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        value = self._get_entry(key, time.time())
+        if value is None:
+            self._count(misses=1)
+            return default
+        self._count(hits=1)
+        return pickle.loads(value)
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_key(key, version=version): key for key in keys}
+        for key in keys:
+            self.validate_key(key)
+        now = time.time()
+        result = {}
+        for key, original_key in keys.items():
+            value = self._get_entry(key, now)
+            if value is not None:
+                result[original_key] = pickle.loads(value)
+        self._count(hits=len(result), misses=len(keys) - len(result))
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        self._set(key, value, timeout, 'INSERT OR REPLACE')
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        now = time.time()
+        cursor = self._connection.execute(
+            'UPDATE cache SET expires = ?, accessed = ? '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), now, key, now)
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        self._connection.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def has_key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return self._get_entry(key, time.time()) is not None
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        connection = self._connection
+        # Read and write in one write transaction, so concurrent
+        # increments of worker processes are not lost.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            value = self._get_entry(key, time.time())
+            if value is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(value) + delta
+            connection.execute(
+                'UPDATE cache SET value = ? WHERE key = ?',
+                (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), key)
+            )
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return value
+
+    def clear(self):
+        self._connection.execute('DELETE FROM cache')
+
+    def close(self, **kwargs):
+        # Connections are kept open between requests
+        pass
+
+    def stats(self):
+        """Return hits, misses and entries count shared by processes."""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            self._hits = self._misses = 0
+        self._flush_stats(hits, misses)
+        hits, misses = self._connection.execute(
+            'SELECT hits, misses FROM stats'
+        ).fetchone()
+        entries = self._connection.execute(
+            'SELECT COUNT(*) FROM cache'
+        ).fetchone()[0]
+        return {'hits': hits, 'misses': misses, 'entries': entries}
@@ -0,0 +1,74 @@
+"""Concurrent independent database queries of a request.
+
+Functions passed to ``run_concurrently`` run in a pool of
+``settings.QUERY_THREADS`` worker threads, each thread has its own
+database connection, so their queries overlap. Workers read from the
+database of the request and record queries to its metrics.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import wraps
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from .db_router import bind_database
+from .metrics import bind_metrics
+
+_executor = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.QUERY_THREADS,
+                thread_name_prefix='queries'
+            )
+        return _executor
+
+
+def _in_transaction():
+    return any(connection.in_atomic_block for connection in connections.all())
+
+
+def _task(func):
+    func = bind_metrics(bind_database(func))
+
+    @wraps(func)
+    def task():
+        # Worker connections are reused like request connections
+        close_old_connections()
+        _local.worker = True
+        try:
+            return func()
+        finally:
+            _local.worker = False
+    return task
+
+
+def run_concurrently(*funcs):
+    """Call functions without arguments concurrently, return list of
+    their results. Exception of a function is raised.
+
+    Functions are called one by one in the current thread if
+    CONCURRENT_QUERIES is off, in a worker thread or inside a transaction,
+    as its data is not visible to other connections.
+    """
+    # Workers waiting for nested tasks could exhaust the pool
+    if (not settings.CONCURRENT_QUERIES or len(funcs) < 2
+            or getattr(_local, 'worker', False) or _in_transaction()):
+        return [func() for func in funcs]
+    executor = _get_executor()
+    futures = [executor.submit(_task(func)) for func in funcs[1:]]
+    # The first function runs in the current thread meanwhile
+    try:
+        first = funcs[0]()
+    except Exception:
+        # Workers must not outlive the request
+        wait(futures)
+        raise
+    return [first] + [future.result() for future in futures]
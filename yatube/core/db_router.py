@@ -0,0 +1,106 @@
+"""Read replicas database routing.
+
+Writes always go to the primary (``default``) database. Reads go to one
+of ``settings.REPLICA_DATABASES`` only inside requests allowed by
+``ReplicaRoutingMiddleware``: safe method requests to views not marked
+with ``@primary_db`` and not made shortly after a write of the same
+client (read-your-writes stickiness). Reads outside requests (management
+commands, worker threads) and after a write go to the primary.
+"""
+import random
+import threading
+from functools import wraps
+
+from django.conf import settings
+
+PRIMARY = 'default'
+STICKY_COOKIE = 'primary_db'
+
+_local = threading.local()
+
+
+def primary_db(view):
+    """Mark view to read from the primary database."""
+    view.use_primary_db = True
+    return view
+
+
+def mark_written():
+    """Make client reads sticky to the primary after a write made
+    outside the request thread."""
+    _local.wrote = True
+
+
+def get_replica():
+    """Return replica alias used by the current request or None."""
+    if getattr(_local, 'wrote', False):
+        return None
+    return getattr(_local, 'replica', None)
+
+
+def bind_database(func):
+    """Return func reading from the database of the current request
+    when called in another thread. Writes of func are not tracked."""
+    replica = get_replica()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        _local.replica = replica
+        _local.wrote = False
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.replica = None
+            _local.wrote = False
+    return wrapper
+
+
+class ReplicaRouter:
+    """Route reads of the current request to its replica."""
+
+    def db_for_read(self, model, **hints):
+        return get_replica() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        # Following reads of the request must see the written data
+        _local.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are copies of the primary database
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.REPLICA_DATABASES
+
+
+class ReplicaRoutingMiddleware:
+    """Choose database for reads of the request, make client reads
+    sticky to the primary for REPLICA_STICKY_SECONDS after a write."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _local.replica = None
+        _local.wrote = False
+        try:
+            response = self.get_response(request)
+            wrote = _local.wrote
+        finally:
+            _local.replica = None
+            _local.wrote = False
+        if wrote and settings.REPLICA_DATABASES:
+            response.set_cookie(
+                STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (settings.REPLICA_DATABASES
+                and request.method in ('GET', 'HEAD', 'OPTIONS')
+                and not getattr(view_func, 'use_primary_db', False)
+                and STICKY_COOKIE not in request.COOKIES
+                and not _local.wrote):
+            # One replica per request, so its reads are consistent
+            _local.replica = random.choice(settings.REPLICA_DATABASES)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateSyntaxError, engines
+
+from core.template_loaders import (Loader, get_precompiled_loaders,
+                                   warm_templates)
+
+
+class Command(BaseCommand):
+    help = ('Compile all templates of the template directories and print '
+            'compile time (ms) of each. Without precompiled templates '
+            'only checks that templates compile.')
+
+    def handle(self, *args, **options):
+        try:
+            loaders = get_precompiled_loaders()
+            if loaders:
+                # Templates compiled at startup are compiled again
+                for loader in loaders:
+                    loader.reset()
+                timings = warm_templates()
+            else:
+                engine = engines['django'].engine
+                timings = Loader(engine, settings.TEMPLATE_LOADERS).warm()
+        except TemplateSyntaxError as error:
+            raise CommandError(f'Template error: {error}')
+        for name, seconds in timings.items():
+            self.stdout.write(f'{name:<48} {seconds * 1000:8.2f} ms')
+        total = sum(timings.values()) * 1000
+        self.stdout.write(self.style.SUCCESS(
+            f'Compiled {len(timings)} templates in {total:.2f} ms'
+        ))
@@ -0,0 +1,203 @@
+"""Per view request metrics.
+
+``MetricsMiddleware`` records SQL queries count, DB time, template render
+time and cache hits of the request, returns them in ``Server-Timing``
+header and aggregates them by view name for ``core:metrics`` page.
+Query budgets of views are set in ``settings.QUERY_BUDGETS``.
+"""
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(Exception):
+    """View issued more SQL queries than its budget allows."""
+
+
+class RequestMetrics:
+    """Metrics of one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_time = 0.0
+        self._template_depth = 0
+        # Queries of the request may run in several threads
+        self._lock = threading.Lock()
+
+    def execute(self, execute, sql, params, many, context):
+        """Database execute wrapper counting queries and their time."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.db_time += time.perf_counter() - start
+                self.queries += 1
+
+    def server_timing(self):
+        """Return ``Server-Timing`` header value, durations in ms."""
+        return ', '.join((
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            (f'cache;desc="hits={self.cache_hits} '
+             f'misses={self.cache_misses}"'),
+            f'total;dur={self.total_time * 1000:.1f}',
+        ))
+
+
+class MetricsRegistry:
+    """In-process metrics aggregated by view name."""
+
+    FIELDS = ('queries', 'db_time', 'template_time', 'cache_hits',
+              'cache_misses', 'total_time')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, metrics):
+        with self._lock:
+            stats = self._views.setdefault(
+                view_name,
+                dict.fromkeys(self.FIELDS + ('requests', 'max_queries'), 0)
+            )
+            stats['requests'] += 1
+            stats['max_queries'] = max(stats['max_queries'], metrics.queries)
+            for field in self.FIELDS:
+                stats[field] += getattr(metrics, field)
+
+    def snapshot(self):
+        """Return {view name: totals and per request averages}."""
+        with self._lock:
+            views = {name: dict(stats) for name, stats in self._views.items()}
+        for stats in views.values():
+            for field in self.FIELDS:
+                stats[f'avg_{field}'] = stats[field] / stats['requests']
+        return views
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def get_current():
+    """Return metrics of the current request or None."""
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def tracking(metrics):
+    """Record queries of the current thread to metrics."""
+    _local.metrics = metrics
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(metrics.execute)
+                )
+            yield metrics
+    finally:
+        _local.metrics = None
+
+
+def bind_metrics(func):
+    """Return func recording metrics of the current request when called
+    in another thread."""
+    metrics = get_current()
+    if metrics is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with tracking(metrics):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record_cache(hits=0, misses=0):
+    """Count cache hits and misses of the current request."""
+    metrics = get_current()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def instrument_templates():
+    """Measure render time of templates returned by template engines."""
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, 'instrumented', False):
+        return
+    render = Template.render
+
+    @wraps(render)
+    def timed_render(self, *args, **kwargs):
+        metrics = get_current()
+        if metrics is None:
+            return render(self, *args, **kwargs)
+        # Templates rendered inside template (e.g. by template tags)
+        # are counted as part of the outer one
+        metrics._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            metrics._template_depth -= 1
+            if not metrics._template_depth:
+                metrics.template_time += time.perf_counter() - start
+
+    timed_render.instrumented = True
+    Template.render = timed_render
+
+
+def get_view_name(resolver_match):
+    """Return 'app_name:url_name' view name independent of URL namespace
+    instance name."""
+    if resolver_match.url_name:
+        return ':'.join(resolver_match.app_names + [resolver_match.url_name])
+    return resolver_match.view_name
+
+
+def check_query_budget(view_name, queries):
+    budget = settings.QUERY_BUDGETS.get(view_name)
+    if budget is None or queries <= budget:
+        return
+    message = f'{view_name} issued {queries} queries, budget is {budget}'
+    if settings.QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+class MetricsMiddleware:
+    """Record request metrics and add ``Server-Timing`` header."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with tracking(RequestMetrics()) as metrics:
+            response = self.get_response(request)
+        metrics.total_time = time.perf_counter() - start
+        response['Server-Timing'] = metrics.server_timing()
+        if request.resolver_match is not None:
+            view_name = get_view_name(request.resolver_match)
+            registry.record(view_name, metrics)
+            check_query_budget(view_name, metrics.queries)
+        return response
@@ -1,14 +1,214 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
+from django.db.models import Q
+
+from .concurrency import run_concurrently
+
+NEXT = 'n'
+PREVIOUS = 'p'
+# Range of integers stored by SQLite and other databases (64 bits)
+MIN_INTEGER = -2 ** 63
+MAX_INTEGER = 2 ** 63 - 1
 
 
-def get_page_object(request, queryset, limit):
+def get_page_object(request, queryset, limit, cursor=False):
     """Get page object function.
 
     Required arguments: request (HttpRequest), queryset (QuerySet),
     limit (Integer).
+    Optional arguments: cursor (Boolean) - use keyset pagination.
     Return paginator page object from queryset using page number
     from request and limit (number of items to display per page)
     """
+    if cursor:
+        return get_cursor_page_object(request, queryset, limit)
     paginator = Paginator(queryset, limit)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
+
+
+def get_loaded_page_object(request, queryset, limit, cursor=False):
+    """Get page object with loaded items function.
+
+    Arguments are the same as of get_page_object(). Count and items
+    queries of the requested page number run concurrently.
+    """
+    if cursor:
+        return get_cursor_page_object(request, queryset, limit)
+    paginator = Paginator(queryset, limit)
+    page_number = request.GET.get('page')
+    number = int(page_number) if str(page_number).isdigit() else 1
+    number = max(number, 1)
+    items = run_concurrently(
+        lambda: paginator.count,
+        lambda: list(queryset[(number - 1) * limit:number * limit])
+    )[1]
+    page = paginator.get_page(page_number)
+    # Out of range number is replaced with the last page
+    page.object_list = items if page.number == number else list(page)
+    return page
+
+
+def get_cursor_page_object(request, queryset, limit,
+                           ordering=('-pub_date', '-pk'), param='cursor'):
+    """Get cursor page object function.
+
+    Required arguments: request (HttpRequest), queryset (QuerySet),
+    limit (Integer).
+    Optional arguments: ordering (tuple of field names), param (name of
+    the cursor GET parameter).
+    Return keyset paginator page object using cursor token from request.
+    """
+    paginator = CursorPaginator(queryset, limit, ordering)
+    return paginator.get_page(request.GET.get(param))
+
+
+class CursorPaginator:
+    """Keyset (cursor) paginator.
+
+    Pages are selected by the ordering key of the page boundary item
+    (e.g. ``(pub_date, id)``) instead of OFFSET, no count query is done.
+    The last ordering field must be unique. Items of ``values()``
+    querysets must include ordering fields.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-pk')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(name.lstrip('-') for name in self.ordering)
+
+    def get_page(self, cursor=None):
+        """Return page after (or before) the cursor, first page if the
+        cursor is missing or invalid."""
+        direction, key = self.decode_cursor(cursor)
+        queryset = self.queryset
+        ordering = self.ordering
+        if key is not None:
+            queryset = queryset.filter(self._key_filter(key, direction))
+        if direction == PREVIOUS:
+            ordering = tuple(self._reverse(name) for name in ordering)
+        items = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if direction == PREVIOUS:
+            items.reverse()
+            return CursorPage(items, self, has_next=True,
+                              has_previous=has_more)
+        return CursorPage(items, self, has_next=has_more,
+                          has_previous=key is not None)
+
+    def encode_cursor(self, obj, direction):
+        """Return opaque cursor token pointing to the object (model
+        instance or ``values()`` dict)."""
+        key = []
+        for name in self.fields:
+            field = self._get_model_field(name)
+            item = obj
+            if isinstance(obj, dict):
+                item = SimpleNamespace(**{field.attname: obj[name]})
+            key.append(field.value_to_string(item))
+        data = json.dumps([direction, key])
+        return urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return (direction, key) pair, key is None for invalid cursor.
+
+        Cursor comes from the client, so key values must be of the
+        ordering fields types, not null and in the range of database
+        integers.
+        """
+        if not cursor:
+            return NEXT, None
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            direction, values = json.loads(
+                urlsafe_b64decode(cursor + padding).decode()
+            )
+            if direction not in (NEXT, PREVIOUS) or not isinstance(
+                    values, list) or len(values) != len(self.fields):
+                raise ValueError
+            key = [
+                self._get_model_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (binascii.Error, OverflowError, TypeError, ValueError,
+                ValidationError):
+            return NEXT, None
+        if not all(map(self._valid_key_value, key)):
+            return NEXT, None
+        return direction, key
+
+    @staticmethod
+    def _valid_key_value(value):
+        if isinstance(value, int):
+            return MIN_INTEGER <= value <= MAX_INTEGER
+        return value is not None
+
+    def _get_model_field(self, name):
+        opts = self.queryset.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def _key_filter(self, key, direction):
+        """Build (f1 < v1) OR (f1 = v1 AND f2 < v2) ... condition."""
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            descending = name.startswith('-')
+            if direction == PREVIOUS:
+                descending = not descending
+            lookup = 'lt' if descending else 'gt'
+            equal = dict(zip(self.fields[:index], key[:index]))
+            condition |= Q(
+                **equal, **{f'{self.fields[index]}__{lookup}': key[index]}
+            )
+        return condition
+
+    @staticmethod
+    def _reverse(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+
+class CursorPage(Sequence):
+    """Keyset paginator page."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next and bool(object_list)
+        self._has_previous = has_previous and bool(object_list)
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], NEXT)
+
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], PREVIOUS)
@@ -0,0 +1,47 @@
+"""SQLite connection tuning.
+
+``apply_pragmas`` is connected to ``connection_created`` and sets
+``settings.SQLITE_PRAGMAS`` on every new SQLite connection. The
+production profile uses WAL journal, so readers do not block the writer
+and each other, and ``synchronous=NORMAL``, which syncs the WAL at
+checkpoints instead of every commit. Read-only connections (replicas)
+get only pragmas not changing the database file.
+"""
+from django.conf import settings
+
+# SQLite defaults of SQLITE_PRAGMAS, busy_timeout is the default
+# timeout of Python sqlite3 connections
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': 5000,
+    'cache_size': -2000,
+    'mmap_size': 0,
+    'temp_store': 'DEFAULT',
+}
+# Pragmas changing the database file, not applied to read-only ones
+WRITE_PRAGMAS = ('journal_mode',)
+
+
+def is_read_only(connection):
+    return 'mode=ro' in str(connection.settings_dict['NAME'])
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """Set SQLITE_PRAGMAS on the new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    read_only = is_read_only(connection)
+    # Executed by the DB-API connection, not counted as request queries
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        if not (read_only and name in WRITE_PRAGMAS):
+            connection.connection.execute(f'PRAGMA {name}={value}')
+
+
+def get_pragmas(connection, names=tuple(DEFAULT_PRAGMAS)):
+    """Return {pragma name: value} of the connection."""
+    with connection.cursor() as cursor:
+        return {
+            name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+            for name in names
+        }
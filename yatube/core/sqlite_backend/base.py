@@ -0,0 +1,29 @@
+"""SQLite backend starting write transactions with ``BEGIN IMMEDIATE``.
+
+Deferred transaction (plain ``BEGIN``) reads under a shared lock and
+upgrades it on the first write. In WAL mode the upgrade fails at once
+with "database is locked" if another connection has committed since the
+transaction started reading: busy timeout does not retry it, as waiting
+would not make the read snapshot current. ``BEGIN IMMEDIATE`` takes the
+write lock at the start, waiting for it up to the busy timeout.
+Transactions opened by ``core.transaction.atomic(immediate=True)`` start
+in ``settings.SQLITE_TRANSACTION_MODE``, other ones and transactions of
+read-only connections (replicas) use ``BEGIN``.
+"""
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+from core.sqlite import is_read_only
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Set by core.transaction.atomic(immediate=True) for its BEGIN
+    begin_immediate = False
+
+    def _start_transaction_under_autocommit(self):
+        mode = settings.SQLITE_TRANSACTION_MODE
+        if (not self.begin_immediate or mode == 'DEFERRED'
+                or is_read_only(self)):
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {mode}')
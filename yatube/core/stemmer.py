@@ -0,0 +1,135 @@
+"""Snowball (Porter) stemmer of Russian words.
+
+Implements the algorithm described at
+https://snowballstem.org/algorithms/russian/stemmer.html
+Words without cyrillic vowels are returned unchanged.
+"""
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND = (
+    ('в', 'вши', 'вшись'),
+    ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'),
+)
+ADJECTIVE = (
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+    'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+    'ая', 'яя', 'ою', 'ею',
+)
+PARTICIPLE = (
+    ('ем', 'нн', 'вш', 'ющ', 'щ'),
+    ('ивш', 'ывш', 'ующ'),
+)
+REFLEXIVE = ('ся', 'сь')
+VERB = (
+    ('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+     'ют', 'ны', 'ть', 'ешь', 'нно'),
+    ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+     'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+     'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'),
+)
+NOUN = (
+    'а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и',
+    'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о',
+    'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я',
+)
+SUPERLATIVE = ('ейше', 'ейш')
+DERIVATIONAL = ('ость', 'ост')
+
+
+def _longest(suffixes):
+    return tuple(sorted(suffixes, key=len, reverse=True))
+
+
+# Suffixes of the first groups must follow 'а' or 'я', the letter
+# itself is kept.
+PERFECTIVE_GERUND = tuple(_longest(group) for group in PERFECTIVE_GERUND)
+ADJECTIVE = _longest(ADJECTIVE)
+PARTICIPLE = tuple(_longest(group) for group in PARTICIPLE)
+REFLEXIVE = _longest(REFLEXIVE)
+VERB = tuple(_longest(group) for group in VERB)
+NOUN = _longest(NOUN)
+
+
+def _region(word, start=0):
+    """Return index after the first non-vowel following a vowel."""
+    for i in range(start + 1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            return i + 1
+    return len(word)
+
+
+def _remove(word, suffixes):
+    """Remove the longest of suffixes, return (word, removed)."""
+    for suffix in suffixes:
+        if word.endswith(suffix):
+            return word[:-len(suffix)], True
+    return word, False
+
+
+def _remove_grouped(word, groups):
+    """Remove the longest suffix of (after 'а'/'я', any) groups."""
+    first, second = groups
+    candidates = [
+        suffix for suffix in first
+        if word.endswith(suffix) and word[:-len(suffix)].endswith(('а', 'я'))
+    ] + [suffix for suffix in second if word.endswith(suffix)]
+    if not candidates:
+        return word, False
+    suffix = max(candidates, key=len)
+    return word[:-len(suffix)], True
+
+
+def _remove_adjectival(word):
+    word, removed = _remove(word, ADJECTIVE)
+    if removed:
+        word = _remove_grouped(word, PARTICIPLE)[0]
+    return word, removed
+
+
+def _step1(rv):
+    rv, removed = _remove_grouped(rv, PERFECTIVE_GERUND)
+    if removed:
+        return rv
+    rv = _remove(rv, REFLEXIVE)[0]
+    for remove in (
+        _remove_adjectival,
+        lambda part: _remove_grouped(part, VERB),
+        lambda part: _remove(part, NOUN),
+    ):
+        rv, removed = remove(rv)
+        if removed:
+            break
+    return rv
+
+
+def _step4(rv):
+    if rv.endswith('нн'):
+        return rv[:-1]
+    rv, removed = _remove(rv, SUPERLATIVE)
+    if removed:
+        return rv[:-1] if rv.endswith('нн') else rv
+    return rv[:-1] if rv.endswith('ь') else rv
+
+
+def stem(word):
+    """Return stem of the lowercase Russian word."""
+    word = word.replace('ё', 'е')
+    rv_start = next(
+        (i + 1 for i, letter in enumerate(word) if letter in VOWELS), None
+    )
+    if rv_start is None:
+        return word
+    r2_start = _region(word, _region(word))
+    prefix, rv = word[:rv_start], word[rv_start:]
+
+    rv = _step1(rv)
+    # Step 2
+    if rv.endswith('и'):
+        rv = rv[:-1]
+    # Step 3: derivational suffix must be in R2
+    for suffix in DERIVATIONAL:
+        if (rv.endswith(suffix)
+                and rv_start + len(rv) - len(suffix) >= r2_start):
+            rv = rv[:-len(suffix)]
+            break
+    return prefix + _step4(rv)
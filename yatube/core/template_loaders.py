@@ -0,0 +1,136 @@
+"""Precompiled template loader.
+
+``Loader`` keeps compiled templates in memory like Django cached loader
+and inlines ``{% include %}`` of constant template names: include node
+is replaced by the nodes of the compiled included template, so its name
+is not resolved and looked up on every render. ``warm_templates()``
+compiles all templates of the template directories at startup.
+
+Settings example::
+
+    'OPTIONS': {
+        'loaders': [('core.template_loaders.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ])],
+    }
+"""
+import os
+import time
+
+from django.template import TemplateDoesNotExist, engines
+from django.template.base import Node
+from django.template.defaulttags import IfNode
+from django.template.loader_tags import IncludeNode
+from django.template.loaders import cached
+
+
+class IncludedTemplateNode(Node):
+    """Nodes of a template included with a constant name."""
+
+    child_nodelists = ()
+
+    def __init__(self, template, include):
+        self.template = template
+        self.extra_context = include.extra_context
+        self.isolated_context = include.isolated_context
+        self.token = include.token
+        self.origin = include.origin
+
+    def render(self, context):
+        # Same as IncludeNode.render of an already loaded template
+        values = {
+            name: var.resolve(context)
+            for name, var in self.extra_context.items()
+        }
+        with context.render_context.push_state(self.template):
+            if self.isolated_context:
+                return self.template.nodelist.render(context.new(values))
+            with context.push(**values):
+                return self.template.nodelist.render(context)
+
+
+def get_included_name(node):
+    """Return constant template name of include node or None."""
+    if not isinstance(node, IncludeNode) or node.template.filters:
+        return None
+    name = node.template.var
+    return name if isinstance(name, str) else None
+
+
+def get_child_nodelists(node):
+    # IfNode.nodelist is a new list of all its branches
+    if isinstance(node, IfNode):
+        return [nodelist for _, nodelist in node.conditions_nodelists]
+    return [
+        getattr(node, name) for name in node.child_nodelists
+        if getattr(node, name, None) is not None
+    ]
+
+
+class Loader(cached.Loader):
+    """Cached loader inlining static includes of compiled templates."""
+
+    def get_template(self, template_name, skip=None):
+        key = self.cache_key(template_name, skip)
+        compiled = key in self.get_template_cache
+        template = super().get_template(template_name, skip)
+        if not compiled:
+            self.inline_includes(template.nodelist)
+        return template
+
+    def inline_includes(self, nodelist):
+        for index, node in enumerate(nodelist):
+            name = get_included_name(node)
+            if name is None:
+                for child in get_child_nodelists(node):
+                    self.inline_includes(child)
+                continue
+            try:
+                # Included template is loaded by this loader, so its own
+                # includes are inlined too
+                template = self.engine.get_template(name)
+            except TemplateDoesNotExist:
+                # Fails on render as usual
+                continue
+            nodelist[index] = IncludedTemplateNode(template, node)
+
+    def get_template_names(self):
+        """Return names of all templates of the template directories."""
+        names = set()
+        for directory in self.engine.dirs:
+            for root, _, files in os.walk(directory):
+                for file in files:
+                    path = os.path.join(root, file)
+                    names.add(os.path.relpath(path, directory).replace(
+                        os.sep, '/'
+                    ))
+        return sorted(names)
+
+    def warm(self):
+        """Compile all templates, return {template name: seconds}."""
+        timings = {}
+        for name in self.get_template_names():
+            start = time.perf_counter()
+            self.get_template(name)
+            timings[name] = time.perf_counter() - start
+        return timings
+
+
+def get_precompiled_loaders():
+    """Return precompiled loaders of Django template engines."""
+    return [
+        loader
+        for backend in engines.all() if hasattr(backend, 'engine')
+        for loader in backend.engine.template_loaders
+        if isinstance(loader, Loader)
+    ]
+
+
+def warm_templates():
+    """Compile templates of all precompiled loaders, return
+    {template name: seconds}."""
+    timings = {}
+    for loader in get_precompiled_loaders():
+        timings.update(loader.warm())
+    return timings
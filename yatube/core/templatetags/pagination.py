@@ -0,0 +1,14 @@
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page):
+    """Return numbers of pages around the page to link to."""
+    first = max(page.number - settings.PAGE_LINKS_WINDOW, 1)
+    last = min(
+        page.number + settings.PAGE_LINKS_WINDOW, page.paginator.num_pages
+    )
+    return range(first, last + 1)
@@ -0,0 +1,21 @@
+"""Test runner of the project."""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """Run tests with post thumbnails generated in the committing thread.
+
+    Thumbnail worker threads would race test database flushes: shared
+    cache in-memory SQLite fails with "table is locked" instead of
+    waiting for a lock.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.thumbnail_async = settings.THUMBNAIL_ASYNC
+        settings.THUMBNAIL_ASYNC = False
+
+    def teardown_test_environment(self, **kwargs):
+        settings.THUMBNAIL_ASYNC = self.thumbnail_async
+        super().teardown_test_environment(**kwargs)
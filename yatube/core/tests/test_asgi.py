@@ -0,0 +1,90 @@
+import asyncio
+
+from django.test import SimpleTestCase, override_settings
+
+from ..asgi import ASGIHandler, get_environ
+
+
+def wsgi_application(environ, start_response):
+    start_response('201 Created', [('Content-Type', 'text/plain')])
+    body = environ['wsgi.input'].read()
+    return [environ['PATH_INFO'].encode('latin-1'), b' ', body]
+
+
+def call(application, scope, messages):
+    """Return messages sent by the application to the client."""
+    sent = []
+    messages = iter(messages)
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return sent
+
+
+@override_settings(ASGI_THREADS=2)
+class ASGIHandlerTests(SimpleTestCase):
+    def test_environ(self):
+        """Scope is converted to WSGI environ."""
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': '/group/тест/',
+            'query_string': b'page=2',
+            'headers': [
+                (b'content-type', b'text/plain'),
+                (b'accept', b'text/html'),
+                (b'accept', b'*/*'),
+            ],
+        }
+        environ = get_environ(scope, None)
+        cases = (
+            ('REQUEST_METHOD', 'GET'),
+            ('PATH_INFO', '/group/тест/'.encode().decode('latin-1')),
+            ('QUERY_STRING', 'page=2'),
+            ('CONTENT_TYPE', 'text/plain'),
+            ('HTTP_ACCEPT', 'text/html,*/*'),
+        )
+        for name, value in cases:
+            with self.subTest(name=name):
+                self.assertEqual(environ[name], value)
+
+    def test_http(self):
+        """Request body is passed to the WSGI application and its
+        response is sent."""
+        scope = {'type': 'http', 'method': 'POST', 'path': '/post/'}
+        sent = call(ASGIHandler(wsgi_application), scope, [
+            {'type': 'http.request', 'body': b'a', 'more_body': True},
+            {'type': 'http.request', 'body': b'b'},
+        ])
+        self.assertEqual(sent, [
+            {
+                'type': 'http.response.start',
+                'status': 201,
+                'headers': [(b'content-type', b'text/plain')],
+            },
+            {'type': 'http.response.body', 'body': b'/post/ ab'},
+        ])
+
+    def test_disconnect(self):
+        """Nothing is sent to a disconnected client."""
+        scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+        sent = call(
+            ASGIHandler(wsgi_application), scope, [{'type': 'http.disconnect'}]
+        )
+        self.assertEqual(sent, [])
+
+    def test_lifespan(self):
+        """Startup and shutdown are acknowledged."""
+        sent = call(ASGIHandler(wsgi_application), {'type': 'lifespan'}, [
+            {'type': 'lifespan.startup'},
+            {'type': 'lifespan.shutdown'},
+        ])
+        self.assertEqual(sent, [
+            {'type': 'lifespan.startup.complete'},
+            {'type': 'lifespan.shutdown.complete'},
+        ])
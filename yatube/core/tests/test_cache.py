@@ -0,0 +1,36 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..cache import get_versions
+
+
+class VersionTimeoutTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get_version_later(self, name, seconds):
+        """Return version of the name after seconds."""
+        with mock.patch('time.time', return_value=time.time() + seconds):
+            return get_versions(name)[name]
+
+    @override_settings(VERSION_CACHE_TIMEOUT=20)
+    def test_local_versions_expire(self):
+        """Process-local versions restart after timeout, so versions
+        bumped by other processes are not used forever."""
+        version = get_versions('name')['name']
+        self.assertEqual(self.get_version_later('name', 10), version)
+        self.assertGreater(
+            self.get_version_later('name', 30), version,
+            'Version is not expired'
+        )
+
+    @override_settings(VERSION_CACHE_TIMEOUT=None)
+    def test_shared_versions_kept(self):
+        """Versions of the shared cache do not expire."""
+        version = get_versions('name')['name']
+        self.assertEqual(
+            self.get_version_later('name', 60 * 60 * 24 * 30), version
+        )
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from .. import cache_backends
+from ..cache_backends import SQLiteCache
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite3')
+        self.cache = self.create_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def create_cache(self, **options):
+        return SQLiteCache(self.path, {'OPTIONS': options})
+
+    def test_set_get_delete(self):
+        """Values are stored, read and deleted."""
+        self.cache.set('key', {'value': [1, 2]})
+        self.assertEqual(self.cache.get('key'), {'value': [1, 2]})
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'), 'Key is not deleted')
+
+    def test_expired_value(self):
+        """Expired value is not returned and can be added again."""
+        self.cache.set('key', 'value', timeout=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get('key'), 'Expired value returned')
+        self.assertTrue(self.cache.add('key', 'new'), 'Value is not added')
+        self.assertFalse(self.cache.add('key', 'other'), 'Value is replaced')
+
+    def test_shared_between_instances(self):
+        """Instances on the same file share entries, as worker processes
+        do."""
+        self.cache.set('key', 'value')
+        other = self.create_cache()
+        self.assertEqual(other.get('key'), 'value', 'Cache is not shared')
+        other.add('counter', 1)
+        other.incr('counter')
+        self.assertEqual(
+            self.cache.get('counter'), 2, 'Increment is not shared'
+        )
+
+    def test_incr_missing_key(self):
+        """Increment of missing key raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted over MAX_ENTRIES."""
+        self.patch(cache_backends, 'CULL_CHECK_INTERVAL', 1)
+        self.patch(cache_backends, 'ACCESS_RESOLUTION', 0)
+        cache = self.create_cache(MAX_ENTRIES=3, CULL_FREQUENCY=3)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key)
+            time.sleep(0.01)
+        cache.get('a')
+        cache.set('d', 'd')
+        self.assertIsNone(cache.get('b'), 'LRU entry is not evicted')
+        self.assertEqual(cache.get('a'), 'a', 'Used entry is evicted')
+
+    def test_stats(self):
+        """Hits and misses are counted."""
+        self.cache.set('key', 'value')
+        self.cache.get('key')
+        self.cache.get_many(['key', 'missing'])
+        stats = self.cache.stats()
+        self.assertEqual(
+            (stats['hits'], stats['misses'], stats['entries']),
+            (2, 1, 1),
+            'Incorrect cache stats'
+        )
+
+    def patch(self, module, name, value):
+        original = getattr(module, name)
+        setattr(module, name, value)
+        self.addCleanup(setattr, module, name, original)
@@ -0,0 +1,85 @@
+import threading
+
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from posts.models import Group
+
+from .. import db_router
+from ..concurrency import run_concurrently
+from ..metrics import RequestMetrics, tracking
+
+
+def get_thread():
+    return threading.current_thread().name
+
+
+@override_settings(CONCURRENT_QUERIES=True, QUERY_THREADS=2)
+class RunConcurrentlyTests(SimpleTestCase):
+    def test_results_order(self):
+        """Results are returned in the order of functions."""
+        results = run_concurrently(lambda: 1, lambda: 2, lambda: 3)
+        self.assertEqual(results, [1, 2, 3], 'Results are out of order')
+
+    def test_worker_threads(self):
+        """The first function runs in the current thread, others in
+        worker threads, or all in the current thread if disabled."""
+        current = get_thread()
+        threads = run_concurrently(get_thread, get_thread)
+        self.assertEqual(threads[0], current)
+        self.assertNotEqual(threads[1], current, 'Not run in a worker')
+        with override_settings(CONCURRENT_QUERIES=False):
+            threads = run_concurrently(get_thread, get_thread)
+        self.assertEqual(threads, [current, current], 'Run in a worker')
+
+    def test_nested_calls(self):
+        """Nested calls in a worker run in the worker thread."""
+        def nested():
+            return get_thread(), run_concurrently(get_thread, get_thread)
+
+        _, (worker, threads) = run_concurrently(get_thread, nested)
+        self.assertEqual(threads, [worker, worker], 'Nested call in a pool')
+
+    def test_exception(self):
+        """Exception of any function is raised."""
+        def fail():
+            raise ValueError('fail')
+
+        for funcs in ((fail, get_thread), (get_thread, fail)):
+            with self.subTest(funcs=funcs):
+                with self.assertRaises(ValueError):
+                    run_concurrently(*funcs)
+
+    def test_request_database(self):
+        """Workers read from the replica of the current request."""
+        db_router._local.replica = 'replica_1'
+        db_router._local.wrote = False
+        try:
+            replicas = run_concurrently(
+                db_router.get_replica, db_router.get_replica
+            )
+        finally:
+            db_router._local.replica = None
+        self.assertEqual(replicas, ['replica_1', 'replica_1'])
+
+
+@override_settings(CONCURRENT_QUERIES=True, QUERY_THREADS=2)
+class RunConcurrentlyQueriesTests(TransactionTestCase):
+    def count(self):
+        return Group.objects.count()
+
+    def test_metrics(self):
+        """Queries of workers are recorded to the request metrics."""
+        with tracking(RequestMetrics()) as metrics:
+            counts = run_concurrently(self.count, self.count, self.count)
+        self.assertEqual(counts, [0, 0, 0])
+        self.assertEqual(metrics.queries, 3, 'Worker queries are lost')
+
+    def test_transaction(self):
+        """Inside a transaction functions see its data."""
+        with transaction.atomic():
+            Group.objects.create(title='Group', slug='group')
+            threads = run_concurrently(get_thread, get_thread)
+            counts = run_concurrently(self.count, self.count)
+        self.assertEqual(len(set(threads)), 1, 'Run in a worker')
+        self.assertEqual(counts, [1, 1], 'Uncommitted data is not visible')
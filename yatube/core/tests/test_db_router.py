@@ -0,0 +1,72 @@
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from posts.models import Post
+
+from ..db_router import (PRIMARY, STICKY_COOKIE, ReplicaRoutingMiddleware,
+                         primary_db)
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+def read_view(request):
+    return HttpResponse(router.db_for_read(Post))
+
+
+def write_view(request):
+    router.db_for_write(Post)
+    return HttpResponse(router.db_for_read(Post))
+
+
+@override_settings(REPLICA_DATABASES=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    def get(self, view, method='get', cookies=None):
+        """Return response of the view called through the middleware."""
+        request = getattr(RequestFactory(), method)('/')
+        request.COOKIES.update(cookies or {})
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_reads_routing(self):
+        """Reads go to a replica in safe requests only."""
+        cases = (
+            (read_view, 'get', None, REPLICAS),
+            (read_view, 'post', None, [PRIMARY]),
+            (read_view, 'get', {STICKY_COOKIE: '1'}, [PRIMARY]),
+            (primary_db(lambda request: read_view(request)), 'get', None,
+             [PRIMARY]),
+            (write_view, 'get', None, [PRIMARY]),
+        )
+        for view, method, cookies, databases in cases:
+            with self.subTest(method=method, cookies=cookies):
+                response = self.get(view, method, cookies)
+                self.assertIn(response.content.decode(), databases)
+
+    def test_sticky_after_write(self):
+        """Client reads go to primary after its write."""
+        self.assertNotIn(STICKY_COOKIE, self.get(read_view).cookies)
+        cookie = self.get(write_view, 'post').cookies[STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], 10, 'Incorrect sticky period')
+
+    def test_primary_outside_requests(self):
+        """Reads outside requests go to primary."""
+        self.assertEqual(router.db_for_read(Post), PRIMARY)
+        self.assertEqual(router.db_for_write(Post), PRIMARY)
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_no_replicas(self):
+        """Without replicas reads go to primary and no cookie is set."""
+        response = self.get(write_view, 'post')
+        self.assertEqual(response.content.decode(), PRIMARY)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_allow_migrate(self):
+        """Tables are created in the primary database only."""
+        self.assertTrue(router.allow_migrate(PRIMARY, 'posts'))
+        self.assertFalse(router.allow_migrate('replica_1', 'posts'))
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+from ..metrics import QueryBudgetExceeded, registry
+
+User = get_user_model()
+
+
+class MetricsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.admin = User.objects.create_user(username='admin', is_staff=True)
+        cls.follower = User.objects.create_user(username='follower')
+        cls.group = Group.objects.create(title='Group', slug='group')
+        cls.post = Post.objects.create(
+            author=cls.author, text='Post', group=cls.group
+        )
+        Comment.objects.create(
+            post=cls.post, author=cls.follower, text='Comment'
+        )
+        Follow.objects.create(user=cls.follower, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+
+    def test_server_timing_header(self):
+        """Response has Server-Timing header with request metrics."""
+        response = self.client.get(reverse('posts:index'))
+        for metric in ('db;dur=', 'tpl;dur=', 'cache;desc=', 'total;dur='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, response['Server-Timing'])
+
+    def test_metrics_recorded_by_view_name(self):
+        """Metrics are aggregated by view name."""
+        url = reverse('posts:index')
+        self.client.get(url)
+        self.client.get(url)
+        stats = registry.snapshot()['posts:index']
+        self.assertEqual(stats['requests'], 2, 'Requests are not counted')
+        self.assertGreater(stats['queries'], 0, 'Queries are not counted')
+        self.assertEqual(
+            (stats['cache_hits'], stats['cache_misses']), (1, 2),
+            'Page and post card cache hits are not counted'
+        )
+
+    @override_settings(
+        QUERY_BUDGETS={'posts:index': 0}, QUERY_BUDGET_STRICT=True
+    )
+    def test_query_budget_exceeded(self):
+        """Exceeded query budget raises exception in strict mode."""
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('posts:index'))
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_views_within_query_budgets(self):
+        """Pages do not exceed their query budgets on cold cache."""
+        client = Client()
+        client.force_login(MetricsMiddlewareTests.follower)
+        post_id = MetricsMiddlewareTests.post.pk
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'group'}),
+            reverse('posts:profile', kwargs={'username': 'author'}),
+            reverse('posts:post_detail', kwargs={'post_id': post_id}),
+            reverse('posts:follow_index'),
+            reverse('posts:post_comments', kwargs={'post_id': post_id}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                cache.clear()
+                self.assertEqual(client.get(url).status_code, 200)
+
+    def test_metrics_page(self):
+        """Metrics page is available to staff only."""
+        url = reverse('core:metrics')
+        self.client.get(reverse('posts:index'))
+        self.assertEqual(
+            self.client.get(url).status_code, 302,
+            'Metrics page is available to anonymous user'
+        )
+        admin_client = Client()
+        admin_client.force_login(MetricsMiddlewareTests.admin)
+        data = admin_client.get(url).json()
+        self.assertIn('posts:index', data['views'], 'Views metrics missing')
@@ -0,0 +1,146 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.template import Context, Template
+from django.test import (Client, RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..paginator import CursorPaginator, get_page_object
+
+User = get_user_model()
+
+
+def make_cursor(data):
+    """Return cursor token of JSON data, as made by the paginator."""
+    return urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+
+INVALID_KEY_CURSORS = (
+    make_cursor(['n', [None, None]]),
+    make_cursor(['n', ['2020-01-01T00:00:00+00:00', None]]),
+    make_cursor(['n', ['2020-01-01T00:00:00+00:00', 10 ** 30]]),
+    make_cursor(['p', ['2020-01-01T00:00:00+00:00', -10 ** 30]]),
+    make_cursor(['n', 'ab']),
+    make_cursor(['n', {'a': 1}]),
+    make_cursor(['n', ['not a date', 1]]),
+    make_cursor(['n', [[1], [2]]]),
+    make_cursor(['x', ['2020-01-01T00:00:00+00:00', 1]]),
+)
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        for i in range(7):
+            Post.objects.create(author=cls.author, text=f'Post {i}')
+        cls.posts = list(Post.objects.order_by('-pub_date', '-pk'))
+
+    def setUp(self):
+        self.paginator = CursorPaginator(Post.objects.all(), 3)
+
+    def test_pages_forward(self):
+        """Next cursors walk through all items without gaps."""
+        page = self.paginator.get_page()
+        pages = [list(page)]
+        while page.has_next():
+            page = self.paginator.get_page(page.next_cursor())
+            pages.append(list(page))
+        self.assertEqual(
+            pages,
+            [CursorPaginatorTests.posts[0:3],
+             CursorPaginatorTests.posts[3:6],
+             CursorPaginatorTests.posts[6:]],
+            'Incorrect cursor pages'
+        )
+        self.assertTrue(page.has_previous(), 'Last page has no previous')
+
+    def test_pages_backward(self):
+        """Previous cursor returns preceding items."""
+        first = self.paginator.get_page()
+        second = self.paginator.get_page(first.next_cursor())
+        previous = self.paginator.get_page(second.previous_cursor())
+        self.assertEqual(list(previous), list(first), 'Incorrect prev page')
+        self.assertFalse(previous.has_previous(), 'First page has previous')
+        self.assertTrue(previous.has_next(), 'First page has no next')
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Broken cursor token falls back to the first page."""
+        for cursor in ('garbage', 'W10', '!!!'):
+            with self.subTest(cursor=cursor):
+                page = self.paginator.get_page(cursor)
+                self.assertEqual(
+                    list(page),
+                    CursorPaginatorTests.posts[:3],
+                    'Invalid cursor does not return first page'
+                )
+
+    def test_invalid_key_returns_first_page(self):
+        """Cursor with null, out of range or wrong type key values falls
+        back to the first page."""
+        for cursor in INVALID_KEY_CURSORS:
+            with self.subTest(cursor=cursor):
+                page = self.paginator.get_page(cursor)
+                self.assertEqual(
+                    list(page),
+                    CursorPaginatorTests.posts[:3],
+                    'Invalid cursor does not return first page'
+                )
+
+    def test_no_count_query(self):
+        """Cursor page is fetched with a single query."""
+        request = RequestFactory().get('/')
+        with self.assertNumQueries(1):
+            page = get_page_object(request, Post.objects.all(), 3, True)
+            list(page)
+
+    @override_settings(CURSOR_PAGINATED_VIEWS=('index',), PAGINATOR_LIMIT=3)
+    def test_index_opt_in(self):
+        """Index page renders cursor pagination links."""
+        cache.clear()
+        response = Client().get(reverse('posts:index'))
+        page_obj = response.context['page_obj']
+        self.assertTrue(page_obj.is_cursor, 'Index page is not cursor paged')
+        self.assertContains(response, f'?cursor={page_obj.next_cursor()}')
+
+    @override_settings(CURSOR_PAGINATED_VIEWS=('index',), PAGINATOR_LIMIT=3)
+    def test_invalid_key_pages(self):
+        """Index and API pages with invalid cursor key return the first
+        page."""
+        urls = (reverse('posts:index'), reverse('api:post_list'))
+        for url in urls:
+            for cursor in INVALID_KEY_CURSORS:
+                with self.subTest(url=url, cursor=cursor):
+                    cache.clear()
+                    response = Client().get(url, {'cursor': cursor})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertContains(
+                        response, CursorPaginatorTests.posts[0].text
+                    )
+
+
+@override_settings(PAGE_LINKS_WINDOW=2)
+class PageWindowTests(SimpleTestCase):
+    def test_page_window(self):
+        """Only pages around the current page are linked."""
+        paginator = Paginator(range(100), 10)
+        template = Template(
+            '{% load pagination %}{% page_window page as numbers %}'
+            '{{ numbers|join:"," }}'
+        )
+        cases = (
+            (1, '1,2,3'),
+            (5, '3,4,5,6,7'),
+            (10, '8,9,10'),
+        )
+        for number, numbers in cases:
+            with self.subTest(number=number):
+                context = Context({'page': paginator.page(number)})
+                self.assertEqual(template.render(context), numbers)
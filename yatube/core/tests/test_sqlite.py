@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from ..sqlite import get_pragmas
+from ..sqlite_backend.base import DatabaseWrapper
+from ..transaction import atomic
+
+PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'busy_timeout': 1000,
+    'cache_size': -4096,
+    'mmap_size': 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def get_connection(name, **options):
+    """Return new connection to SQLite file outside of test databases."""
+    return DatabaseWrapper({
+        'ENGINE': 'core.sqlite_backend', 'NAME': name,
+        'OPTIONS': options, 'ATOMIC_REQUESTS': False, 'AUTOCOMMIT': True,
+        'CONN_MAX_AGE': 0, 'TIME_ZONE': None,
+    })
+
+
+class PragmasTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'db.sqlite3')
+
+    def test_connection_pragmas(self):
+        """Pragmas of settings are set on new connections."""
+        expected = {
+            'synchronous': 1, 'busy_timeout': 1000, 'cache_size': -4096,
+            'mmap_size': 1024 * 1024, 'temp_store': 2,
+        }
+        database = get_connection(self.path)
+        with override_settings(SQLITE_PRAGMAS=PRAGMAS):
+            pragmas = get_pragmas(database, list(expected))
+        database.close()
+        self.assertEqual(pragmas, expected)
+
+    def test_journal_mode(self):
+        """Journal mode is set on new connections, read-only connections
+        keep journal mode of the file."""
+        path = self.path
+        cases = (
+            ('DELETE', path, {}, 'delete'),
+            ('WAL', f'file:{path}?mode=ro', {'uri': True}, 'delete'),
+            ('WAL', path, {}, 'wal'),
+            ('DELETE', f'file:{path}?mode=ro', {'uri': True}, 'wal'),
+        )
+        for mode, name, options, expected in cases:
+            with self.subTest(mode=mode, name=name):
+                database = get_connection(name, **options)
+                with override_settings(
+                    SQLITE_PRAGMAS={'journal_mode': mode}
+                ):
+                    pragmas = get_pragmas(database, ['journal_mode'])
+                database.close()
+                self.assertEqual(pragmas['journal_mode'], expected)
+
+
+class TransactionModeTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'db.sqlite3')
+
+    def write_locked(self):
+        """Return True if another connection can't start writing."""
+        other = sqlite3.connect(self.path, timeout=0)
+        try:
+            other.execute('BEGIN IMMEDIATE')
+        except sqlite3.OperationalError:
+            return True
+        finally:
+            other.close()
+        return False
+
+    def test_transaction_mode(self):
+        """Write transactions in IMMEDIATE mode take the write lock at
+        start, other transactions are deferred."""
+        cases = (
+            ('DEFERRED', True, False),
+            ('IMMEDIATE', True, True),
+            ('IMMEDIATE', False, False),
+        )
+        for mode, immediate, expected in cases:
+            settings = override_settings(
+                SQLITE_PRAGMAS={'journal_mode': 'WAL'},
+                SQLITE_TRANSACTION_MODE=mode
+            )
+            with self.subTest(mode=mode, immediate=immediate), settings:
+                database = get_connection(self.path)
+                with mock.patch(
+                    'django.db.transaction.get_connection',
+                    return_value=database
+                ):
+                    with atomic(immediate=immediate):
+                        locked = self.write_locked()
+                    with atomic(immediate=immediate):
+                        # Savepoint does not start transaction
+                        with atomic(immediate=True):
+                            nested_locked = self.write_locked()
+                database.close()
+                self.assertEqual(locked, expected)
+                self.assertEqual(nested_locked, expected)
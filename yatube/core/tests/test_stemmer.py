@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase
+
+from ..stemmer import stem
+
+
+class StemmerTests(SimpleTestCase):
+    def test_stem(self):
+        """Word forms are reduced to the same stem."""
+        stems = {
+            'вазы': 'ваз',
+            'важнейшими': 'важн',
+            'вавилонского': 'вавилонск',
+            'важничаешь': 'важнича',
+            'авиации': 'авиац',
+            'бедность': 'бедност',
+            'красивейший': 'красив',
+            'гулявшись': 'гуля',
+            'ёлки': 'елк',
+            'python': 'python',
+        }
+        for word, expected in stems.items():
+            with self.subTest(word=word):
+                self.assertEqual(stem(word), expected)
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.template import (Context, Engine, TemplateDoesNotExist,
+                             engines)
+from django.template.loader_tags import IncludeNode
+from django.test import SimpleTestCase
+
+from ..template_loaders import IncludedTemplateNode, Loader
+
+TEMPLATES = {
+    'page.html': (
+        "{% include 'header.html' with title='Page' %}"
+        "{% for item in items %}{% include 'item.html' %}{% endfor %}"
+        "{% if only %}{% include 'item.html' with item='x' only %}{% endif %}"
+        '{% include name %}'
+    ),
+    'header.html': "<h1>{{ title }}</h1>{% include 'item.html' %}",
+    'item.html': '[{{ item }}{{ title }}]',
+    'missing.html': "{% include 'nothing.html' %}",
+}
+
+
+def get_engine(precompiled):
+    loaders = [('django.template.loaders.locmem.Loader', TEMPLATES)]
+    if precompiled:
+        loaders = [('core.template_loaders.Loader', loaders)]
+    return Engine(loaders=loaders)
+
+
+class PrecompiledLoaderTests(SimpleTestCase):
+    def render(self, precompiled, template_name, context=None):
+        template = get_engine(precompiled).get_template(template_name)
+        return template.render(Context(context))
+
+    def test_render(self):
+        """Templates with inlined includes render as usual."""
+        cases = (
+            {'items': [1, 2], 'name': 'item.html'},
+            {'items': [], 'only': True, 'name': 'item.html', 'title': 'T'},
+        )
+        for context in cases:
+            with self.subTest(context=context):
+                self.assertEqual(
+                    self.render(True, 'page.html', context),
+                    self.render(False, 'page.html', context),
+                    'Inlined includes render differently'
+                )
+
+    def test_static_includes_inlined(self):
+        """Includes of constant names are replaced, others are kept."""
+        template = get_engine(True).get_template('page.html')
+        include, loop, condition, dynamic = template.nodelist
+        self.assertIsInstance(include, IncludedTemplateNode)
+        self.assertIsInstance(loop.nodelist_loop[0], IncludedTemplateNode)
+        self.assertIsInstance(
+            condition.conditions_nodelists[0][1][0], IncludedTemplateNode
+        )
+        self.assertIsInstance(dynamic, IncludeNode, 'Dynamic include inlined')
+        self.assertIsInstance(
+            include.template.nodelist[-1], IncludedTemplateNode,
+            'Include chain is not inlined'
+        )
+
+    def test_missing_include(self):
+        """Missing included template fails on render."""
+        with self.assertRaises(TemplateDoesNotExist):
+            self.render(True, 'missing.html')
+
+    def test_warm(self):
+        """All templates of template directories are compiled."""
+        loader = Loader(engines['django'].engine, settings.TEMPLATE_LOADERS)
+        timings = loader.warm()
+        for name in ('base.html', 'posts/index.html', 'core/404.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, timings)
+                self.assertIn(
+                    loader.cache_key(name), loader.get_template_cache
+                )
@@ -0,0 +1,67 @@
+from django.template import Context, Template
+from django.test import SimpleTestCase
+from django.urls import NoReverseMatch, reverse, set_script_prefix
+
+from ..url_builder import build_url
+
+CASES = (
+    ('posts:index', (), {}),
+    ('posts:group_list', ('group-1',), {}),
+    ('posts:profile', ('юзер',), {}),
+    ('posts:profile', (), {'username': 'user.name+1'}),
+    ('posts:post_detail', (42,), {}),
+    ('posts:post_detail', ('42',), {}),
+    ('posts:group_feed', (), {'slug': 'group', 'feed_format': 'atom'}),
+    ('about:author', (), {}),
+    ('api:post_list', (), {}),
+    ('users:login', (), {}),
+)
+
+
+class BuildUrlTests(SimpleTestCase):
+    def test_same_as_reverse(self):
+        """URLs are the same as reversed ones."""
+        for viewname, args, kwargs in CASES:
+            with self.subTest(viewname=viewname, args=args, kwargs=kwargs):
+                self.assertEqual(
+                    build_url(viewname, *args, **kwargs),
+                    reverse(viewname, args=args, kwargs=kwargs)
+                )
+
+    def test_script_prefix(self):
+        """URLs start with the script prefix."""
+        set_script_prefix('/yatube/')
+        try:
+            url = build_url('posts:post_detail', 1)
+        finally:
+            set_script_prefix('/')
+        self.assertEqual(url, '/yatube/posts/1/')
+
+    def test_no_match(self):
+        """Not matching names and arguments raise NoReverseMatch."""
+        cases = (
+            ('posts:missing', (), {}),
+            ('missing:index', (), {}),
+            ('posts:post_detail', ('post',), {}),
+            ('posts:post_detail', (1, 2), {}),
+            ('posts:profile', (), {'user': 'name'}),
+            ('posts:profile', ('a/b',), {}),
+        )
+        for viewname, args, kwargs in cases:
+            with self.subTest(viewname=viewname, args=args, kwargs=kwargs):
+                with self.assertRaises(NoReverseMatch):
+                    build_url(viewname, *args, **kwargs)
+
+    def test_template_tag(self):
+        """fast_url tag renders the same as url tag."""
+        context = Context({'name': 'a&b'})
+        fast = Template(
+            '{% load url_builder %}'
+            "{% fast_url 'posts:profile' name %} "
+            "{% fast_url 'posts:post_detail' post_id=1 as url %}{{ url }}"
+        )
+        slow = Template(
+            "{% url 'posts:profile' name %} "
+            "{% url 'posts:post_detail' post_id=1 as url %}{{ url }}"
+        )
+        self.assertEqual(fast.render(context), slow.render(context))
@@ -0,0 +1,33 @@
+"""Transactions of write paths taking the SQLite write lock at start.
+
+``atomic(immediate=True)`` marks the outermost block as a write
+transaction: ``core.sqlite_backend`` starts it with
+``BEGIN {settings.SQLITE_TRANSACTION_MODE}`` instead of plain ``BEGIN``.
+Other transactions (admin pages, management commands, reads) stay
+deferred and do not hold the write lock while they only read. Nested
+blocks are savepoints of the outer transaction, ``immediate`` has no
+effect on them.
+"""
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+class Atomic(transaction.Atomic):
+    def __init__(self, using, savepoint, immediate):
+        super().__init__(using, savepoint)
+        self.immediate = immediate
+
+    def __enter__(self):
+        connection = transaction.get_connection(self.using)
+        connection.begin_immediate = self.immediate
+        try:
+            super().__enter__()
+        finally:
+            connection.begin_immediate = False
+
+
+def atomic(using=None, savepoint=True, immediate=False):
+    """``django.db.transaction.atomic`` with optional immediate start of
+    the outermost transaction, use it for transactions which write."""
+    if callable(using):
+        return Atomic(DEFAULT_DB_ALIAS, savepoint, immediate)(using)
+    return Atomic(using, savepoint, immediate)
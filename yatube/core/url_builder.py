@@ -0,0 +1,99 @@
+"""Fast URL reversing for links built in loops.
+
+``build_url()`` takes the same view name and arguments as ``reverse()``,
+but routes of a view name are compiled once into format strings, so a
+link is built with string formatting and one regex match instead of
+walking the URL resolvers. Routes of ``FAST_URL_NAMESPACES`` are
+compiled at startup, other names on first use. Names and arguments not
+matching a compiled route are reversed by ``reverse()``, which raises
+``NoReverseMatch`` as usual.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.urls import get_resolver, get_script_prefix, get_urlconf, reverse
+from django.urls.resolvers import get_ns_resolver
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes
+
+# Safe characters from pchar definition of RFC 3986, as in reverse()
+SAFE_CHARS = RFC3986_SUBDELIMS + '/~:@'
+
+Route = namedtuple('Route', ('format', 'params', 'converters', 'regex'))
+
+
+def get_view_resolver(resolver, viewname):
+    """Return (resolver of the view namespace, view name) like
+    reverse() without current app."""
+    *namespaces, view = viewname.split(':')
+    ns_pattern = ''
+    ns_converters = {}
+    for namespace in namespaces:
+        instances = resolver.app_dict.get(namespace, [namespace])
+        if namespace not in instances:
+            namespace = instances[0]
+        extra, resolver = resolver.namespace_dict[namespace]
+        ns_pattern += extra
+        ns_converters.update(resolver.pattern.converters)
+    if ns_pattern:
+        resolver = get_ns_resolver(
+            ns_pattern, resolver, tuple(ns_converters.items())
+        )
+    return resolver, view
+
+
+@lru_cache(maxsize=None)
+def get_routes(resolver, viewname):
+    """Return compiled routes of the view name in the URL resolver.
+    Routes with default arguments are left to reverse()."""
+    try:
+        resolver, view = get_view_resolver(resolver, viewname)
+    except KeyError:
+        return ()
+    return tuple(
+        Route(result, tuple(params), converters, re.compile(pattern))
+        for possibility, pattern, defaults, converters
+        in resolver.reverse_dict.getlist(view) if not defaults
+        for result, params in possibility
+    )
+
+
+def format_route(route, args, kwargs):
+    """Return path of the route or None if arguments do not match."""
+    if args:
+        if len(args) != len(route.params):
+            return None
+        values = dict(zip(route.params, args))
+    elif set(kwargs) != set(route.params):
+        return None
+    else:
+        values = kwargs
+    path = route.format % {
+        name: route.converters[name].to_url(value)
+        if name in route.converters else str(value)
+        for name, value in values.items()
+    }
+    return path if route.regex.match(path) else None
+
+
+def build_url(viewname, *args, **kwargs):
+    """Return URL of the view name with arguments, same as reverse()."""
+    for route in get_routes(get_resolver(get_urlconf()), viewname):
+        path = format_route(route, args, kwargs)
+        if path is not None:
+            return escape_leading_slashes(
+                quote(get_script_prefix() + path, safe=SAFE_CHARS)
+            )
+    return reverse(viewname, args=args, kwargs=kwargs)
+
+
+def compile_urls():
+    """Compile routes of all view names of FAST_URL_NAMESPACES."""
+    resolver = get_resolver(get_urlconf())
+    for namespace in settings.FAST_URL_NAMESPACES:
+        view_resolver, _ = get_view_resolver(resolver, f'{namespace}:')
+        for name in view_resolver.reverse_dict:
+            if isinstance(name, str):
+                get_routes(resolver, f'{namespace}:{name}')
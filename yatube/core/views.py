@@ -1,7 +1,12 @@
 from http import HTTPStatus
 
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.http import JsonResponse
 from django.shortcuts import render
 
+from .metrics import registry
+
 
 def page_not_found(request, exception):
     """Override default handler404."""
@@ -29,3 +34,13 @@ def permission_denied(request, exception):
     return render(
         request, 'core/403.html',
         status=HTTPStatus.FORBIDDEN.value)
+
+
+@staff_member_required
+def metrics(request):
+    """Request metrics aggregated by view name."""
+    data = {'views': registry.snapshot()}
+    # Shared cache backend counts hits and misses of all processes
+    if hasattr(cache, 'stats'):
+        data['cache'] = cache.stats()
+    return JsonResponse(data)
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Comment, Follow, Group, Post
+from .models import ChangeLog, Comment, Follow, Group, Post
+from .search import matching_post_ids
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -15,8 +16,31 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search posts text by the search index instead of LIKE scan."""
+        if not search_term:
+            return queryset, False
+        return queryset.filter(pk__in=matching_post_ids(search_term)), False
+
+
+class ChangeLogAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'model',
+        'object_id',
+        'action',
+        'changed')
+    list_filter = ('model', 'action')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
 admin.site.register(Comment)
 admin.site.register(Follow)
+admin.site.register(ChangeLog, ChangeLogAdmin)
@@ -0,0 +1,54 @@
+"""Post cards fragment cache.
+
+Rendered ``posts/includes/post.html`` card is cached by post id and
+version stamps of the post, its group and its author.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from core import metrics
+from core.cache import get_versions
+
+from .versions import group_version, post_version, user_version
+
+CARD_TEMPLATE = 'posts/includes/post.html'
+CARD_KEY = 'post_card:{}:{}:{}:{}'
+
+
+def get_card_keys(posts):
+    """Return cache keys of post cards, versions are fetched at once."""
+    names = set()
+    for post in posts:
+        names.update((
+            post_version(post.pk),
+            group_version(post.group_id),
+            user_version(post.author_id)
+        ))
+    versions = get_versions(*names)
+    return [
+        CARD_KEY.format(
+            post.pk,
+            versions[post_version(post.pk)],
+            versions[group_version(post.group_id)],
+            versions[user_version(post.author_id)]
+        ) for post in posts
+    ]
+
+
+def render_post_cards(posts):
+    """Return list of rendered post cards, missing cards are rendered
+    and cached."""
+    posts = list(posts)
+    keys = get_card_keys(posts)
+    cards = cache.get_many(keys)
+    metrics.record_cache(hits=len(cards), misses=len(keys) - len(cards))
+    missing = {}
+    for post, key in zip(posts, keys):
+        if key not in cards:
+            missing[key] = render_to_string(CARD_TEMPLATE, {'post': post})
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+        cards.update(missing)
+    return [mark_safe(cards[key]) for key in keys]
@@ -0,0 +1,44 @@
+"""Change log of posts, groups and users.
+
+Saves and deletes are recorded by model signals in the transaction of
+the write. Incremental consumers (search index, caches, feeds) keep id
+of the last processed ``ChangeLog`` row and refresh only objects changed
+after it. Bulk operations (``bulk_create``, ``update``) are not logged.
+"""
+from .models import ChangeLog
+
+
+def record_change(instance, action):
+    """Add change log row of the saved or deleted instance."""
+    return ChangeLog.objects.create(
+        model=instance._meta.model_name,
+        object_id=instance.pk,
+        action=action
+    )
+
+
+def get_last_change_id():
+    """Return id of the last change log row or 0."""
+    change = ChangeLog.objects.only('pk').last()
+    return change.pk if change else 0
+
+
+def get_changed_ids(model, after=0, actions=None):
+    """Return set of ids of model objects changed after change id.
+
+    Required arguments: model (model class).
+    Optional arguments: after (Integer, change log id),
+    actions (list of ChangeLog actions, all actions by default).
+    """
+    changes = ChangeLog.objects.filter(
+        model=model._meta.model_name, pk__gt=after
+    )
+    if actions is not None:
+        changes = changes.filter(action__in=actions)
+    return set(changes.values_list('object_id', flat=True))
+
+
+def prune_changes(before):
+    """Delete change log rows older than before datetime,
+    return count of deleted rows."""
+    return ChangeLog.objects.filter(changed__lt=before).delete()[0]
@@ -0,0 +1,184 @@
+"""Write-behind buffer of new comments.
+
+With ``settings.COMMENT_WRITE_BUFFER`` on, comments of concurrent
+requests are put to a bounded queue and inserted by one writer thread in
+batches: comments collected for ``COMMENT_BUFFER_DELAY`` seconds are
+written by one transaction, so a burst of comments takes the SQLite
+write lock once instead of once per request. Comments are saved one by
+one in the transaction: ``bulk_create`` does not set primary keys on
+SQLite and ``post_save`` receivers need them. The queue is first in,
+first out, so comments of a user keep their order. Request waits until
+the batch with its comment is committed, at most
+``COMMENT_BUFFER_TIMEOUT`` seconds: then it writes the comment itself.
+"""
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection, router
+
+from core.transaction import atomic
+
+from . import counters
+from .models import Comment, Post
+
+logger = logging.getLogger(__name__)
+
+_writer = None
+_lock = threading.Lock()
+
+
+class PendingComment:
+    """Comment waiting in the buffer."""
+
+    def __init__(self, comment):
+        self.comment = comment
+        self.written = False
+        self.error = None
+        self.done = threading.Event()
+        self._claimed = threading.Lock()
+
+    def claim(self):
+        """Return True for the only caller allowed to write the comment:
+        the buffer writer or the request after the wait timeout."""
+        return self._claimed.acquire(blocking=False)
+
+
+class CommentWriter:
+    """Queue of pending comments written by one thread, started by the
+    first comment."""
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=settings.COMMENT_BUFFER_SIZE)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name='comments', daemon=True
+                )
+                self.thread.start()
+
+    def stop(self):
+        """Stop the thread after comments already queued."""
+        self.queue.put(None)
+
+    def put(self, item, timeout):
+        """Queue the comment, raise queue.Full after timeout."""
+        self.start()
+        self.queue.put(item, timeout=timeout)
+
+    def collect(self):
+        """Return batch of comments arrived within COMMENT_BUFFER_DELAY
+        after the first one, None after stop()."""
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + settings.COMMENT_BUFFER_DELAY
+        while batch[-1] is not None and (
+                len(batch) < settings.COMMENT_BATCH_SIZE):
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        if batch[-1] is None:
+            return batch[:-1] or None
+        return batch
+
+    def run(self):
+        batch = self.collect()
+        while batch is not None:
+            close_old_connections()
+            _write(batch)
+            batch = self.collect()
+        close_old_connections()
+
+
+def get_writer():
+    """Return writer of the process."""
+    global _writer
+    with _lock:
+        if _writer is None:
+            _writer = CommentWriter()
+        return _writer
+
+
+def _insert(batch):
+    """Insert comments of existing posts in one transaction."""
+    post_ids = {item.comment.post_id for item in batch}
+    using = router.db_for_write(Comment)
+    with atomic(using=using, immediate=True):
+        posts = Post.objects.select_related('stats').filter(
+            pk__in=post_ids
+        )
+        # Missing counters rows are created from actual counts before
+        # insert, signals of inserted comments increment them
+        existing = set()
+        for post in posts:
+            if not hasattr(post, 'stats'):
+                counters.create_post_stats(post.pk)
+            existing.add(post.pk)
+        written = [
+            item for item in batch if item.comment.post_id in existing
+        ]
+        for item in written:
+            item.comment.save(using=using)
+    for item in written:
+        item.written = True
+
+
+def _write_claimed(batch):
+    """Write batch, on error write its comments one by one, so only
+    failed comments get the error."""
+    try:
+        _insert(batch)
+    except Exception as error:
+        if len(batch) > 1:
+            for item in batch:
+                _write_claimed([item])
+            return
+        logger.exception('Comment is not written')
+        batch[0].error = error
+    finally:
+        for item in batch:
+            item.done.set()
+
+
+def _write(batch):
+    """Write comments of the batch not claimed by waiting requests."""
+    batch = [item for item in batch if item.claim()]
+    if batch:
+        _write_claimed(batch)
+
+
+def write_comment(comment, writer=None):
+    """Write new comment through the buffer, return False if its post
+    does not exist.
+
+    Optional arguments: writer (CommentWriter, the process writer by
+    default). Comment is written in the current thread if the caller is
+    inside a transaction (the writer would not see its data), the queue
+    is full or the comment is not taken by the writer in
+    COMMENT_BUFFER_TIMEOUT seconds.
+    """
+    item = PendingComment(comment)
+    timeout = settings.COMMENT_BUFFER_TIMEOUT
+    if connection.in_atomic_block:
+        _write([item])
+    else:
+        try:
+            (writer or get_writer()).put(item, timeout)
+            item.done.wait(timeout)
+        except queue.Full:
+            pass
+        # Comment taken by the writer is waited until it is written
+        _write([item])
+        item.done.wait()
+    if item.error is not None:
+        raise item.error
+    return item.written
@@ -0,0 +1,135 @@
+"""Denormalized counters.
+
+Counters are changed with ``F()`` expressions in the transaction of the
+write. Counter rows are created with their users and posts, rows of data
+created before counters are backfilled by migration. Rows missing after
+``bulk_create`` are counted on read without a write and created by the
+next counter change. Drift is fixed by ``reconcile_counters`` management
+command.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Follow, Post, PostStats, UserStats
+
+
+def count_user_stats(user_id):
+    """Return actual user counters values."""
+    return {
+        'posts_count': Post.objects.filter(author_id=user_id).count(),
+        'followers_count': Follow.objects.filter(author_id=user_id).count(),
+        'following_count': Follow.objects.filter(user_id=user_id).count(),
+    }
+
+
+def count_post_stats(post_id):
+    """Return actual post counters values."""
+    return {
+        'comments_count': Comment.objects.filter(post_id=post_id).count(),
+    }
+
+
+def init_user_stats(user_id):
+    """Create zero counters row of the new user."""
+    UserStats.objects.create(user_id=user_id)
+
+
+def init_post_stats(post_id):
+    """Create zero counters row of the new post."""
+    PostStats.objects.create(post_id=post_id)
+
+
+def create_user_stats(user_id):
+    """Create user counters row from actual counts."""
+    try:
+        with transaction.atomic():
+            return UserStats.objects.create(
+                user_id=user_id, **count_user_stats(user_id)
+            )
+    except IntegrityError:
+        return UserStats.objects.get(user_id=user_id)
+
+
+def create_post_stats(post_id):
+    """Create post counters row from actual counts."""
+    try:
+        with transaction.atomic():
+            return PostStats.objects.create(
+                post_id=post_id, **count_post_stats(post_id)
+            )
+    except IntegrityError:
+        return PostStats.objects.get(post_id=post_id)
+
+
+def get_user_stats(user):
+    """Return user counters, use ``select_related('stats')`` to avoid
+    additional query."""
+    try:
+        return user.stats
+    except UserStats.DoesNotExist:
+        return UserStats(user_id=user.pk, **count_user_stats(user.pk))
+
+
+def get_post_stats(post):
+    """Return post counters, use ``select_related('stats')`` to avoid
+    additional query."""
+    try:
+        return post.stats
+    except PostStats.DoesNotExist:
+        return PostStats(post_id=post.pk, **count_post_stats(post.pk))
+
+
+def increment_user_counter(user_id, counter):
+    updated = UserStats.objects.filter(user_id=user_id).update(
+        **{counter: F(counter) + 1}
+    )
+    if not updated:
+        create_user_stats(user_id)
+
+
+def count_follows(user_id, author_ids):
+    """Set following counter of the user and followers counters of the
+    authors from actual follows, one UPDATE per counter.
+
+    Counters set from counts stay correct when concurrent requests
+    insert the same follows.
+    """
+    def count(field):
+        return Coalesce(Subquery(
+            Follow.objects.filter(**{field: OuterRef('user_id')}).order_by()
+            .values(field).annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    updated = UserStats.objects.filter(user_id=user_id).update(
+        following_count=count('user_id')
+    )
+    updated += UserStats.objects.filter(user_id__in=author_ids).update(
+        followers_count=count('author_id')
+    )
+    if updated < len(author_ids) + 1:
+        existing = set(UserStats.objects.filter(
+            user_id__in=[user_id, *author_ids]
+        ).values_list('user_id', flat=True))
+        for missing_id in {user_id, *author_ids} - existing:
+            create_user_stats(missing_id)
+
+
+def decrement_user_counter(user_id, counter):
+    UserStats.objects.filter(
+        user_id=user_id, **{f'{counter}__gt': 0}
+    ).update(**{counter: F(counter) - 1})
+
+
+def increment_post_counter(post_id, counter):
+    updated = PostStats.objects.filter(post_id=post_id).update(
+        **{counter: F(counter) + 1}
+    )
+    if not updated:
+        create_post_stats(post_id)
+
+
+def decrement_post_counter(post_id, counter):
+    PostStats.objects.filter(
+        post_id=post_id, **{f'{counter}__gt': 0}
+    ).update(**{counter: F(counter) - 1})
@@ -0,0 +1,182 @@
+"""Follow feed materialization.
+
+Posts are delivered (fanned out) to follower feeds when they are
+published, so the follow page reads one user feed by ``(user, pub_date)``
+index. Posts of popular authors are not fanned out: they are merged into
+the feed at read time. An author becomes popular when followers exceed
+``settings.FEED_FANOUT_LIMIT`` and stops being popular when they drop to
+``settings.FEED_FANOUT_RESUME_LIMIT``, so an author followed and
+unfollowed around one threshold does not rewrite all feeds each time.
+On these switches feed entries of the author posts are removed or
+delivered to all followers, so every post is either in the feeds or
+merged at read time. Feeds get only the latest
+``settings.FEED_BACKFILL_LIMIT`` posts of an author when they follow it
+or when the author stops being popular.
+"""
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import OuterRef, Q, Subquery
+
+from .models import FeedEntry, Follow, Post, UserStats
+
+FEED_BATCH_SIZE = 500
+
+
+def get_popular_authors(authors):
+    """Return ids of authors whose posts are merged at read time.
+
+    Required arguments: authors (QuerySet of author ids).
+    """
+    return list(
+        UserStats.objects.filter(
+            user__in=authors, popular=True
+        ).values_list('user_id', flat=True)
+    )
+
+
+def is_popular(author_id):
+    """Check that author posts are not fanned out to follower feeds."""
+    return UserStats.objects.filter(user_id=author_id, popular=True).exists()
+
+
+def create_entries(entries):
+    """Insert feed entries of the iterable by FEED_BATCH_SIZE rows, so
+    large deliveries are not kept in memory at once."""
+    entries = iter(entries)
+    batch = list(islice(entries, FEED_BATCH_SIZE))
+    while batch:
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        batch = list(islice(entries, FEED_BATCH_SIZE))
+
+
+def fan_out_post(post):
+    """Deliver new post to the feeds of author followers."""
+    if is_popular(post.author_id):
+        return
+    followers = Follow.objects.filter(
+        author_id=post.author_id
+    ).values_list('user_id', flat=True)
+    create_entries(
+        FeedEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+        for user_id in followers.iterator()
+    )
+
+
+def get_author_posts(author_id):
+    """Return (id, pub_date) pairs of the latest FEED_BACKFILL_LIMIT
+    author posts."""
+    return get_authors_posts([author_id])
+
+
+def get_authors_posts(author_ids):
+    """Return (id, pub_date) pairs of the latest FEED_BACKFILL_LIMIT
+    posts of every author by one query."""
+    latest = Post.objects.filter(
+        author_id=OuterRef('author_id')
+    ).order_by('-pub_date', '-pk').values('pk')
+    return Post.objects.filter(
+        author_id__in=author_ids,
+        pk__in=Subquery(latest[:settings.FEED_BACKFILL_LIMIT])
+    ).values_list('id', 'pub_date')
+
+
+def deliver_posts(user_id, posts):
+    """Add (post id, pub_date) pairs to the feed of the user."""
+    create_entries(
+        FeedEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+        for post_id, pub_date in posts
+    )
+
+
+def add_author_posts(user_id, author_id):
+    """Deliver the latest author posts to the feed of the new follower."""
+    if is_popular(author_id):
+        return
+    deliver_posts(user_id, get_author_posts(author_id))
+
+
+def remove_author_posts(user_id, author_id):
+    """Remove author posts from the feed of the former follower."""
+    FeedEntry.objects.filter(
+        user_id=user_id,
+        post__author_id=author_id
+    ).delete()
+
+
+def promote_authors(author_ids):
+    """Mark authors with more than FEED_FANOUT_LIMIT followers popular,
+    remove their posts from all feeds."""
+    popular = list(UserStats.objects.filter(
+        user_id__in=author_ids, popular=False,
+        followers_count__gt=settings.FEED_FANOUT_LIMIT
+    ).values_list('user_id', flat=True))
+    if popular:
+        UserStats.objects.filter(user_id__in=popular).update(popular=True)
+        FeedEntry.objects.filter(post__author_id__in=popular).delete()
+
+
+def demote_author(author_id):
+    """Mark popular author with at most FEED_FANOUT_RESUME_LIMIT
+    followers not popular, deliver the latest author posts to feeds of
+    all followers."""
+    demoted = UserStats.objects.filter(
+        user_id=author_id, popular=True,
+        followers_count__lte=settings.FEED_FANOUT_RESUME_LIMIT
+    ).update(popular=False)
+    if not demoted:
+        return
+    posts = list(get_author_posts(author_id))
+    followers = Follow.objects.filter(
+        author_id=author_id
+    ).values_list('user_id', flat=True)
+    create_entries(
+        FeedEntry(user_id=follower_id, post_id=post_id, pub_date=pub_date)
+        for follower_id in followers.iterator()
+        for post_id, pub_date in posts
+    )
+
+
+def add_followees(user_id, author_ids):
+    """Update feeds after new follows of the user, counters are already
+    updated.
+
+    Posts of authors who became popular are removed from all feeds, they
+    are merged at read time from now on.
+    """
+    promote_authors(author_ids)
+    popular = set(get_popular_authors(author_ids))
+    fanned_out = [
+        author_id for author_id in author_ids if author_id not in popular
+    ]
+    if fanned_out:
+        deliver_posts(user_id, get_authors_posts(fanned_out).iterator())
+
+
+def remove_follower(user_id, author_id):
+    """Update feeds after the unfollow, counters are already updated.
+
+    Posts of the author who is not popular anymore are delivered to
+    feeds of all followers, they are not merged at read time from now on.
+    """
+    remove_author_posts(user_id, author_id)
+    demote_author(author_id)
+
+
+def get_feed(user):
+    """Return follow feed posts queryset of the user.
+
+    Materialized feed entries are read by ``(user, pub_date)`` index,
+    posts of popular followed authors are merged at read time.
+    """
+    popular_authors = get_popular_authors(
+        Follow.objects.filter(user=user).values('author')
+    )
+    if not popular_authors:
+        return Post.objects.select_related('author', 'group').filter(
+            feed_entries__user=user
+        ).order_by('-feed_entries__pub_date')
+    feed_posts = FeedEntry.objects.filter(user=user).values('post')
+    return Post.objects.select_related('author', 'group').filter(
+        Q(pk__in=feed_posts) | Q(author__in=popular_authors)
+    )
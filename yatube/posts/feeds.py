@@ -0,0 +1,202 @@
+"""Atom and RSS feeds of the latest posts, group posts and author posts.
+
+Feed is a cursor window of ``settings.FEED_LIMIT`` latest posts with
+a ``rel="next"`` link to older posts (RFC 5005 paged feed). Feeds are
+cached and answer conditional requests by data versions, so polling
+an unchanged feed runs no database queries.
+"""
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from core.cache import versioned_cache_page, versioned_condition
+from core.paginator import get_cursor_page_object
+from core.url_builder import build_url
+
+from .models import Group, Post
+from .versions import feed_page_versions
+
+User = get_user_model()
+
+FeedPage = namedtuple('FeedPage', ('target', 'posts', 'next_url'))
+
+
+class PagedAtom1Feed(Atom1Feed):
+    """Atom feed with link to the next page."""
+
+    def add_root_elements(self, handler):
+        super().add_root_elements(handler)
+        if self.feed.get('next_url'):
+            handler.addQuickElement(
+                'link', '', {'rel': 'next', 'href': self.feed['next_url']}
+            )
+
+
+class PagedRss201rev2Feed(Rss201rev2Feed):
+    """RSS feed with Atom link to the next page."""
+
+    def add_root_elements(self, handler):
+        super().add_root_elements(handler)
+        if self.feed.get('next_url'):
+            handler.addQuickElement(
+                'atom:link', None,
+                {'rel': 'next', 'href': self.feed['next_url']}
+            )
+
+
+FEED_TYPES = {'atom': PagedAtom1Feed, 'rss': PagedRss201rev2Feed}
+
+
+class PostsFeed(Feed, ABC):
+    """Base feed of a cursor window of posts.
+
+    Subclasses define get_target() and get_posts() of the target.
+    """
+
+    def get_target(self, **kwargs):
+        return None
+
+    @abstractmethod
+    def get_posts(self, target):
+        """Return queryset of the target posts."""
+
+    def get_object(self, request, **kwargs):
+        target = self.get_target(**kwargs)
+        posts = get_cursor_page_object(
+            request,
+            self.get_posts(target).select_related('author'),
+            settings.FEED_LIMIT
+        )
+        next_url = None
+        if posts.has_next():
+            next_url = request.build_absolute_uri(
+                f'{request.path}?cursor={posts.next_cursor()}'
+            )
+        return FeedPage(target, posts, next_url)
+
+    def items(self, page):
+        return page.posts
+
+    def feed_extra_kwargs(self, page):
+        return {'next_url': page.next_url}
+
+    def item_title(self, post):
+        return str(post)
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return build_url('posts:post_detail', post_id=post.pk)
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+
+class IndexFeed(PostsFeed):
+    title = 'Последние обновления на сайте'
+    description = 'Последние посты всех авторов'
+
+    def link(self):
+        return reverse('posts:index')
+
+    def get_posts(self, target):
+        return Post.objects.all()
+
+
+class GroupFeed(PostsFeed):
+    def get_target(self, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, page):
+        return f'Записи сообщества {page.target.title}'
+
+    def description(self, page):
+        return page.target.description
+
+    def link(self, page):
+        return reverse('posts:group_list', kwargs={'slug': page.target.slug})
+
+    def get_posts(self, group):
+        return group.posts.all()
+
+
+class ProfileFeed(PostsFeed):
+    def get_target(self, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, page):
+        author = page.target
+        return f'Посты пользователя {author.get_full_name() or author}'
+
+    def description(self, page):
+        return self.title(page)
+
+    def link(self, page):
+        return reverse(
+            'posts:profile', kwargs={'username': page.target.username}
+        )
+
+    def get_posts(self, author):
+        return author.posts.all()
+
+
+def get_feeds(feed_class):
+    """Return {feed format: feed view} of the feed class."""
+    return {
+        name: type(feed_class.__name__, (feed_class,), {'feed_type': type_})()
+        for name, type_ in FEED_TYPES.items()
+    }
+
+
+INDEX_FEEDS = get_feeds(IndexFeed)
+GROUP_FEEDS = get_feeds(GroupFeed)
+PROFILE_FEEDS = get_feeds(ProfileFeed)
+
+
+def render_feed(feeds, request, feed_format, **kwargs):
+    if feed_format not in feeds:
+        raise Http404
+    return feeds[feed_format](request, **kwargs)
+
+
+@versioned_condition(feed_page_versions, vary_on_user=False)
+@versioned_cache_page(
+    feed_page_versions, settings.PAGE_CACHE_TIMEOUT, vary_on_user=False
+)
+def index_feed(request, feed_format):
+    """Latest posts feed."""
+    return render_feed(INDEX_FEEDS, request, feed_format)
+
+
+@versioned_condition(feed_page_versions, vary_on_user=False)
+@versioned_cache_page(
+    feed_page_versions, settings.PAGE_CACHE_TIMEOUT, vary_on_user=False
+)
+def group_feed(request, slug, feed_format):
+    """Group posts feed."""
+    return render_feed(GROUP_FEEDS, request, feed_format, slug=slug)
+
+
+@versioned_condition(feed_page_versions, vary_on_user=False)
+@versioned_cache_page(
+    feed_page_versions, settings.PAGE_CACHE_TIMEOUT, vary_on_user=False
+)
+def profile_feed(request, username, feed_format):
+    """Author posts feed."""
+    return render_feed(
+        PROFILE_FEEDS, request, feed_format, username=username
+    )
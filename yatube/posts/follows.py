@@ -0,0 +1,85 @@
+"""Idempotent follow and unfollow.
+
+Duplicate follows are rejected by the ``unique_follow`` constraint, so
+concurrent requests need no existence check. Counters, feeds and cache
+versions are updated only for rows actually inserted or deleted.
+"""
+from collections import namedtuple
+
+from django.db import IntegrityError
+
+from core.cache import bump_version
+from core.transaction import atomic
+
+from . import counters, feed, versions
+from .models import Follow
+
+FollowState = namedtuple('FollowState', ('following', 'changed'))
+
+
+def follow(user, author):
+    """Follow the author, return FollowState of the user.
+
+    User can't follow himself.
+    """
+    if user.pk == author.pk:
+        return FollowState(following=False, changed=False)
+    try:
+        # Savepoint keeps outer transaction usable after conflict
+        with atomic(immediate=True):
+            Follow.objects.create(user=user, author=author)
+    except IntegrityError:
+        return FollowState(following=True, changed=False)
+    return FollowState(following=True, changed=True)
+
+
+def unfollow(user, author):
+    """Unfollow the author, return FollowState of the user."""
+    # post_delete is sent for the deleted row by delete()
+    deleted, _ = Follow.objects.filter(user=user, author=author).delete()
+    return FollowState(following=False, changed=bool(deleted))
+
+
+def get_followed_ids(user, author_ids):
+    return set(Follow.objects.filter(
+        user=user, author_id__in=author_ids
+    ).values_list('author_id', flat=True))
+
+
+def bulk_follow(user, authors):
+    """Follow many authors, return list of newly followed authors.
+
+    Already followed authors and the user himself are skipped. Follows
+    are inserted by one statement and ``post_save`` is not sent:
+    counters are recounted by one UPDATE per counter, feed and cache
+    versions are updated for all new follows at once.
+    """
+    authors = {
+        author.pk: author for author in authors if author.pk != user.pk
+    }
+    with atomic(immediate=True):
+        followed = get_followed_ids(user, authors)
+        Follow.objects.bulk_create(
+            [Follow(user=user, author=author)
+             for author_id, author in authors.items()
+             if author_id not in followed],
+            ignore_conflicts=True
+        )
+        new_ids = get_followed_ids(user, authors) - followed
+        if not new_ids:
+            return []
+        # Follows inserted meanwhile by concurrent requests are skipped
+        # by database, counters are set from counts, so they are not
+        # counted twice; feed delivery ignores existing entries.
+        counters.count_follows(user.pk, list(new_ids))
+        feed.add_followees(user.pk, list(new_ids))
+    new_authors = [
+        author for author_id, author in authors.items()
+        if author_id in new_ids
+    ]
+    bump_version(versions.feed_version(user.pk))
+    bump_version(versions.followees_version(user.pk))
+    for author in new_authors:
+        bump_version(versions.profile_version(author.username))
+        bump_version(versions.followers_version(author.pk))
+    return new_authors
@@ -11,6 +11,12 @@ class PostForm(forms.ModelForm):
         fields = ('text', 'group', 'image')
 
 
+class SearchForm(forms.Form):
+    """Posts search form."""
+
+    q = forms.CharField(label='Поиск', max_length=200)
+
+
 class CommentForm(forms.ModelForm):
     """Comment form."""
 
@@ -0,0 +1,167 @@
+"""Follow graph cache.
+
+Followees and followers of a user are cached as sorted arrays of user
+ids (8 bytes per edge) keyed by version stamps of the user adjacency,
+bumped by ``Follow`` signals, and of the whole graph, bumped by bulk
+rebuilds. Adjacency of many users is read by one cache call and missing
+arrays are loaded by one query per ``GRAPH_BATCH_SIZE`` users.
+"""
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core import metrics
+from core.cache import get_versions
+
+from .models import Follow
+from .versions import FOLLOWS_VERSION, followees_version, followers_version
+
+GRAPH_KEY = 'follow_graph:{}:{}:{}'
+SUGGESTIONS_KEY = 'follow_suggestions:{}:{}:{}'
+# SQLite limits query parameters to 999
+GRAPH_BATCH_SIZE = 500
+# Typecode of arrays of user ids
+ID_TYPE = 'q'
+
+
+def _load(field, other, user_ids):
+    """Return {user id: sorted array of ids} of Follow rows."""
+    arrays = {user_id: array(ID_TYPE) for user_id in user_ids}
+    for start in range(0, len(user_ids), GRAPH_BATCH_SIZE):
+        rows = Follow.objects.filter(**{
+            f'{field}__in': user_ids[start:start + GRAPH_BATCH_SIZE]
+        }).values_list(field, other).order_by(field, other)
+        for user_id, edges in groupby(rows, key=itemgetter(0)):
+            arrays[user_id].extend(edge for _, edge in edges)
+    return arrays
+
+
+def _get_adjacency(version_name, field, other, user_ids):
+    user_ids = list(dict.fromkeys(user_ids))
+    names = {user_id: version_name(user_id) for user_id in user_ids}
+    versions = get_versions(FOLLOWS_VERSION, *names.values())
+    keys = {
+        GRAPH_KEY.format(versions[FOLLOWS_VERSION], name, versions[name]):
+        user_id for user_id, name in names.items()
+    }
+    cached = cache.get_many(keys)
+    metrics.record_cache(hits=len(cached), misses=len(keys) - len(cached))
+    arrays = {}
+    for key, value in cached.items():
+        arrays[keys[key]] = array(ID_TYPE)
+        arrays[keys[key]].frombytes(value)
+    missing = [
+        user_id for key, user_id in keys.items() if key not in cached
+    ]
+    if missing:
+        loaded = _load(field, other, missing)
+        cache.set_many({
+            key: loaded[user_id].tobytes()
+            for key, user_id in keys.items() if user_id in loaded
+        }, settings.FOLLOW_GRAPH_CACHE_TIMEOUT)
+        arrays.update(loaded)
+    return arrays
+
+
+def get_followees_many(user_ids):
+    """Return {user id: sorted array of followed author ids}."""
+    return _get_adjacency(
+        followees_version, 'user_id', 'author_id', user_ids
+    )
+
+
+def get_followers_many(author_ids):
+    """Return {author id: sorted array of follower ids}."""
+    return _get_adjacency(
+        followers_version, 'author_id', 'user_id', author_ids
+    )
+
+
+def get_followees(user_id):
+    return get_followees_many([user_id])[user_id]
+
+
+def get_followers(author_id):
+    return get_followers_many([author_id])[author_id]
+
+
+def contains(ids, user_id):
+    """Check that sorted array of ids contains the user id."""
+    index = bisect_left(ids, user_id)
+    return index < len(ids) and ids[index] == user_id
+
+
+def is_following(user_id, author_id):
+    """Check that the user follows the author."""
+    return contains(get_followees(user_id), author_id)
+
+
+def get_followed(user_id, author_ids):
+    """Return set of author ids followed by the user, for list pages."""
+    followees = get_followees(user_id)
+    return {
+        author_id for author_id in author_ids
+        if contains(followees, author_id)
+    }
+
+
+def get_suggestion_sources(followees):
+    """Return at most SUGGESTION_SOURCES followees evenly spread by id."""
+    step = math.ceil(len(followees) / settings.SUGGESTION_SOURCES) or 1
+    return followees[::step]
+
+
+def count_suggestions(user_id, followees):
+    """Return {author id: number of followees following the author}."""
+    counts = Counter()
+    sources = get_suggestion_sources(followees)
+    for ids in get_followees_many(sources).values():
+        counts.update(ids)
+    counts.pop(user_id, None)
+    for author_id in followees:
+        counts.pop(author_id, None)
+    return counts
+
+
+def get_most_common(counts, limit):
+    """Return ids of most common authors, older (smaller id) authors
+    first on ties."""
+    if not counts:
+        return []
+    # Threshold by counts only is cheaper than sorting by key function
+    threshold = heapq.nlargest(limit, counts.values())[-1]
+    return [
+        author_id for _, author_id in sorted(
+            (-count, author_id) for author_id, count in counts.items()
+            if count >= threshold
+        )[:limit]
+    ]
+
+
+def suggest_authors(user_id):
+    """Return ids of at most SUGGESTIONS_LIMIT authors not followed by
+    the user, most followed by the user followees (friends of friends).
+
+    Suggestions are cached for SUGGESTIONS_CACHE_TIMEOUT or until the
+    user follows or unfollows somebody.
+    """
+    name = followees_version(user_id)
+    versions = get_versions(FOLLOWS_VERSION, name)
+    key = SUGGESTIONS_KEY.format(
+        versions[FOLLOWS_VERSION], name, versions[name]
+    )
+    suggestions = cache.get(key)
+    if suggestions is None:
+        suggestions = get_most_common(
+            count_suggestions(user_id, get_followees(user_id)),
+            settings.SUGGESTIONS_LIMIT
+        )
+        cache.set(key, suggestions, settings.SUGGESTIONS_CACHE_TIMEOUT)
+    return suggestions
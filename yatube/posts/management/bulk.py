@@ -0,0 +1,56 @@
+"""Bulk loading helpers shared by data management commands."""
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.db import connection
+
+from core.cache import bump_version
+from posts.models import Group
+from posts.versions import (GROUPS_VERSION, POSTS_VERSION,
+                            group_posts_version)
+
+
+@contextmanager
+def auto_dates_disabled(*fields):
+    """Let bulk_create save given dates instead of current time."""
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_create_batches(model, objects, batch_size, ignore_conflicts=False):
+    """Create objects from iterable in batches of batch_size,
+    return count of objects."""
+    batch = []
+    count = 0
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+            count += len(batch)
+            batch = []
+    model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+    return count + len(batch)
+
+
+def reset_sequences(*models):
+    """Continue primary key sequences after explicitly saved ids."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def invalidate_post_lists():
+    """Bump versions of post lists after objects created in bulk without
+    signals: all posts, groups and follow feeds pages."""
+    bump_version(POSTS_VERSION)
+    bump_version(GROUPS_VERSION)
+    for slug in Group.objects.values_list('slug', flat=True).iterator():
+        bump_version(group_posts_version(slug))
@@ -0,0 +1,149 @@
+import json
+import statistics
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from core.metrics import registry
+from posts.management.scenarios import (WRITE_SCENARIOS, dedicated_cache,
+                                        get_scenarios, rolled_back)
+
+METRICS = ('p50', 'p99', 'queries', 'memory')
+
+
+def count_queries():
+    """Return count of queries of all requests recorded by metrics,
+    including queries run by worker threads."""
+    return sum(stats['queries'] for stats in registry.snapshot().values())
+
+
+def percentile(values, percent):
+    """Return nearest-rank percentile of values."""
+    values = sorted(values)
+    rank = max(1, round(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = ('Benchmark posts views on the current database: latency '
+            'p50/p99 (ms), SQL queries and peak memory (KiB) per request.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Measured requests per scenario.'
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=5,
+            help='Not measured requests per scenario.'
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help=('Clear cache before every request. Benchmark uses its own '
+                  'local memory cache, the configured one is not cleared.')
+        )
+        parser.add_argument(
+            '--writes', action='store_true',
+            help=('Also run scenarios changing data (follow_unfollow), '
+                  'their changes are rolled back.')
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Run only given scenario, may be repeated.'
+        )
+        parser.add_argument('--save', help='Save results to JSON file.')
+        parser.add_argument(
+            '--compare',
+            help='Compare results with baseline JSON file.'
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Allowed relative regression against baseline.'
+        )
+
+    @dedicated_cache()
+    def handle(self, *args, **options):
+        scenarios = get_scenarios(options['writes'])
+        names = options['scenarios'] or list(scenarios)
+        unknown = set(names) - set(scenarios)
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(unknown)}')
+
+        results = {}
+        for name in names:
+            with rolled_back() if name in WRITE_SCENARIOS else nullcontext():
+                results[name] = self.run(
+                    scenarios[name], options['requests'],
+                    options['warmup'], options['cold']
+                )
+            self.stdout.write(self.format_row(name, results[name]))
+
+        if options['save']:
+            with open(options['save'], 'w') as file:
+                json.dump(results, file, indent=2, sort_keys=True)
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+            regressions = self.compare(
+                results, baseline, options['threshold']
+            )
+            if regressions:
+                raise CommandError(
+                    f'Regressions: {", ".join(regressions)}'
+                )
+            self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def run(self, request, requests, warmup, cold):
+        """Return latency percentiles, queries and memory of scenario."""
+        for _ in range(warmup):
+            request()
+        timings, queries, memory = [], [], []
+        for _ in range(requests):
+            if cold:
+                cache.clear()
+            tracemalloc.start()
+            queries_before = count_queries()
+            start = time.perf_counter()
+            request()
+            timings.append(time.perf_counter() - start)
+            queries.append(count_queries() - queries_before)
+            memory.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        # Latency is measured under tracemalloc, compare it only with
+        # results of this command.
+        return {
+            'p50': percentile(timings, 50) * 1000,
+            'p99': percentile(timings, 99) * 1000,
+            'queries': statistics.mean(queries),
+            'memory': max(memory) / 1024,
+        }
+
+    def format_row(self, name, result):
+        return (
+            f"{name:<16} p50 {result['p50']:8.2f} ms  "
+            f"p99 {result['p99']:8.2f} ms  "
+            f"queries {result['queries']:6.1f}  "
+            f"memory {result['memory']:9.1f} KiB"
+        )
+
+    def compare(self, results, baseline, threshold):
+        """Print changes against baseline, return regressed metrics."""
+        regressions = []
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            for metric in METRICS:
+                old, new = baseline[name][metric], result[metric]
+                change = (new - old) / old if old else float(new > old)
+                line = f'{name:<16} {metric:<8} {old:10.2f} -> {new:10.2f}'
+                if change > threshold:
+                    regressions.append(f'{name}.{metric}')
+                    self.stdout.write(self.style.ERROR(
+                        f'{line} +{change:.0%}'
+                    ))
+                else:
+                    self.stdout.write(f'{line} {change:+.0%}')
+        return regressions
@@ -0,0 +1,159 @@
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import Client, override_settings
+
+from core.asgi import ASGIHandler, get_environ
+from posts.management.scenarios import (dedicated_cache, get_objects,
+                                        get_read_urls)
+
+from .benchmark import percentile
+
+SERVERS = ('wsgi', 'asgi')
+# Independent queries of views run one by one or concurrently
+QUERIES = ('sequential', 'concurrent')
+
+
+def get_scope(url, cookie):
+    path, _, query = url.partition('?')
+    headers = [(b'host', b'localhost')]
+    if cookie:
+        headers.append((b'cookie', cookie.encode()))
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query.encode(),
+        'headers': headers,
+    }
+
+
+class Command(BaseCommand):
+    help = ('Compare throughput (requests/s) and latency of posts views '
+            'served by WSGI threads and the ASGI application, with '
+            'sequential and concurrent view queries, under concurrent '
+            'load.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Measured requests per scenario and server.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=8,
+            help='Concurrent clients.'
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Run only given scenario, may be repeated.'
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Clear cache before every request.'
+        )
+
+    @dedicated_cache()
+    def handle(self, *args, **options):
+        objects = get_objects()
+        urls = get_read_urls(objects)
+        names = options['scenarios'] or list(urls)
+        unknown = set(names) - set(urls)
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(unknown)}')
+        client = Client()
+        client.force_login(objects['reader'])
+        session = client.cookies[settings.SESSION_COOKIE_NAME].value
+        cookie = f'{settings.SESSION_COOKIE_NAME}={session}'
+
+        self.cold = options['cold']
+        self.wsgi = get_wsgi_application()
+        self.asgi = ASGIHandler(self.wsgi)
+        for name in names:
+            url, logged_in = urls[name]
+            scope = get_scope(url, cookie if logged_in else None)
+            for server, queries in itertools.product(SERVERS, QUERIES):
+                run = getattr(self, f'run_{server}')
+                concurrent = queries == 'concurrent'
+                with override_settings(CONCURRENT_QUERIES=concurrent):
+                    # Warm up caches and connections of worker threads
+                    run(scope, options['concurrency'], options['concurrency'])
+                    timings, elapsed = run(
+                        scope, options['requests'], options['concurrency']
+                    )
+                self.stdout.write(self.format_row(
+                    name, f'{server} {queries}', timings, elapsed
+                ))
+
+    def call_wsgi(self, scope):
+        if self.cold:
+            cache.clear()
+        start = time.perf_counter()
+        response = self.wsgi(get_environ(scope, BytesIO()), self.start)
+        try:
+            b''.join(response)
+        finally:
+            response.close()
+        return time.perf_counter() - start
+
+    @staticmethod
+    def start(status, headers, exc_info=None):
+        if not status.startswith(('200', '304')):
+            raise CommandError(f'Response status {status}')
+
+    def run_wsgi(self, scope, requests, concurrency):
+        """WSGI server: thread per concurrent request."""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            timings = list(executor.map(
+                lambda _: self.call_wsgi(scope), range(requests)
+            ))
+        return timings, time.perf_counter() - start
+
+    async def call_asgi(self, scope):
+        if self.cold:
+            cache.clear()
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        start = time.perf_counter()
+        await self.asgi(scope, receive, send)
+        status = messages[0]['status']
+        if status not in (200, 304):
+            raise CommandError(f'Response status {status}')
+        return time.perf_counter() - start
+
+    def run_asgi(self, scope, requests, concurrency):
+        """ASGI server: concurrent clients on one event loop."""
+        counter = itertools.count()
+        timings = []
+
+        async def client():
+            while next(counter) < requests:
+                timings.append(await self.call_asgi(scope))
+
+        async def main():
+            await asyncio.gather(*(client() for _ in range(concurrency)))
+
+        start = time.perf_counter()
+        asyncio.run(main())
+        return timings, time.perf_counter() - start
+
+    def format_row(self, name, server, timings, elapsed):
+        return (
+            f'{name:<16} {server:<16} '
+            f'{len(timings) / elapsed:8.1f} req/s  '
+            f'p50 {percentile(timings, 50) * 1000:8.2f} ms  '
+            f'p99 {percentile(timings, 99) * 1000:8.2f} ms'
+        )
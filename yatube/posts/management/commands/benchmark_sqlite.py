@@ -0,0 +1,157 @@
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.sqlite import DEFAULT_PRAGMAS, get_pragmas
+from posts.management.scenarios import (dedicated_cache, get_objects,
+                                        get_read_urls)
+
+from .benchmark import percentile
+
+
+def is_write(number, writes):
+    """Spread writes percent of requests evenly."""
+    return number * writes % 100 < writes
+
+
+class Command(BaseCommand):
+    help = ('Compare read and write throughput (requests/s) and latency '
+            'of posts views under concurrent workers with SQLite default '
+            'pragmas and deferred transactions and with SQLITE_PRAGMAS and '
+            'SQLITE_TRANSACTION_MODE. Writes add comments, run on a copy '
+            'of the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=1000,
+            help='Measured requests per profile.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=8,
+            help='Concurrent workers.'
+        )
+        parser.add_argument(
+            '--writes', type=int, default=20,
+            help='Percent of requests adding a comment.'
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Clear cache before every request.'
+        )
+
+    @dedicated_cache()
+    def handle(self, *args, **options):
+        if not settings.SQLITE_PRAGMAS:
+            raise CommandError('SQLITE_PRAGMAS is empty.')
+        if connection.vendor != 'sqlite':
+            raise CommandError('Database is not SQLite.')
+        objects = get_objects()
+        self.reads = list(get_read_urls(objects).values())
+        self.write_url = reverse(
+            'posts:add_comment', kwargs={'post_id': objects['post'].pk}
+        )
+        self.reader = objects['reader']
+        self.cold = options['cold']
+        profiles = {
+            'default': (DEFAULT_PRAGMAS, 'DEFERRED'),
+            'tuned': (settings.SQLITE_PRAGMAS,
+                      settings.SQLITE_TRANSACTION_MODE),
+        }
+        for profile, (pragmas, transaction_mode) in profiles.items():
+            # Journal mode is changed by the first connection of profile
+            connections.close_all()
+            with override_settings(SQLITE_PRAGMAS=pragmas,
+                                   SQLITE_TRANSACTION_MODE=transaction_mode):
+                mode = get_pragmas(connection, ['journal_mode'])
+                results = self.run(
+                    options['requests'], options['concurrency'],
+                    options['writes']
+                )
+            connections.close_all()
+            self.stdout.write(
+                f'{profile} (journal_mode={mode["journal_mode"]}, '
+                f'{transaction_mode} write transactions)'
+            )
+            for kind, (timings, elapsed, errors) in results.items():
+                self.stdout.write(
+                    self.format_row(kind, timings, elapsed, errors)
+                )
+        # Leave the database in the configured journal mode
+        get_pragmas(connection, ['journal_mode'])
+
+    def request(self, client, number, writes):
+        """Return (kind, time) of the request, time is None on
+        database error."""
+        if self.cold:
+            cache.clear()
+        start = time.perf_counter()
+        try:
+            if is_write(number, writes):
+                kind = 'write'
+                response = client.post(
+                    self.write_url, {'text': f'Benchmark comment {number}'}
+                )
+            else:
+                kind = 'read'
+                url, _ = self.reads[number % len(self.reads)]
+                response = client.get(url)
+        except OperationalError:
+            # Database is locked longer than busy timeout
+            return kind, None
+        if response.status_code not in (200, 302, 304):
+            raise CommandError(f'Response status {response.status_code}')
+        return kind, time.perf_counter() - start
+
+    def worker(self, counter, requests, writes, results):
+        client = Client()
+        client.force_login(self.reader)
+        try:
+            number = next(counter)
+            while number < requests:
+                results.append(self.request(client, number, writes))
+                number = next(counter)
+        finally:
+            connections.close_all()
+
+    def run(self, requests, concurrency, writes):
+        """Return {kind: (timings, elapsed, errors)} of requests made by
+        concurrent workers."""
+        counter = itertools.count()
+        results = []
+        threads = [
+            threading.Thread(
+                target=self.worker, args=(counter, requests, writes, results)
+            ) for _ in range(concurrency)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return {
+            kind: (
+                [timing for other, timing in results
+                 if other == kind and timing is not None],
+                elapsed,
+                sum(other == kind and timing is None
+                    for other, timing in results),
+            ) for kind in ('read', 'write')
+        }
+
+    def format_row(self, kind, timings, elapsed, errors):
+        if not timings:
+            return f'  {kind:<6} no completed requests, {errors} errors'
+        return (
+            f'  {kind:<6} {len(timings) / elapsed:8.1f} req/s  '
+            f'p50 {percentile(timings, 50) * 1000:8.2f} ms  '
+            f'p99 {percentile(timings, 99) * 1000:8.2f} ms  '
+            f'{errors} errors'
+        )
@@ -0,0 +1,120 @@
+import copy
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.template.backends.django import Template
+from django.template.loader import get_template
+from django.test import Client, override_settings
+
+from posts.management.scenarios import (dedicated_cache, get_objects,
+                                        get_read_urls)
+
+from .benchmark import percentile
+
+# Template loaders of compared modes
+MODES = {
+    'default': settings.TEMPLATE_LOADERS,
+    'cached': [
+        ('django.template.loaders.cached.Loader', settings.TEMPLATE_LOADERS)
+    ],
+    'precompiled': [
+        ('core.template_loaders.Loader', settings.TEMPLATE_LOADERS)
+    ],
+}
+
+
+def get_templates_setting(loaders):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['OPTIONS']['loaders'] = loaders
+    return templates
+
+
+@contextmanager
+def capturing_renders():
+    """Collect {template name: (context, request)} of the first render
+    of every project template rendered meanwhile."""
+    render = Template.render
+    renders = {}
+
+    @wraps(render)
+    def capture(self, context=None, request=None):
+        # Form widgets are rendered by a separate engine
+        if self.backend is engines['django']:
+            renders.setdefault(
+                self.origin.template_name, (context, request)
+            )
+        return render(self, context, request)
+
+    Template.render = capture
+    try:
+        yield renders
+    finally:
+        Template.render = render
+
+
+class Command(BaseCommand):
+    help = ('Benchmark render time p50/p99 (ms) of every template rendered '
+            'by posts views with default, cached and precompiled template '
+            'loaders.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--renders', type=int, default=200,
+            help='Measured renders per template and mode.'
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Run only given scenario, may be repeated.'
+        )
+
+    @dedicated_cache()
+    def handle(self, *args, **options):
+        objects = get_objects()
+        urls = get_read_urls(objects)
+        names = options['scenarios'] or list(urls)
+        unknown = set(names) - set(urls)
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(unknown)}')
+        anonymous = Client()
+        client = Client()
+        client.force_login(objects['reader'])
+
+        # Contexts of cache misses render all templates of the pages
+        cache.clear()
+        with capturing_renders() as renders:
+            for name in names:
+                url, logged_in = urls[name]
+                (client if logged_in else anonymous).get(url)
+
+        for template_name, (context, request) in renders.items():
+            for mode, loaders in MODES.items():
+                with override_settings(
+                    TEMPLATES=get_templates_setting(loaders)
+                ):
+                    timings = self.run(
+                        template_name, context, request, options['renders']
+                    )
+                self.stdout.write(self.format_row(
+                    template_name, mode, timings
+                ))
+
+    def run(self, template_name, context, request, renders):
+        """Return render times of the template, loading included."""
+        timings = []
+        for _ in range(renders):
+            start = time.perf_counter()
+            get_template(template_name).render(context, request)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def format_row(self, template_name, mode, timings):
+        return (
+            f'{template_name:<36} {mode:<12} '
+            f'p50 {percentile(timings, 50) * 1000:8.3f} ms  '
+            f'p99 {percentile(timings, 99) * 1000:8.3f} ms'
+        )
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from contextlib import nullcontext
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.management.scenarios import (WRITE_SCENARIOS, dedicated_cache,
+                                        get_scenarios, rolled_back)
+
+# Query plan lines of table scans and sorts not using index
+PROBLEMS = {
+    'sqlite': {'FULL SCAN': 'SCAN ', 'SORT': 'USE TEMP B-TREE'},
+    'postgresql': {'FULL SCAN': 'Seq Scan', 'SORT': 'Sort '},
+}
+# Scans using index and scans of subquery results are not table scans
+SCAN_EXCEPTIONS = ('USING INDEX', 'USING COVERING INDEX',
+                   'USING INTEGER PRIMARY KEY', 'SCAN subquery',
+                   'SCAN CONSTANT ROW')
+
+
+class Command(BaseCommand):
+    help = ('Run EXPLAIN on SQL queries of posts views and flag full '
+            'table scans and sorts not using index.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Explain only given scenario, may be repeated.'
+        )
+        parser.add_argument(
+            '--writes', action='store_true',
+            help=('Also explain scenarios changing data (follow_unfollow), '
+                  'their changes are rolled back.')
+        )
+        parser.add_argument(
+            '--fail', action='store_true',
+            help='Exit with error when problems are found.'
+        )
+
+    @dedicated_cache()
+    def handle(self, *args, **options):
+        if connection.vendor not in PROBLEMS:
+            raise CommandError(
+                f'Database {connection.vendor} is not supported.'
+            )
+        scenarios = get_scenarios(options['writes'])
+        names = options['scenarios'] or list(scenarios)
+        flagged = 0
+        for name in names:
+            if name not in scenarios:
+                raise CommandError(f'Unknown scenario: {name}')
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            with rolled_back() if name in WRITE_SCENARIOS else nullcontext():
+                queries = self.capture(scenarios[name])
+            for sql in queries:
+                flagged += self.explain(sql)
+        if flagged and options['fail']:
+            raise CommandError(f'Problems found: {flagged}')
+        self.stdout.write(f'Problems found: {flagged}')
+
+    def capture(self, request):
+        """Return unique SELECT queries issued by the scenario."""
+        # Pages and cards cache must not hide queries, the cache is
+        # dedicated to the command
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            request()
+        return OrderedDict.fromkeys(
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        )
+
+    def explain(self, sql):
+        """Print query plan, return number of problems in it."""
+        prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' \
+            else 'EXPLAIN'
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}')
+            plan = [' '.join(map(str, row)) for row in cursor.fetchall()]
+        problems = [self.get_problem(line) for line in plan]
+        style = self.style.WARNING if any(problems) else self.style.SQL_FIELD
+        self.stdout.write(style(f'  {sql[:200]}'))
+        for line, problem in zip(plan, problems):
+            if problem:
+                self.stdout.write(self.style.ERROR(f'    {problem}: {line}'))
+            else:
+                self.stdout.write(f'    {line}')
+        return len(list(filter(None, problems)))
+
+    def get_problem(self, line):
+        """Return problem name of query plan line or None."""
+        if any(exception in line for exception in SCAN_EXCEPTIONS):
+            return None
+        for problem, marker in PROBLEMS[connection.vendor].items():
+            if marker in line:
+                return problem
+        return None
@@ -0,0 +1,58 @@
+import sys
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from posts.management.transfer import FORMATS, WRITERS, export_records
+
+
+def get_format(path, format_):
+    if format_:
+        return format_
+    return 'csv' if path.endswith('.csv') else 'jsonl'
+
+
+class Command(BaseCommand):
+    help = ('Export users, groups, posts, comments and follows as JSON '
+            'Lines or CSV streamed in constant memory.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Output file, "-" for standard output.'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Output format, by file extension by default.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Rows fetched from database at once.'
+        )
+        parser.add_argument(
+            '--progress', type=int, default=100000,
+            help='Report progress every number of rows, 0 disables.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        write = WRITERS[get_format(path, options['format'])]
+        records = export_records(options['batch_size'])
+        if path == '-':
+            counts = self.export(write(records, sys.stdout), options)
+        else:
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                counts = self.export(write(records, file), options)
+        self.stderr.write(self.style.SUCCESS(
+            'Exported ' + ', '.join(
+                f'{kind} {count}' for kind, count in counts.items()
+            )
+        ))
+
+    def export(self, written, options):
+        counts = Counter()
+        for kind in written:
+            counts[kind] += 1
+            if options['progress'] and counts[kind] % options['progress'] == 0:
+                self.stderr.write(f'{kind}: {counts[kind]}')
+        return counts
@@ -0,0 +1,155 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from posts.management.bulk import (auto_dates_disabled, bulk_create_batches,
+                                   invalidate_post_lists)
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+PASSWORD = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = ('Generate synthetic users, groups, posts, comments and follows '
+            'for benchmarks. Users password is "benchmark".')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument('--follows', type=int, default=10000)
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='Posts and comments dates are spread over number of days.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--prefix', default='bench',
+            help='Prefix of generated usernames and group slugs.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if User.objects.filter(
+            username__startswith=f"{options['prefix']}_"
+        ).exists():
+            raise CommandError(
+                f"Data with prefix '{options['prefix']}' already exists."
+            )
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.period = options['days'] * 24 * 60 * 60
+        prefix = options['prefix']
+
+        with transaction.atomic():
+            user_ids = self.create_users(prefix, options['users'])
+            group_ids = self.create_groups(prefix, options['groups'])
+            post_ids = self.create_posts(
+                options['posts'], user_ids, group_ids
+            )
+            comments = self.create_comments(
+                options['comments'], user_ids, post_ids
+            )
+            follows = self.create_follows(options['follows'], user_ids)
+
+        # Objects created in bulk skip signals, so counters, feeds
+        # and search index are rebuilt from scratch.
+        call_command('reconcile_counters', stdout=self.stdout)
+        call_command('rebuild_feed', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        invalidate_post_lists()
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated users {len(user_ids)}, groups {len(group_ids)}, '
+            f'posts {len(post_ids)}, comments {comments}, follows {follows}'
+        ))
+
+    def random_date(self):
+        return self.now - timedelta(
+            seconds=self.random.randrange(self.period or 1)
+        )
+
+    def bulk_create(self, model, objects):
+        """Create objects from iterable in batches of batch_size."""
+        bulk_create_batches(model, objects, self.batch_size)
+
+    def create_users(self, prefix, count):
+        # Hashing is slow, all users share one password hash
+        password = make_password(PASSWORD)
+        self.bulk_create(User, (
+            User(username=f'{prefix}_{i}', password=password)
+            for i in range(count)
+        ))
+        return list(User.objects.filter(
+            username__startswith=f'{prefix}_'
+        ).values_list('pk', flat=True))
+
+    def create_groups(self, prefix, count):
+        self.bulk_create(Group, (
+            Group(
+                title=f'Group {i}',
+                slug=f'{prefix}-{i}',
+                description=f'Benchmark group {i}'
+            ) for i in range(count)
+        ))
+        return list(Group.objects.filter(
+            slug__startswith=f'{prefix}-'
+        ).values_list('pk', flat=True))
+
+    def create_posts(self, count, user_ids, group_ids):
+        if not user_ids:
+            return []
+        # Every 4th post is out of groups
+        group_ids = group_ids + [None] * (len(group_ids) // 3 or 1)
+        last_pk = Post.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        with auto_dates_disabled(Post._meta.get_field('pub_date')):
+            self.bulk_create(Post, (
+                Post(
+                    author_id=self.random.choice(user_ids),
+                    group_id=self.random.choice(group_ids),
+                    text=f'Benchmark post {i}',
+                    pub_date=self.random_date()
+                ) for i in range(count)
+            ))
+        posts = Post.objects.filter(pk__gt=last_pk)
+        # Generated posts were not edited
+        posts.update(updated_at=F('pub_date'))
+        return list(posts.values_list('pk', flat=True))
+
+    def create_comments(self, count, user_ids, post_ids):
+        if not user_ids or not post_ids:
+            return 0
+        with auto_dates_disabled(Comment._meta.get_field('created')):
+            self.bulk_create(Comment, (
+                Comment(
+                    post_id=self.random.choice(post_ids),
+                    author_id=self.random.choice(user_ids),
+                    text=f'Benchmark comment {i}',
+                    created=self.random_date()
+                ) for i in range(count)
+            ))
+        return count
+
+    def create_follows(self, count, user_ids):
+        # Self follows and duplicates are skipped
+        count = min(count, len(user_ids) * (len(user_ids) - 1))
+        pairs = set()
+        while len(pairs) < count:
+            user_id, author_id = self.random.sample(user_ids, 2)
+            pairs.add((user_id, author_id))
+        self.bulk_create(Follow, (
+            Follow(user_id=user_id, author_id=author_id)
+            for user_id, author_id in pairs
+        ))
+        return len(pairs)
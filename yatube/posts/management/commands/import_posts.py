@@ -0,0 +1,126 @@
+import sys
+from collections import Counter
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from posts.management.bulk import (auto_dates_disabled, invalidate_post_lists,
+                                   reset_sequences)
+from posts.management.transfer import (FORMATS, KINDS, READERS, batches,
+                                       build_object, get_kind)
+
+from .export_posts import get_format
+
+
+class Command(BaseCommand):
+    help = ('Import users, groups, posts, comments and follows from JSON '
+            'Lines or CSV made by export_posts, streamed in constant '
+            'memory into an empty database. Interrupted import is '
+            'repeated with --resume: rows with existing ids are skipped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Input file, "-" for standard input.'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Input format, by file extension by default.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Rows inserted by one statement.'
+        )
+        parser.add_argument(
+            '--progress', type=int, default=100000,
+            help='Report progress every number of rows, 0 disables.'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help=('Continue interrupted import into non-empty database, '
+                  'skip rows already imported.')
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        read = READERS[get_format(path, options['format'])]
+        # Imported ids would collide with ids of existing rows
+        if not options['resume'] and any(
+            model.objects.exists() for model, _ in KINDS.values()
+        ):
+            raise CommandError(
+                'Database is not empty, use --resume to continue '
+                'interrupted import.'
+            )
+        try:
+            if path == '-':
+                counts, skipped = self.load(read(sys.stdin), options)
+            else:
+                with open(path, encoding='utf-8', newline='') as file:
+                    counts, skipped = self.load(read(file), options)
+        except (ValueError, KeyError) as error:
+            raise CommandError(f'Invalid record: {error}')
+        except IntegrityError as error:
+            raise CommandError(f'Conflicting record: {error}')
+        reset_sequences(*(model for model, _ in KINDS.values()))
+        # Objects created in bulk skip signals, so counters, feeds
+        # and search index are rebuilt from scratch.
+        call_command('reconcile_counters', stdout=self.stdout)
+        call_command('rebuild_feed', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        invalidate_post_lists()
+        self.stdout.write(self.style.SUCCESS(
+            'Imported ' + ', '.join(
+                f'{kind} {count - skipped[kind]}'
+                for kind, count in counts.items()
+            )
+        ))
+        skipped = +skipped
+        if skipped:
+            self.stdout.write('Skipped already imported ' + ', '.join(
+                f'{kind} {count}' for kind, count in skipped.items()
+            ))
+
+    def load(self, records, options):
+        counts = Counter()
+        skipped = Counter()
+        progress = options['progress']
+        dates = [
+            field for model, _ in KINDS.values()
+            for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now', False)
+            or getattr(field, 'auto_now_add', False)
+        ]
+        with auto_dates_disabled(*dates):
+            for kind, batch in batches(records, options['batch_size']):
+                objects = [build_object(kind, data) for data in batch]
+                if options['resume']:
+                    objects = self.skip_existing(kind, objects)
+                    skipped[kind] += len(batch) - len(objects)
+                get_kind(kind)[0].objects.bulk_create(objects)
+                reported = progress and counts[kind] // progress
+                counts[kind] += len(batch)
+                if progress and counts[kind] // progress > reported:
+                    self.stderr.write(f'{kind}: {counts[kind]}')
+        return counts, skipped
+
+    def skip_existing(self, kind, objects):
+        """Return objects not imported yet.
+
+        Existing row with the same id must be the same record, otherwise
+        references of the following records would be wrong.
+        """
+        model, fields = get_kind(kind)
+        fields = [model._meta.get_field(name) for name in fields]
+        existing = model.objects.in_bulk([obj.pk for obj in objects])
+        for obj in objects:
+            if obj.pk in existing and any(
+                field.value_to_string(obj)
+                != field.value_to_string(existing[obj.pk])
+                for field in fields
+            ):
+                raise CommandError(
+                    f'Record {kind} {obj.pk} differs from existing row.'
+                )
+        return [obj for obj in objects if obj.pk not in existing]
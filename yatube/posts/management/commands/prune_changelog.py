@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.changes import prune_changes
+
+
+class Command(BaseCommand):
+    help = 'Delete old change log rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.CHANGELOG_RETENTION_DAYS,
+            help='Keep changes of the last days.'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_changes(
+            timezone.now() - timedelta(days=options['days'])
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Change log pruned, deleted: {deleted}'
+        ))
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.cache import bump_version
+from posts import feed
+from posts.models import FeedEntry, Follow, UserStats
+from posts.versions import FEEDS_VERSION, FOLLOWS_VERSION
+
+
+class Command(BaseCommand):
+    help = 'Rebuild materialized follow feeds.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Rebuild feed of the user with given username only.'
+        )
+
+    def handle(self, *args, **options):
+        follows = Follow.objects.all()
+        entries = FeedEntry.objects.all()
+        if options['user']:
+            follows = follows.filter(user__username=options['user'])
+            entries = entries.filter(user__username=options['user'])
+        with transaction.atomic():
+            if not options['user']:
+                # Authors are popular by current followers counts
+                popular = UserStats.objects.filter(
+                    followers_count__gt=settings.FEED_FANOUT_LIMIT
+                )
+                popular.update(popular=True)
+                UserStats.objects.exclude(
+                    pk__in=popular.values('pk')
+                ).update(popular=False)
+            entries.delete()
+            for user_id, author_id in follows.values_list(
+                'user_id', 'author_id'
+            ).iterator():
+                feed.add_author_posts(user_id, author_id)
+            # Follows may be inserted in bulk without signals
+            bump_version(FOLLOWS_VERSION)
+            bump_version(FEEDS_VERSION)
+        self.stdout.write(self.style.SUCCESS(
+            f'Feeds rebuilt, entries: {FeedEntry.objects.count()}'
+        ))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.changes import get_changed_ids, get_last_change_id
+from posts.models import Post, SearchEntry
+from posts.search import get_term_weights
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Rebuild posts full-text search index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--after', type=int,
+            help='Reindex only posts changed after this change log id.'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            last_change_id = get_last_change_id()
+            posts = Post.objects.all()
+            entries = SearchEntry.objects.all()
+            if options['after'] is not None:
+                post_ids = get_changed_ids(Post, options['after'])
+                posts = posts.filter(pk__in=post_ids)
+                entries = entries.filter(post_id__in=post_ids)
+            entries.delete()
+            entries = []
+            for post_id, text in posts.values_list('pk', 'text').iterator():
+                entries.extend(
+                    SearchEntry(post_id=post_id, term=term, weight=weight)
+                    for term, weight in get_term_weights(text).items()
+                )
+                if len(entries) >= BATCH_SIZE:
+                    SearchEntry.objects.bulk_create(entries)
+                    entries = []
+            SearchEntry.objects.bulk_create(entries)
+        self.stdout.write(self.style.SUCCESS(
+            f'Search index rebuilt, entries: {SearchEntry.objects.count()}, '
+            f'last change: {last_change_id}'
+        ))
@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Comment, Follow, Post, PostStats, UserStats
+
+User = get_user_model()
+BATCH_SIZE = 500
+
+
+def count_subquery(queryset, field):
+    """Return correlated subquery counting queryset rows by field."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+class Command(BaseCommand):
+    help = 'Recount denormalized user and post counters and fix drift.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            users_fixed = self.reconcile(
+                User.objects.annotate(
+                    actual_posts_count=count_subquery(
+                        Post.objects.all(), 'author'),
+                    actual_followers_count=count_subquery(
+                        Follow.objects.all(), 'author'),
+                    actual_following_count=count_subquery(
+                        Follow.objects.all(), 'user'),
+                ),
+                UserStats,
+                'user_id',
+                ('posts_count', 'followers_count', 'following_count')
+            )
+            posts_fixed = self.reconcile(
+                Post.objects.annotate(
+                    actual_comments_count=count_subquery(
+                        Comment.objects.all(), 'post'),
+                ),
+                PostStats,
+                'post_id',
+                ('comments_count',)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Counters fixed: users {users_fixed}, posts {posts_fixed}'
+        ))
+
+    def reconcile(self, queryset, stats_model, key, counters):
+        """Compare counters with actual counts, return fixed rows count."""
+        queryset = queryset.select_related('stats').order_by('pk')
+        to_create, to_update = [], []
+        fixed = 0
+        for obj in queryset.iterator():
+            actual = {
+                counter: getattr(obj, f'actual_{counter}')
+                for counter in counters
+            }
+            try:
+                stats = obj.stats
+            except stats_model.DoesNotExist:
+                to_create.append(stats_model(**{key: obj.pk}, **actual))
+            else:
+                if any(getattr(stats, name) != value
+                       for name, value in actual.items()):
+                    for name, value in actual.items():
+                        setattr(stats, name, value)
+                    to_update.append(stats)
+            if len(to_create) + len(to_update) >= BATCH_SIZE:
+                fixed += self.save(stats_model, counters, to_create, to_update)
+                to_create, to_update = [], []
+        return fixed + self.save(stats_model, counters, to_create, to_update)
+
+    def save(self, stats_model, counters, to_create, to_update):
+        stats_model.objects.bulk_create(to_create)
+        stats_model.objects.bulk_update(to_update, counters)
+        return len(to_create) + len(to_update)
@@ -0,0 +1,117 @@
+"""Requests to posts views used by benchmark and explain_queries."""
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.db.models import Count, F
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from posts.models import Follow, Group, Post
+
+User = get_user_model()
+
+# Scenarios changing data, run only on request and rolled back
+WRITE_SCENARIOS = ('follow_unfollow',)
+
+
+def dedicated_cache():
+    """Return override_settings of a local memory cache for benchmark
+    commands: clearing it for cold requests does not flush the
+    configured cache, which may be shared with running servers."""
+    return override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'benchmark',
+        }
+    })
+
+
+@contextmanager
+def rolled_back():
+    """Run write scenarios in a transaction rolled back at exit."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def get_objects():
+    """Return {name: object} of objects requested by scenarios."""
+    post = Post.objects.order_by('-pub_date').first()
+    group = Group.objects.annotate(
+        posts_total=Count('posts')
+    ).order_by('-posts_total').first()
+    author = User.objects.order_by(
+        F('stats__posts_count').desc(nulls_last=True)
+    ).first()
+    reader = User.objects.order_by(
+        F('stats__following_count').desc(nulls_last=True)
+    ).first()
+    if None in (post, group, author, reader):
+        raise CommandError(
+            'Database is empty, run generate_data command first.'
+        )
+    # Author followed and unfollowed back by reader
+    followed = Follow.objects.filter(user=reader).values('author')
+    other = User.objects.exclude(pk=reader.pk).exclude(
+        pk__in=followed
+    ).first()
+    return {
+        'post': post, 'group': group, 'author': author, 'reader': reader,
+        'other': other,
+    }
+
+
+def get_read_urls(objects):
+    """Return {name: (url, logged in)} of read scenarios, logged in
+    requests are made by objects['reader']."""
+    post = objects['post']
+    query = urlencode({'q': post.text.split()[0]})
+    return {
+        'index': (reverse('posts:index'), False),
+        'group_posts': (reverse(
+            'posts:group_list', kwargs={'slug': objects['group'].slug}
+        ), False),
+        'profile': (reverse(
+            'posts:profile', kwargs={'username': objects['author'].username}
+        ), False),
+        'post_detail': (reverse(
+            'posts:post_detail', kwargs={'post_id': post.pk}
+        ), False),
+        'post_comments': (reverse(
+            'posts:post_comments', kwargs={'post_id': post.pk}
+        ), False),
+        'follow_index': (reverse('posts:follow_index'), True),
+        'search': (f"{reverse('posts:search')}?{query}", False),
+    }
+
+
+def get_scenarios(writes=False):
+    """Return {name: function making scenario requests}, with
+    WRITE_SCENARIOS if writes is True."""
+    objects = get_objects()
+    other = objects['other']
+    anonymous = Client()
+    client = Client()
+    client.force_login(objects['reader'])
+
+    def follow_unfollow():
+        client.get(reverse(
+            'posts:profile_follow', kwargs={'username': other.username}
+        ))
+        client.get(reverse(
+            'posts:profile_unfollow', kwargs={'username': other.username}
+        ))
+
+    def get(url, logged_in):
+        return lambda: (client if logged_in else anonymous).get(url)
+
+    scenarios = {
+        name: get(url, logged_in)
+        for name, (url, logged_in) in get_read_urls(objects).items()
+    }
+    if writes and other is not None:
+        scenarios['follow_unfollow'] = follow_unfollow
+    return scenarios
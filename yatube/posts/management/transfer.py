@@ -0,0 +1,139 @@
+"""Streaming export and import of posts application data.
+
+Records are ``(kind, row)`` pairs flowing through generators: querysets
+are read with ``iterator()``, written line by line as JSON Lines or CSV,
+and read back in batches of consecutive records of one kind, so memory
+use does not depend on the amount of data.
+
+JSON Lines record is an object with ``type`` key. CSV stream has
+a header row (first cell ``type``) before records of each kind, record
+rows start with their kind.
+"""
+import csv
+import json
+from datetime import datetime
+from itertools import groupby, islice
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+FORMATS = ('jsonl', 'csv')
+# Kinds in dependency order: referenced rows are imported first
+KINDS = {
+    'user': (User, (
+        'id', 'username', 'password', 'first_name', 'last_name', 'email',
+        'is_staff', 'is_active', 'is_superuser', 'date_joined',
+    )),
+    'group': (Group, ('id', 'title', 'slug', 'description')),
+    'post': (Post, (
+        'id', 'text', 'pub_date', 'updated_at', 'author_id', 'group_id',
+        'image',
+    )),
+    'comment': (Comment, ('id', 'post_id', 'author_id', 'text', 'created')),
+    'follow': (Follow, ('id', 'user_id', 'author_id')),
+}
+
+
+class RecordEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping microseconds of dates."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def export_records(chunk_size):
+    """Yield (kind, values tuple) records of all kinds."""
+    for kind, (model, fields) in KINDS.items():
+        rows = model.objects.order_by('pk').values_list(*fields)
+        for row in rows.iterator(chunk_size=chunk_size):
+            yield kind, row
+
+
+def write_jsonl(records, file):
+    for kind, row in records:
+        data = dict(zip(KINDS[kind][1], row), type=kind)
+        file.write(json.dumps(data, cls=RecordEncoder) + '\n')
+        yield kind
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def write_csv(records, file):
+    writer = csv.writer(file)
+    current = None
+    for kind, row in records:
+        if kind != current:
+            writer.writerow(['type', *KINDS[kind][1]])
+            current = kind
+        writer.writerow([kind, *map(_csv_value, row)])
+        yield kind
+
+
+def read_jsonl(file):
+    """Yield (kind, {field: value}) records."""
+    for line in file:
+        if line.strip():
+            data = json.loads(line)
+            yield data.pop('type'), data
+
+
+def read_csv(file):
+    """Yield (kind, {field: string}) records."""
+    fields = None
+    for row in csv.reader(file):
+        if row and row[0] == 'type':
+            fields = row[1:]
+        elif row:
+            if fields is None:
+                raise ValueError('CSV header row is missing.')
+            yield row[0], dict(zip(fields, row[1:]))
+
+
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+
+def get_kind(kind):
+    """Return (model, fields) of the record kind."""
+    if kind not in KINDS:
+        raise ValueError(f'Unknown record type: {kind}.')
+    return KINDS[kind]
+
+
+def build_object(kind, data):
+    """Return unsaved model instance of the record."""
+    model, fields = get_kind(kind)
+    values = {}
+    for name in fields:
+        if name not in data:
+            continue
+        field = model._meta.get_field(name)
+        value = data[name]
+        # CSV has no null, empty strings of nullable fields are nulls
+        if value == '' and field.null:
+            value = None
+        values[field.attname] = field.to_python(value)
+    return model(**values)
+
+
+def batches(records, size):
+    """Yield (kind, list of records data) batches of consecutive
+    records of one kind, up to size records each."""
+    for kind, group in groupby(records, key=lambda record: record[0]):
+        group = (data for _, data in group)
+        batch = list(islice(group, size))
+        while batch:
+            yield kind, batch
+            batch = list(islice(group, size))
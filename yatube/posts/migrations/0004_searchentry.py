@@ -0,0 +1,46 @@
+# Generated by Django 2.2.28 on 2026-10-17 04:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_search_index(apps, schema_editor):
+    """Index text of existing posts."""
+    from posts.search import get_term_weights
+
+    Post = apps.get_model('posts', 'Post')
+    SearchEntry = apps.get_model('posts', 'SearchEntry')
+    for post_id, text in Post.objects.values_list('id', 'text').iterator():
+        SearchEntry.objects.bulk_create(
+            [SearchEntry(post_id=post_id, term=term, weight=weight)
+             for term, weight in get_term_weights(text).items()],
+            batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Термин')),
+                ('weight', models.FloatField(verbose_name='Вес')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='posts.Post')),
+            ],
+            options={
+                'verbose_name': 'запись поискового индекса',
+                'verbose_name_plural': 'записи поискового индекса',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('term', 'post'), name='unique_search_entry'),
+        ),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 500
+
+
+def count(queryset, field):
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')}).order_by()
+        .values(field).annotate(count=Count('pk')).values('count'),
+        output_field=IntegerField()
+    ), 0)
+
+
+def create_stats(model, objects, key, counters):
+    """Create counters rows of objects in batches."""
+    batch = []
+    for obj in objects.order_by('pk').iterator():
+        batch.append(model(**{key: obj.pk}, **{
+            counter: getattr(obj, f'actual_{counter}') for counter in counters
+        }))
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    model.objects.bulk_create(batch)
+
+
+def backfill_stats(apps, schema_editor):
+    """Counters rows are created with users and posts, create rows of
+    existing ones from actual counts."""
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    Follow = apps.get_model('posts', 'Follow')
+    create_stats(
+        apps.get_model('posts', 'UserStats'),
+        User.objects.filter(stats__isnull=True).annotate(
+            actual_posts_count=count(Post.objects.all(), 'author'),
+            actual_followers_count=count(Follow.objects.all(), 'author'),
+            actual_following_count=count(Follow.objects.all(), 'user'),
+        ),
+        'user_id',
+        ('posts_count', 'followers_count', 'following_count')
+    )
+    create_stats(
+        apps.get_model('posts', 'PostStats'),
+        Post.objects.filter(stats__isnull=True).annotate(
+            actual_comments_count=count(Comment.objects.all(), 'post'),
+        ),
+        'post_id',
+        ('comments_count',)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0007_changelog'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
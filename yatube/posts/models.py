@@ -32,6 +32,10 @@ class Post(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -57,6 +61,18 @@ class Post(models.Model):
         ordering = ('-pub_date',)
         verbose_name = 'пост'
         verbose_name_plural = 'посты'
+        # Ascending indexes are scanned backwards for descending order,
+        # together with implicit primary key tiebreaker of keyset pages.
+        indexes = (
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('group', 'pub_date'),
+                name='post_group_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:settings.TEXT_FIELD_LIMIT]
@@ -91,6 +107,12 @@ class Comment(models.Model):
         ordering = ('-created',)
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
+        indexes = (
+            models.Index(
+                fields=('post', 'created'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:settings.TEXT_FIELD_LIMIT]
@@ -113,6 +135,163 @@ class Follow(models.Model):
     class Meta:
         verbose_name = 'подписка'
         verbose_name_plural = 'подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='unique_follow'
+            ),
+        )
 
     def __str__(self):
         return f'{self.user} following {self.author}'
+
+
+class FeedEntry(models.Model):
+    """Follow feed entry model.
+
+    Materialized timeline row: post of the followed author delivered
+    to the follower feed.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+    )
+    pub_date = models.DateTimeField('Дата публикации')
+
+    class Meta:
+        ordering = ('-pub_date',)
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'записи ленты'
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date'),
+                name='feed_user_pub_date_idx'
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'),
+                name='unique_feed_entry'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post} in {self.user} feed'
+
+
+class UserStats(models.Model):
+    """User counters model (denormalized post and follow counts)."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    posts_count = models.PositiveIntegerField('Постов', default=0)
+    followers_count = models.PositiveIntegerField('Подписчиков', default=0)
+    following_count = models.PositiveIntegerField('Подписок', default=0)
+    # Posts are merged into follow feeds at read time (see posts.feed)
+    popular = models.BooleanField('Популярный автор', default=False)
+
+    class Meta:
+        verbose_name = 'счетчики пользователя'
+        verbose_name_plural = 'счетчики пользователей'
+
+    def __str__(self):
+        return f'{self.user} stats'
+
+
+class PostStats(models.Model):
+    """Post counters model (denormalized comments count)."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    comments_count = models.PositiveIntegerField('Комментариев', default=0)
+
+    class Meta:
+        verbose_name = 'счетчики поста'
+        verbose_name_plural = 'счетчики постов'
+
+    def __str__(self):
+        return f'{self.post} stats'
+
+
+class SearchEntry(models.Model):
+    """Search index entry model.
+
+    Inverted index row: stemmed term of the post text with its
+    saturated term frequency weight.
+    """
+
+    term = models.CharField('Термин', max_length=64)
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_entries'
+    )
+    weight = models.FloatField('Вес')
+
+    class Meta:
+        verbose_name = 'запись поискового индекса'
+        verbose_name_plural = 'записи поискового индекса'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('term', 'post'),
+                name='unique_search_entry'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.term} in {self.post_id}'
+
+
+class ChangeLog(models.Model):
+    """Change log model.
+
+    Row per saved or deleted post, group or user. Consumers keep id of
+    the last processed row and read newer changes only.
+    """
+
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTIONS = (
+        (CREATED, 'создан'),
+        (UPDATED, 'изменен'),
+        (DELETED, 'удален'),
+    )
+
+    model = models.CharField('Модель', max_length=32)
+    object_id = models.PositiveIntegerField('Id объекта')
+    action = models.CharField('Действие', max_length=8, choices=ACTIONS)
+    changed = models.DateTimeField(
+        'Дата изменения',
+        auto_now_add=True,
+        db_index=True
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'изменение'
+        verbose_name_plural = 'журнал изменений'
+        indexes = (
+            models.Index(
+                fields=('model', 'object_id'),
+                name='changelog_object_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.model} {self.object_id} {self.action}'
@@ -0,0 +1,109 @@
+"""Posts full-text search.
+
+Post text is split into words, words are stemmed and stored in
+``SearchEntry`` inverted index with saturated term frequency weight
+(BM25 without length normalization). Posts containing all query terms
+are ranked by sum of term weights multiplied by term IDF.
+"""
+import math
+import re
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Case, Count, F, FloatField, Sum, When
+
+from core.stemmer import stem
+
+from .models import Post, SearchEntry
+
+WORD_RE = re.compile(r'[^\W_]+')
+TERM_MAX_LENGTH = SearchEntry._meta.get_field('term').max_length
+# BM25 term frequency saturation parameter
+K1 = 1.2
+DOCUMENTS_COUNT_KEY = 'search:documents'
+DOCUMENTS_COUNT_TIMEOUT = 60 * 60
+
+
+def get_terms(text):
+    """Return list of stemmed terms of the text."""
+    return [
+        stem(word)[:TERM_MAX_LENGTH]
+        for word in WORD_RE.findall(text.lower())
+    ]
+
+
+def get_term_weights(text):
+    """Return {term: weight} of the text."""
+    return {
+        term: count * (K1 + 1) / (count + K1)
+        for term, count in Counter(get_terms(text)).items()
+    }
+
+
+def index_post(post):
+    """Replace search index entries of the post."""
+    SearchEntry.objects.filter(post=post).delete()
+    SearchEntry.objects.bulk_create(
+        SearchEntry(post=post, term=term, weight=weight)
+        for term, weight in get_term_weights(post.text).items()
+    )
+
+
+def _documents_count():
+    # Exact posts count is not needed for IDF, it is cached
+    # to avoid table scan on every search.
+    return cache.get_or_set(
+        DOCUMENTS_COUNT_KEY, Post.objects.count, DOCUMENTS_COUNT_TIMEOUT
+    )
+
+
+def matching_post_ids(query):
+    """Return subquery of ids of posts containing all query terms."""
+    terms = set(get_terms(query))
+    return (
+        SearchEntry.objects.filter(term__in=terms)
+        .values('post')
+        .annotate(matched=Count('term'))
+        .filter(matched=len(terms))
+        .values('post')
+    )
+
+
+def search(query):
+    """Return queryset of {'post': id, 'score': rank} dicts of posts
+    matching the query, best ranked first."""
+    terms = set(get_terms(query))
+    frequencies = dict(
+        SearchEntry.objects.filter(term__in=terms)
+        .values_list('term')
+        .annotate(Count('pk'))
+        .order_by()
+    )
+    if not terms or len(frequencies) < len(terms):
+        return SearchEntry.objects.none()
+    documents = max(_documents_count(), max(frequencies.values()))
+    idf = {
+        term: math.log(1 + (documents - count + 0.5) / (count + 0.5))
+        for term, count in frequencies.items()
+    }
+    return (
+        SearchEntry.objects.filter(term__in=terms)
+        .values('post')
+        .annotate(
+            matched=Count('term'),
+            score=Sum(Case(
+                *(When(term=term, then=F('weight') * value)
+                  for term, value in idf.items()),
+                output_field=FloatField()
+            ))
+        )
+        .filter(matched=len(terms))
+        .order_by('-score', '-post')
+    )
+
+
+def get_posts(results):
+    """Return posts of search results page in results order."""
+    ids = [result['post'] for result in results]
+    posts = Post.objects.select_related('author', 'group').in_bulk(ids)
+    return [posts[pk] for pk in ids if pk in posts]
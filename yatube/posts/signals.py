@@ -0,0 +1,222 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_version
+
+from . import changes, counters, feed, search, thumbnails, versions
+from .models import ChangeLog, Comment, Follow, Group, Post
+
+User = get_user_model()
+
+# User fields shown in post cards and pages
+AUTHOR_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Post)
+def create_counters(sender, instance, created, raw=False, **kwargs):
+    """Create counters row of the new user or post."""
+    if created and not raw:
+        if sender is Post:
+            counters.init_post_stats(instance.pk)
+        else:
+            counters.init_user_stats(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def count_new_post(sender, instance, created, raw=False, **kwargs):
+    """Increment author posts counter."""
+    if created and not raw:
+        counters.increment_user_counter(instance.author_id, 'posts_count')
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    """Decrement author posts counter."""
+    counters.decrement_user_counter(instance.author_id, 'posts_count')
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, raw=False, **kwargs):
+    """Increment post comments counter."""
+    if created and not raw:
+        counters.increment_post_counter(instance.post_id, 'comments_count')
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    """Decrement post comments counter."""
+    counters.decrement_post_counter(instance.post_id, 'comments_count')
+
+
+@receiver(post_save, sender=Follow)
+def count_new_follow(sender, instance, created, raw=False, **kwargs):
+    """Increment author followers and user following counters."""
+    if created and not raw:
+        counters.increment_user_counter(instance.author_id, 'followers_count')
+        counters.increment_user_counter(instance.user_id, 'following_count')
+
+
+@receiver(post_delete, sender=Follow)
+def count_deleted_follow(sender, instance, **kwargs):
+    """Decrement author followers and user following counters."""
+    counters.decrement_user_counter(instance.author_id, 'followers_count')
+    counters.decrement_user_counter(instance.user_id, 'following_count')
+
+
+@receiver(post_save, sender=Post)
+def deliver_post_to_feeds(sender, instance, created, raw=False, **kwargs):
+    """Fan out new post to follower feeds."""
+    if created and not raw:
+        feed.fan_out_post(instance)
+
+
+@receiver(post_save, sender=Follow)
+def fill_follower_feed(sender, instance, created, raw=False, **kwargs):
+    """Deliver author posts to the new follower feed."""
+    if created and not raw:
+        feed.add_followees(instance.user_id, [instance.author_id])
+
+
+@receiver(post_delete, sender=Follow)
+def clean_follower_feed(sender, instance, **kwargs):
+    """Remove author posts from the former follower feed."""
+    feed.remove_follower(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def index_post_text(sender, instance, raw=False, **kwargs):
+    """Update post terms in the search index."""
+    if not raw:
+        search.index_post(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_save, sender=User)
+def log_saved(sender, instance, created, raw=False, update_fields=None,
+              **kwargs):
+    """Record saved post, group or user in the change log."""
+    # Login updates last_login only, user data is not changed
+    if raw or update_fields and set(update_fields) == {'last_login'}:
+        return
+    changes.record_change(
+        instance, ChangeLog.CREATED if created else ChangeLog.UPDATED
+    )
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=User)
+def log_deleted(sender, instance, **kwargs):
+    """Record deleted post, group or user in the change log."""
+    changes.record_change(instance, ChangeLog.DELETED)
+
+
+@receiver(post_init, sender=Post)
+def remember_group(sender, instance, **kwargs):
+    """Remember post group to invalidate it when the post is moved."""
+    # Deferred group is not loaded
+    instance.loaded_group_id = instance.__dict__.get('group_id')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    """Invalidate changed post card and pages, post lists and author
+    posts."""
+    bump_version(versions.post_version(instance.pk))
+    bump_version(versions.POSTS_VERSION)
+    bump_version(versions.user_posts_version(instance.author_id))
+    bump_version(versions.profile_version(instance.author.username))
+    group_ids = {instance.group_id, instance.loaded_group_id} - {None}
+    if group_ids:
+        for slug in Group.objects.filter(pk__in=group_ids).values_list(
+            'slug', flat=True
+        ):
+            bump_version(versions.group_posts_version(slug))
+    instance.loaded_group_id = instance.group_id
+    versions.set_post_refs(instance)
+
+
+@receiver(post_init, sender=Group)
+def remember_slug(sender, instance, **kwargs):
+    """Remember group slug to invalidate old group page on rename."""
+    instance.loaded_slug = instance.__dict__.get('slug')
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group(sender, instance, **kwargs):
+    """Invalidate cards of changed group posts and post lists."""
+    bump_version(versions.group_version(instance.pk))
+    for slug in {instance.slug, instance.loaded_slug} - {None}:
+        bump_version(versions.group_posts_version(slug))
+    bump_version(versions.GROUPS_VERSION)
+    bump_version(versions.POSTS_VERSION)
+    instance.loaded_slug = instance.slug
+
+
+def get_author_name(user):
+    """Return displayed author fields, None for deferred ones."""
+    return tuple(user.__dict__.get(field) for field in AUTHOR_NAME_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_author_name(sender, instance, **kwargs):
+    """Remember displayed author fields to skip saves not changing
+    them (logins, password changes)."""
+    instance.loaded_name = get_author_name(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author(sender, instance, created, **kwargs):
+    """Invalidate cards of changed author posts and post lists."""
+    name = get_author_name(instance)
+    old_username = instance.loaded_name[0]
+    changed = name != instance.loaded_name
+    instance.loaded_name = name
+    if created:
+        # New author has no posts, only missing profile page changes
+        bump_version(versions.profile_version(instance.username))
+        return
+    if not changed:
+        return
+    bump_version(versions.user_version(instance.pk))
+    bump_version(versions.AUTHORS_VERSION)
+    bump_version(versions.POSTS_VERSION)
+    for username in {instance.username, old_username} - {None}:
+        bump_version(versions.profile_version(username))
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_author_profile(sender, instance, **kwargs):
+    """Invalidate profile page with follow button of the author
+    and follow feed of the user."""
+    bump_version(versions.profile_version(instance.author.username))
+    bump_version(versions.feed_version(instance.user_id))
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_graph(sender, instance, **kwargs):
+    """Invalidate cached followees of the user and followers of the
+    author."""
+    bump_version(versions.followees_version(instance.user_id))
+    bump_version(versions.followers_version(instance.author_id))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    """Invalidate comments of the post."""
+    bump_version(versions.comments_version(instance.post_id))
+
+
+@receiver(post_save, sender=Post)
+def pregenerate_thumbnails(sender, instance, raw=False, **kwargs):
+    """Generate post image thumbnails in background."""
+    if instance.image and not raw:
+        thumbnails.enqueue_thumbnails(instance.pk)
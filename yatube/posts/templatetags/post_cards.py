@@ -0,0 +1,11 @@
+from django import template
+
+from ..cards import render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Return rendered post cards from fragment cache."""
+    return render_post_cards(posts)
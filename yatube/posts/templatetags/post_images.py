@@ -0,0 +1,20 @@
+from django import template
+
+from ..thumbnails import enqueue_thumbnails, get_ready_thumbnail
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_thumbnail(post, size):
+    """Return ready thumbnail of the post image or None.
+
+    Missing thumbnail is queued for generation, template shows the
+    original image meanwhile.
+    """
+    if not post.image:
+        return None
+    thumbnail = get_ready_thumbnail(post.image, size)
+    if thumbnail is None:
+        enqueue_thumbnails(post.pk)
+    return thumbnail
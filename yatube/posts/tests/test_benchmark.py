@@ -0,0 +1,222 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from ..feed import get_feed
+from ..management.scenarios import rolled_back
+from ..models import Comment, Follow, Group, Post, UserStats
+
+
+class GenerateDataTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command(
+            'generate_data', users=20, groups=3, posts=60, comments=40,
+            follows=30, batch_size=7, stdout=StringIO()
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_objects_generated(self):
+        """Command creates requested number of objects."""
+        counts = {
+            Group: 3,
+            Post: 60,
+            Comment: 40,
+            Follow: 30,
+            UserStats: 20,
+        }
+        for model, count in counts.items():
+            with self.subTest(model=model.__name__):
+                self.assertEqual(model.objects.count(), count)
+
+    def test_pub_dates_spread(self):
+        """Posts dates are spread instead of being creation time."""
+        self.assertGreater(
+            Post.objects.values('pub_date').distinct().count(), 50,
+            'Posts dates are not spread'
+        )
+
+    def test_counters_and_feeds_rebuilt(self):
+        """Counters and feeds of generated data are consistent."""
+        follow = Follow.objects.select_related('user__stats').first()
+        self.assertEqual(
+            follow.user.stats.following_count,
+            Follow.objects.filter(user=follow.user).count(),
+            'Counters are not rebuilt'
+        )
+        self.assertEqual(
+            set(get_feed(follow.user)),
+            set(Post.objects.filter(author__following__user=follow.user)),
+            'Feeds are not rebuilt'
+        )
+
+    def test_pages_invalidated(self):
+        """Pages cached before generation are not answered as not
+        modified."""
+        url = reverse('posts:index')
+        etag = self.client.get(url)['ETag']
+        call_command(
+            'generate_data', prefix='more', users=2, groups=1, posts=2,
+            comments=0, follows=0, stdout=StringIO()
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200, 'Page is not modified')
+
+    def test_existing_prefix(self):
+        """Data is not generated twice with the same prefix."""
+        with self.assertRaises(CommandError):
+            call_command('generate_data', users=1, stdout=StringIO())
+
+    def test_benchmark(self):
+        """Benchmark reports scenarios and detects regressions."""
+        path = os.path.join(tempfile.mkdtemp(), 'baseline.json')
+        output = StringIO()
+        call_command(
+            'benchmark', requests=2, warmup=0, save=path, stdout=output
+        )
+        for scenario in ('index', 'group_posts', 'profile', 'post_detail',
+                         'follow_index'):
+            with self.subTest(scenario=scenario):
+                self.assertIn(scenario, output.getvalue())
+        self.assertNotIn(
+            'follow_unfollow', output.getvalue(),
+            'Write scenario is run without --writes'
+        )
+        with open(path) as file:
+            baseline = json.load(file)
+        baseline['index']['queries'] = 0.5
+        with open(path, 'w') as file:
+            json.dump(baseline, file)
+        with self.assertRaisesMessage(CommandError, 'index.queries'):
+            call_command(
+                'benchmark', requests=2, warmup=0, scenarios=['index'],
+                cold=True, compare=path, stdout=StringIO()
+            )
+
+    def test_benchmark_writes_rolled_back(self):
+        """Write scenarios run only on request and leave no changes."""
+        follows = list(Follow.objects.values_list('user', 'author'))
+        output = StringIO()
+        with mock.patch(
+            'posts.management.commands.benchmark.rolled_back',
+            wraps=rolled_back
+        ) as transaction:
+            call_command(
+                'benchmark', requests=2, warmup=0,
+                scenarios=['follow_unfollow'], writes=True, stdout=output
+            )
+        self.assertIn('follow_unfollow', output.getvalue())
+        transaction.assert_called_once_with()
+        self.assertEqual(
+            list(Follow.objects.values_list('user', 'author')), follows,
+            'Follows are changed'
+        )
+
+    def test_configured_cache_not_cleared(self):
+        """Cold benchmark and query plans do not clear the configured
+        cache."""
+        cache.set('key', 'value')
+        call_command(
+            'benchmark', requests=1, warmup=0, scenarios=['index'],
+            cold=True, stdout=StringIO()
+        )
+        call_command(
+            'explain_queries', scenarios=['index'], stdout=StringIO()
+        )
+        self.assertEqual(cache.get('key'), 'value', 'Cache is cleared')
+
+    def test_benchmark_templates(self):
+        """Templates of scenarios are measured in every loader mode."""
+        output = StringIO()
+        call_command(
+            'benchmark_templates', renders=2, scenarios=['index'],
+            stdout=output
+        )
+        for template in ('posts/index.html', 'posts/includes/post.html'):
+            for mode in ('default', 'cached', 'precompiled'):
+                with self.subTest(template=template, mode=mode):
+                    self.assertRegex(
+                        output.getvalue(), f'{template} +{mode} +p50'
+                    )
+
+    def test_explain_queries(self):
+        """Query plans of scenarios are printed, table scans flagged."""
+        output = StringIO()
+        call_command('explain_queries', stdout=output)
+        for scenario in ('index', 'profile', 'follow_index'):
+            with self.subTest(scenario=scenario):
+                self.assertIn(scenario, output.getvalue())
+        self.assertNotIn(
+            'FULL SCAN', output.getvalue(), 'Hot query scans table'
+        )
+
+
+class BenchmarkServersTests(TransactionTestCase):
+    """Servers benchmark requests are made by other threads, which
+    see only committed data."""
+
+    def setUp(self):
+        cache.clear()
+        call_command(
+            'generate_data', users=10, groups=2, posts=20, comments=10,
+            follows=10, stdout=StringIO()
+        )
+
+    def test_benchmark_servers(self):
+        """Both servers are measured with both queries modes."""
+        output = StringIO()
+        call_command(
+            'benchmark_servers', requests=4, concurrency=2,
+            scenario=['profile', 'follow_index'], cold=True, stdout=output
+        )
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 8, 'Scenario results are missing')
+        servers = (
+            'wsgi sequential', 'wsgi concurrent',
+            'asgi sequential', 'asgi concurrent',
+        )
+        for line, server in zip(lines, servers * 2):
+            with self.subTest(line=line):
+                self.assertIn(f' {server} ', line)
+                self.assertIn('req/s', line)
+
+
+class BenchmarkSqliteTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        call_command(
+            'generate_data', users=10, groups=2, posts=20, comments=10,
+            follows=10, stdout=StringIO()
+        )
+
+    def test_benchmark_sqlite(self):
+        """Reads and writes are measured with both pragma profiles."""
+        comments = Comment.objects.count()
+        output = StringIO()
+        call_command(
+            'benchmark_sqlite', requests=4, concurrency=1, writes=50,
+            stdout=output
+        )
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 6, 'Profile results are missing')
+        for line, profile in zip(lines[::3], ('default', 'tuned')):
+            with self.subTest(profile=profile):
+                self.assertTrue(line.startswith(f'{profile} (journal_mode='))
+        for line in lines[1::3] + lines[2::3]:
+            with self.subTest(line=line):
+                self.assertIn('req/s', line)
+                self.assertIn(' 0 errors', line)
+        self.assertEqual(
+            Comment.objects.count(), comments + 4, 'Comments are not added'
+        )
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..cards import render_post_cards
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostCardsCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='author', first_name='Лев', last_name='Толстой'
+        )
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-group',
+            description='Test description'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            author=PostCardsCacheTests.author,
+            text='Cached text',
+            group=PostCardsCacheTests.group
+        )
+
+    def render_card(self):
+        post = Post.objects.select_related('author', 'group').get(
+            pk=self.post.pk
+        )
+        return render_post_cards([post])[0]
+
+    def test_card_is_cached(self):
+        """Card is rendered from cache while post is not saved."""
+        self.render_card()
+        Post.objects.filter(pk=self.post.pk).update(text='Updated text')
+        self.assertIn('Cached text', self.render_card(), 'Card is not cached')
+
+    def test_post_save_invalidates_card(self):
+        """Post save invalidates its card."""
+        self.render_card()
+        self.post.text = 'Updated text'
+        self.post.save()
+        self.assertIn(
+            'Updated text', self.render_card(), 'Card is not invalidated'
+        )
+
+    def test_group_save_invalidates_card(self):
+        """Group save invalidates cards of its posts."""
+        self.render_card()
+        group = PostCardsCacheTests.group
+        group.slug = 'new-slug'
+        group.save()
+        self.assertIn(
+            '/group/new-slug/', self.render_card(), 'Card is not invalidated'
+        )
+
+    def test_author_save_invalidates_card(self):
+        """Author name change invalidates cards of author posts."""
+        self.render_card()
+        author = PostCardsCacheTests.author
+        author.first_name = 'Фёдор'
+        author.save()
+        self.assertIn('Фёдор', self.render_card(), 'Card is not invalidated')
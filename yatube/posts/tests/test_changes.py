@@ -0,0 +1,119 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..changes import get_changed_ids, get_last_change_id
+from ..models import ChangeLog, Group, Post, SearchEntry
+
+User = get_user_model()
+
+
+class ChangeLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-group',
+            description='Test description'
+        )
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            author=ChangeLogTests.author, text='Test post'
+        )
+        self.client = Client()
+        self.client.force_login(ChangeLogTests.author)
+
+    def get_actions(self, instance, after=0):
+        return list(
+            ChangeLog.objects.filter(
+                model=instance._meta.model_name,
+                object_id=instance.pk,
+                pk__gt=after
+            ).values_list('action', flat=True)
+        )
+
+    def test_post_edit_updates_timestamp(self):
+        """Post edit changes updated_at and is logged."""
+        last_change_id = get_last_change_id()
+        response = self.client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            {'text': 'Edited post', 'group': ChangeLogTests.group.pk}
+        )
+        self.assertEqual(response.status_code, 302)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertGreater(
+            post.updated_at, post.pub_date, 'updated_at is not changed'
+        )
+        self.assertEqual(
+            self.get_actions(post, last_change_id), [ChangeLog.UPDATED]
+        )
+
+    def test_changes_are_logged(self):
+        """Created, updated and deleted objects are logged."""
+        group = Group.objects.create(title='New', slug='new')
+        group.save()
+        group_id = group.pk
+        group.delete()
+        group.pk = group_id
+        self.assertEqual(
+            self.get_actions(group),
+            [ChangeLog.CREATED, ChangeLog.UPDATED, ChangeLog.DELETED]
+        )
+        self.assertEqual(self.get_actions(self.post), [ChangeLog.CREATED])
+
+    def test_login_is_not_logged(self):
+        """Login updating last_login only is not a user change."""
+        user = User.objects.create_user(username='user', password='pass')
+        last_change_id = get_last_change_id()
+        Client().login(username='user', password='pass')
+        self.assertEqual(self.get_actions(user, last_change_id), [])
+
+    def test_get_changed_ids(self):
+        """Only ids of objects changed after change id are returned."""
+        last_change_id = get_last_change_id()
+        post = Post.objects.create(
+            author=ChangeLogTests.author, text='New post'
+        )
+        self.assertEqual(
+            get_changed_ids(Post, last_change_id), {post.pk}
+        )
+        self.assertEqual(
+            get_changed_ids(
+                Post, last_change_id, actions=[ChangeLog.DELETED]
+            ),
+            set()
+        )
+
+    def test_incremental_search_index(self):
+        """Search index is rebuilt for changed posts only."""
+        last_change_id = get_last_change_id()
+        Post.objects.filter(pk=self.post.pk).update(text='Stale text')
+        post = Post.objects.create(
+            author=ChangeLogTests.author, text='Fresh post'
+        )
+        SearchEntry.objects.filter(post=post).delete()
+        call_command(
+            'rebuild_search_index', after=last_change_id, stdout=StringIO()
+        )
+        self.assertTrue(
+            SearchEntry.objects.filter(post=post).exists(),
+            'Changed post is not indexed'
+        )
+        self.assertFalse(
+            SearchEntry.objects.filter(
+                post=self.post, term='stale'
+            ).exists(),
+            'Not changed post is reindexed'
+        )
+
+    def test_prune_changelog(self):
+        """Old changes are deleted."""
+        ChangeLog.objects.update(changed='2001-01-01T00:00:00Z')
+        call_command('prune_changelog', stdout=StringIO())
+        self.assertFalse(ChangeLog.objects.exists(), 'Changes not pruned')
@@ -0,0 +1,174 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.test import Client, TestCase, TransactionTestCase
+from django.test import override_settings
+
+from core.db_router import STICKY_COOKIE
+from django.urls import reverse
+
+from .. import comment_buffer
+from ..counters import get_post_stats
+from ..models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(COMMENT_WRITE_BUFFER=True)
+class BufferedCommentViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.post = Post.objects.create(author=cls.user, text='Post')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(BufferedCommentViewTests.user)
+
+    def post_comment(self, post_id, text):
+        return self.client.post(
+            reverse('posts:add_comment', kwargs={'post_id': post_id}),
+            {'text': text}
+        )
+
+    def test_comment_written(self):
+        """Comment is written before redirect, counter is incremented."""
+        post = BufferedCommentViewTests.post
+        response = self.post_comment(post.pk, 'Comment')
+        self.assertRedirects(
+            response,
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        self.assertTrue(
+            Comment.objects.filter(post=post, text='Comment').exists(),
+            'Comment is not written'
+        )
+        post = Post.objects.select_related('stats').get(pk=post.pk)
+        self.assertEqual(get_post_stats(post).comments_count, 1)
+
+    def test_not_written(self):
+        """Comment of missing post is 404, empty comment is skipped."""
+        self.assertEqual(self.post_comment(0, 'Comment').status_code, 404)
+        self.assertEqual(
+            self.post_comment(BufferedCommentViewTests.post.pk, '')
+            .status_code, 302
+        )
+        self.assertFalse(Comment.objects.exists(), 'Comment is written')
+
+
+@override_settings(COMMENT_WRITE_BUFFER=True, COMMENT_BUFFER_DELAY=0.05)
+class CommentBufferWriterTests(TransactionTestCase):
+    """Comments are written by the writer thread, which sees only
+    committed data."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(username=f'user{i}') for i in range(4)
+        ]
+        self.post = Post.objects.create(author=self.users[0], text='Post')
+        self.writer = comment_buffer.CommentWriter()
+
+    def tearDown(self):
+        self.writer.stop()
+        if self.writer.thread is not None:
+            self.writer.thread.join()
+
+    def write_comments(self, user, count):
+        for i in range(count):
+            comment_buffer.write_comment(
+                Comment(post_id=self.post.pk, author=user, text=f'{i}'),
+                self.writer
+            )
+
+    def test_burst(self):
+        """Burst of comments is written in batches, comments of every
+        user keep their order."""
+        threads = [
+            threading.Thread(target=self.write_comments, args=(user, 5))
+            for user in self.users
+        ]
+        with mock.patch.object(
+            comment_buffer, '_insert', wraps=comment_buffer._insert
+        ) as insert:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(Comment.objects.count(), 20)
+        self.assertLess(insert.call_count, 20, 'Comments are not batched')
+        for user in self.users:
+            with self.subTest(user=user.username):
+                texts = Comment.objects.filter(author=user).order_by('pk')
+                self.assertEqual(
+                    [comment.text for comment in texts],
+                    [str(i) for i in range(5)],
+                    'Comments order is changed'
+                )
+        post = Post.objects.select_related('stats').get(pk=self.post.pk)
+        self.assertEqual(get_post_stats(post).comments_count, 20)
+
+    def test_saved_signal_has_pk(self):
+        """post_save receivers of buffered comments get saved rows."""
+        pks = []
+
+        def receiver(sender, instance, created, **kwargs):
+            pks.append(instance.pk)
+
+        post_save.connect(receiver, sender=Comment)
+        self.addCleanup(post_save.disconnect, receiver, sender=Comment)
+        comment_buffer._write([
+            comment_buffer.PendingComment(
+                Comment(post_id=self.post.pk, author=user, text='Comment')
+            ) for user in self.users[:2]
+        ])
+        self.assertEqual(
+            pks,
+            list(Comment.objects.order_by('pk').values_list('pk', flat=True)),
+            'post_save is sent without primary key'
+        )
+
+    def test_failed_comment(self):
+        """Failed comment does not fail other comments of the batch."""
+        batch = [
+            comment_buffer.PendingComment(
+                Comment(post_id=self.post.pk, author_id=author_id, text='')
+            ) for author_id in (self.users[0].pk, 0, self.users[1].pk)
+        ]
+        with self.assertLogs('posts.comment_buffer', 'ERROR'):
+            comment_buffer._write(batch)
+        self.assertEqual(
+            [(item.written, item.error is None) for item in batch],
+            [(True, True), (False, False), (True, True)]
+        )
+        self.assertEqual(Comment.objects.count(), 2)
+
+    @override_settings(COMMENT_BUFFER_TIMEOUT=0.01)
+    def test_writer_timeout(self):
+        """Comment not taken by the writer in time is written by the
+        request, the writer skips it."""
+        with mock.patch.object(self.writer, 'start'):
+            self.write_comments(self.users[1], 1)
+        self.assertEqual(Comment.objects.count(), 1)
+        comment_buffer._write([self.writer.queue.get_nowait()])
+        self.assertEqual(Comment.objects.count(), 1, 'Comment is duplicated')
+
+    @override_settings(REPLICA_DATABASES=['replica'])
+    def test_sticky_primary(self):
+        """Client reads stick to the primary after buffered comment."""
+        client = Client()
+        client.force_login(self.users[1])
+        with mock.patch.object(comment_buffer, '_writer', self.writer):
+            response = client.post(
+                reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+                {'text': 'Comment'}
+            )
+        self.assertEqual(Comment.objects.count(), 1)
+        self.assertIn(
+            STICKY_COOKIE, response.cookies, 'Reads are not sticky'
+        )
@@ -0,0 +1,100 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(COMMENTS_PAGINATOR_LIMIT=5)
+class PostCommentsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(author=cls.author, text='Post')
+        commenters = [
+            User.objects.create_user(username=f'commenter_{i}')
+            for i in range(12)
+        ]
+        for commenter in commenters:
+            Comment.objects.create(
+                post=cls.post, author=commenter, text=f'By {commenter}'
+            )
+        cls.comments = list(
+            Comment.objects.filter(post=cls.post).order_by('-created', '-pk')
+        )
+        cls.url = reverse(
+            'posts:post_comments', kwargs={'post_id': cls.post.pk}
+        )
+
+    def test_post_detail_comments_page(self):
+        """Post detail page shows first page of comments."""
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        comments = response.context['comments']
+        self.assertEqual(
+            list(comments),
+            PostCommentsTests.comments[:settings.COMMENTS_PAGINATOR_LIMIT],
+            "Incorrect context['comments'] at post detail page"
+        )
+        self.assertContains(response, f'?comments={comments.next_cursor()}')
+
+    def test_load_more_json(self):
+        """JSON pages return all comments through next cursors."""
+        ids = []
+        cursor = ''
+        while cursor is not None:
+            data = self.client.get(
+                PostCommentsTests.url, {'comments': cursor}
+            ).json()
+            ids.extend(comment['id'] for comment in data['comments'])
+            cursor = data['next_cursor']
+        self.assertEqual(
+            ids,
+            [comment.pk for comment in PostCommentsTests.comments],
+            'Incorrect comments in JSON pages'
+        )
+
+    def test_load_more_query_count(self):
+        """Comments page costs constant number of queries."""
+        with self.assertNumQueries(2):
+            data = self.client.get(PostCommentsTests.url).json()
+        self.assertEqual(
+            data['comments'][0]['author'],
+            PostCommentsTests.comments[0].author.username,
+            'Incorrect comment author'
+        )
+
+    def test_load_more_missing_post(self):
+        """JSON page of missing post is not found."""
+        response = self.client.get(
+            reverse('posts:post_comments', kwargs={'post_id': 0})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_cursor_first_page(self):
+        """Comments cursor with null key returns the first comments page
+        on the post page and JSON page."""
+        cursor = urlsafe_b64encode(
+            json.dumps(['n', [None, None]]).encode()
+        ).decode().rstrip('=')
+        urls = (
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+            PostCommentsTests.url,
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                cache.clear()
+                response = self.client.get(url, {'comments': cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(
+                    response, PostCommentsTests.comments[0].text
+                )
@@ -0,0 +1,228 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-group',
+            description='Test description'
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, group=cls.group, text='Test post'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.reader_client = Client()
+        self.reader_client.force_login(ConditionalGetTests.reader)
+
+    def get_urls(self):
+        post_id = ConditionalGetTests.post.pk
+        return (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-group'}),
+            reverse('posts:profile', kwargs={'username': 'author'}),
+            reverse('posts:post_detail', kwargs={'post_id': post_id}),
+            reverse('posts:post_comments', kwargs={'post_id': post_id}),
+            reverse('posts:search') + '?q=post',
+        )
+
+    def test_not_modified(self):
+        """Unchanged pages return 304 without database queries."""
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                with self.assertNumQueries(0):
+                    etag_response = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=response['ETag']
+                    )
+                self.assertEqual(etag_response.status_code, 304)
+                # Page with CSRF token has no Last-Modified
+                if not response.has_header('Last-Modified'):
+                    continue
+                with self.assertNumQueries(0):
+                    date_response = self.client.get(
+                        url,
+                        HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+                    )
+                self.assertEqual(date_response.status_code, 304)
+
+    def test_etag_varies_on_csrf_cookie(self):
+        """Post page with comment form is returned again after CSRF
+        token rotation (e.g. login)."""
+        url = reverse(
+            'posts:post_detail',
+            kwargs={'post_id': ConditionalGetTests.post.pk}
+        )
+        response = self.reader_client.get(url)
+        self.assertFalse(
+            response.has_header('Last-Modified'),
+            'Page with CSRF token has Last-Modified'
+        )
+        self.reader_client.cookies[settings.CSRF_COOKIE_NAME] = 'rotated'
+        response = self.reader_client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(
+            response.status_code, 200, 'Form with old CSRF token is reused'
+        )
+
+    def test_modified_since(self):
+        """Page is returned if it was changed after If-Modified-Since."""
+        response = self.client.get(
+            reverse('posts:index'),
+            HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def assert_modified(self, urls, change):
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        change()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(
+                    response.status_code, 200, 'Page is not modified'
+                )
+
+    def test_post_and_group_changes_update_etag(self):
+        """Post and group changes update ETags of all pages."""
+        post = ConditionalGetTests.post
+        self.assert_modified(
+            self.get_urls(),
+            lambda: Post.objects.create(
+                author=post.author, group=post.group, text='New'
+            )
+        )
+        self.assert_modified(self.get_urls(), lambda: post.group.save())
+
+    def test_group_pages_versions(self):
+        """Post in one group does not change ETags of other groups pages,
+        moved post changes ETags of both groups pages."""
+        post = ConditionalGetTests.post
+        other = Group.objects.create(
+            title='Other group', slug='other-group', description='Other'
+        )
+        group_url = reverse('posts:group_list', kwargs={'slug': 'test-group'})
+        other_url = reverse('posts:group_list', kwargs={'slug': 'other-group'})
+        etag = self.client.get(group_url)['ETag']
+        Post.objects.create(author=post.author, group=other, text='Other')
+        self.assertEqual(
+            self.client.get(group_url, HTTP_IF_NONE_MATCH=etag).status_code,
+            304,
+            'Post of other group changes group page'
+        )
+        etags = {url: self.client.get(url)['ETag'] for url in (
+            group_url, other_url
+        )}
+        post = Post.objects.get(pk=post.pk)
+        post.group = other
+        post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(
+                    response.status_code, 200, 'Page is not modified'
+                )
+
+    def test_author_change_updates_group_page(self):
+        """Author name changes update ETags of the author pages and
+        group pages."""
+        author = ConditionalGetTests.author
+
+        def rename():
+            user = User.objects.get(pk=author.pk)
+            user.first_name = 'Renamed'
+            user.save()
+
+        self.assert_modified(self.get_urls()[:4], rename)
+
+    def assert_not_modified(self, urls, change):
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        change()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(
+                    response.status_code, 304, 'Page is modified'
+                )
+
+    def test_unrelated_changes_keep_etag(self):
+        """Posts of other authors, signups and logins do not change
+        post and profile pages ETags."""
+        author = ConditionalGetTests.author
+        urls = self.get_urls()[2:4]
+        other = User.objects.create_user(username='other')
+        self.assert_not_modified(
+            urls, lambda: Post.objects.create(author=other, text='Other')
+        )
+        self.assert_not_modified(
+            urls + (reverse('posts:index'),),
+            lambda: User.objects.create_user(username='new')
+        )
+        self.assert_not_modified(
+            urls,
+            lambda: Client().force_login(User.objects.get(pk=author.pk))
+        )
+
+    def test_group_rename_updates_old_slug_page(self):
+        """Group slug change updates ETag of the old slug page."""
+        old_url = reverse('posts:group_list', kwargs={'slug': 'test-group'})
+        etag = self.client.get(old_url)['ETag']
+        group = Group.objects.get(pk=ConditionalGetTests.group.pk)
+        group.slug = 'renamed-group'
+        group.save()
+        response = self.client.get(old_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+    def test_comment_updates_etag(self):
+        """New comment updates ETags of the post pages."""
+        post = ConditionalGetTests.post
+        self.assert_modified(
+            self.get_urls()[3:5],
+            lambda: Comment.objects.create(
+                post=post, author=ConditionalGetTests.reader, text='New'
+            )
+        )
+
+    def test_follow_updates_etag(self):
+        """Follow updates ETags of the author profile and follow feed."""
+        urls = (
+            reverse('posts:profile', kwargs={'username': 'author'}),
+            reverse('posts:follow_index'),
+        )
+        etags = {url: self.reader_client.get(url)['ETag'] for url in urls}
+        Follow.objects.create(
+            user=ConditionalGetTests.reader, author=ConditionalGetTests.author
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.reader_client.get(
+                    url, HTTP_IF_NONE_MATCH=etags[url]
+                )
+                self.assertEqual(
+                    response.status_code, 200, 'Page is not modified'
+                )
+
+    def test_etag_varies_on_user(self):
+        """Pages of different users have different ETags."""
+        url = reverse('posts:index')
+        self.assertNotEqual(
+            self.client.get(url)['ETag'],
+            self.reader_client.get(url)['ETag'],
+            'Anonymous and authenticated users share ETag'
+        )
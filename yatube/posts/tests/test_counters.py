@@ -0,0 +1,130 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import Comment, Follow, Post, PostStats, UserStats
+
+User = get_user_model()
+
+
+class CountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.follower = User.objects.create_user(username='follower')
+        cls.post = Post.objects.create(author=cls.author, text='Post')
+
+    def get_user_stats(self, user):
+        return UserStats.objects.get(user=user)
+
+    def test_posts_count(self):
+        """Author posts counter follows post creation and deletion."""
+        post = Post.objects.create(author=CountersTests.author, text='New')
+        self.assertEqual(
+            self.get_user_stats(CountersTests.author).posts_count, 2,
+            'Posts counter is not incremented'
+        )
+        post.delete()
+        self.assertEqual(
+            self.get_user_stats(CountersTests.author).posts_count, 1,
+            'Posts counter is not decremented'
+        )
+
+    def test_follow_counts(self):
+        """Follow counters follow subscription creation and deletion."""
+        follow = Follow.objects.create(
+            user=CountersTests.follower,
+            author=CountersTests.author
+        )
+        self.assertEqual(
+            self.get_user_stats(CountersTests.author).followers_count, 1,
+            'Followers counter is not incremented'
+        )
+        self.assertEqual(
+            self.get_user_stats(CountersTests.follower).following_count, 1,
+            'Following counter is not incremented'
+        )
+        follow.delete()
+        self.assertEqual(
+            self.get_user_stats(CountersTests.author).followers_count, 0,
+            'Followers counter is not decremented'
+        )
+        self.assertEqual(
+            self.get_user_stats(CountersTests.follower).following_count, 0,
+            'Following counter is not decremented'
+        )
+
+    def test_comments_count(self):
+        """Post comments counter follows comment creation and deletion."""
+        comment = Comment.objects.create(
+            post=CountersTests.post,
+            author=CountersTests.follower,
+            text='Comment'
+        )
+        self.assertEqual(
+            PostStats.objects.get(post=CountersTests.post).comments_count, 1,
+            'Comments counter is not incremented'
+        )
+        comment.delete()
+        self.assertEqual(
+            PostStats.objects.get(post=CountersTests.post).comments_count, 0,
+            'Comments counter is not decremented'
+        )
+
+    def test_reconcile_counters_command(self):
+        """Command fixes counters drift."""
+        Post.objects.bulk_create(
+            [Post(author=CountersTests.author, text=f'Bulk {i}')
+             for i in range(3)]
+        )
+        UserStats.objects.filter(user=CountersTests.follower).delete()
+        call_command('reconcile_counters', stdout=StringIO())
+        self.assertEqual(
+            self.get_user_stats(CountersTests.author).posts_count, 4,
+            'Posts counter drift is not fixed'
+        )
+        self.assertEqual(
+            self.get_user_stats(CountersTests.follower).posts_count, 0,
+            'Missing counters are not created'
+        )
+
+    def test_profile_page_uses_counters(self):
+        """Profile page does not scan author posts to count them."""
+        UserStats.objects.filter(user=CountersTests.author).update(
+            posts_count=42
+        )
+        response = self.client.get(
+            f'/profile/{CountersTests.author.username}/'
+        )
+        self.assertEqual(
+            response.context['posts_count'], 42,
+            'Profile page does not use posts counter'
+        )
+
+    def test_counters_created_with_objects(self):
+        """Counters rows are created with new users and posts."""
+        user = User.objects.create_user(username='new')
+        post = Post.objects.create(author=user, text='New')
+        self.assertEqual(self.get_user_stats(user).posts_count, 1)
+        self.assertTrue(
+            PostStats.objects.filter(post=post).exists(),
+            'Post counters are not created'
+        )
+
+    def test_missing_counters_not_created_on_read(self):
+        """Missing counters are counted by pages without writes."""
+        post = CountersTests.post
+        Comment.objects.create(post=post, author=post.author, text='New')
+        UserStats.objects.filter(user=CountersTests.author).delete()
+        PostStats.objects.filter(post=post).delete()
+        response = self.client.get(f'/posts/{post.pk}/')
+        self.assertEqual(response.context['posts_count'], 1)
+        self.assertEqual(response.context['comments_count'], 1)
+        self.assertFalse(
+            UserStats.objects.filter(user=CountersTests.author).exists()
+            or PostStats.objects.filter(post=post).exists(),
+            'Counters are created on read'
+        )
@@ -0,0 +1,179 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..feed import get_feed
+from ..models import FeedEntry, Follow, Post
+
+User = get_user_model()
+
+
+class FollowFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.follower = User.objects.create_user(username='follower')
+        cls.old_post = Post.objects.create(
+            author=cls.author,
+            text='Post before follow'
+        )
+
+    def setUp(self):
+        self.follower_client = Client()
+        self.follower_client.force_login(FollowFeedTests.follower)
+
+    def follow(self):
+        return Follow.objects.create(
+            user=FollowFeedTests.follower,
+            author=FollowFeedTests.author
+        )
+
+    def test_follow_delivers_author_posts(self):
+        """New follower feed gets all author posts."""
+        self.follow()
+        self.assertTrue(
+            FeedEntry.objects.filter(
+                user=FollowFeedTests.follower,
+                post=FollowFeedTests.old_post
+            ).exists(),
+            'Author post is not delivered to the new follower feed'
+        )
+
+    def test_new_post_is_fanned_out(self):
+        """New post is delivered to follower feeds."""
+        self.follow()
+        new_post = Post.objects.create(
+            author=FollowFeedTests.author,
+            text='Post after follow'
+        )
+        entry = FeedEntry.objects.get(
+            user=FollowFeedTests.follower,
+            post=new_post
+        )
+        self.assertEqual(
+            entry.pub_date,
+            new_post.pub_date,
+            'Feed entry pub_date differs from post pub_date'
+        )
+
+    def test_unfollow_removes_author_posts(self):
+        """Former follower feed has no author posts."""
+        self.follow().delete()
+        self.assertFalse(
+            FeedEntry.objects.filter(user=FollowFeedTests.follower).exists(),
+            'Author posts are left in the former follower feed'
+        )
+
+    def test_follow_index_reads_feed(self):
+        """Follow index page shows feed posts newest first."""
+        self.follow()
+        new_post = Post.objects.create(
+            author=FollowFeedTests.author,
+            text='Post after follow'
+        )
+        response = self.follower_client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [new_post, FollowFeedTests.old_post],
+            'Incorrect follow index page posts'
+        )
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_popular_author_posts_merged_on_read(self):
+        """Popular author posts are not fanned out but appear in feed."""
+        self.follow()
+        new_post = Post.objects.create(
+            author=FollowFeedTests.author,
+            text='Popular author post'
+        )
+        self.assertFalse(
+            FeedEntry.objects.filter(post=new_post).exists(),
+            'Popular author post is fanned out'
+        )
+        self.assertEqual(
+            list(get_feed(FollowFeedTests.follower)),
+            [new_post, FollowFeedTests.old_post],
+            'Popular author posts are not merged into feed'
+        )
+
+    @override_settings(FEED_FANOUT_LIMIT=2, FEED_FANOUT_RESUME_LIMIT=1)
+    def test_author_crosses_fanout_limit(self):
+        """Author posts stay in the feed when the author becomes popular
+        and when the author is not popular anymore, author between the
+        limits stays popular."""
+        author = FollowFeedTests.author
+        self.follow()
+        others = [
+            User.objects.create_user(username=f'other_{i}') for i in range(2)
+        ]
+        for other in others:
+            Follow.objects.create(user=other, author=author)
+        self.assertFalse(
+            FeedEntry.objects.filter(post__author=author).exists(),
+            'Posts of popular author are left in feeds'
+        )
+        popular_post = Post.objects.create(author=author, text='Popular')
+        self.assertEqual(
+            list(get_feed(FollowFeedTests.follower)),
+            [popular_post, FollowFeedTests.old_post],
+            'Posts of author who became popular are lost'
+        )
+        Follow.objects.get(user=others[0], author=author).delete()
+        self.assertFalse(
+            FeedEntry.objects.filter(post__author=author).exists(),
+            'Author above resume limit is fanned out again'
+        )
+        Follow.objects.create(user=others[0], author=author)
+        Follow.objects.get(user=others[0], author=author).delete()
+        Follow.objects.get(user=others[1], author=author).delete()
+        self.assertEqual(
+            set(FeedEntry.objects.filter(
+                user=FollowFeedTests.follower
+            ).values_list('post', flat=True)),
+            {popular_post.pk, FollowFeedTests.old_post.pk},
+            'Posts of author who is not popular are not delivered'
+        )
+        self.assertEqual(
+            list(get_feed(FollowFeedTests.follower)),
+            [popular_post, FollowFeedTests.old_post],
+            'Posts of author who is not popular anymore are lost'
+        )
+
+    @override_settings(FEED_BACKFILL_LIMIT=2)
+    def test_follow_delivers_latest_posts(self):
+        """New follower feed gets only the latest author posts."""
+        posts = [
+            Post.objects.create(author=FollowFeedTests.author, text=f'{i}')
+            for i in range(3)
+        ]
+        self.follow()
+        self.assertEqual(
+            set(FeedEntry.objects.filter(
+                user=FollowFeedTests.follower
+            ).values_list('post', flat=True)),
+            {posts[1].pk, posts[2].pk},
+            'Incorrect posts delivered to the new follower feed'
+        )
+
+    def test_rebuild_feed_command(self):
+        """Command restores feed of posts created in bulk and updates
+        follow page."""
+        self.follow()
+        url = reverse('posts:follow_index')
+        etag = self.follower_client.get(url)['ETag']
+        Post.objects.bulk_create(
+            [Post(author=FollowFeedTests.author, text=f'Bulk post {i}')
+             for i in range(3)]
+        )
+        call_command('rebuild_feed', stdout=StringIO())
+        self.assertEqual(
+            FeedEntry.objects.filter(user=FollowFeedTests.follower).count(),
+            Post.objects.filter(author=FollowFeedTests.author).count(),
+            'Feed is not rebuilt'
+        )
+        response = self.follower_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Bulk post 0')
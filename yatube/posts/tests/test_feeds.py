@@ -0,0 +1,134 @@
+import json
+import re
+from base64 import urlsafe_b64encode
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(FEED_LIMIT=2)
+class FeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='author', first_name='Лев', last_name='Толстой'
+        )
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-group',
+            description='Test description'
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.author, group=cls.group, text=f'Test post {i}'
+            ) for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def get_urls(self):
+        urls = {}
+        for feed_format in ('atom', 'rss'):
+            urls.update({
+                reverse('posts:index_feed', args=[feed_format]):
+                    feed_format,
+                reverse(
+                    'posts:group_feed', args=['test-group', feed_format]
+                ): feed_format,
+                reverse(
+                    'posts:profile_feed', args=['author', feed_format]
+                ): feed_format,
+            })
+        return urls
+
+    def test_feeds_have_latest_posts(self):
+        """Feeds have the latest window of posts and next page link."""
+        content_types = {
+            'atom': 'application/atom+xml; charset=utf-8',
+            'rss': 'application/rss+xml; charset=utf-8',
+        }
+        for url, feed_format in self.get_urls().items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(
+                    response['Content-Type'], content_types[feed_format]
+                )
+                content = response.content.decode()
+                self.assertIn('Test post 2', content)
+                self.assertIn('Test post 1', content)
+                self.assertNotIn('Test post 0', content)
+                self.assertIn('rel="next"', content, 'Next link is missing')
+
+    def test_next_page(self):
+        """Next link leads to older posts."""
+        url = reverse('posts:index_feed', args=['atom'])
+        response = self.client.get(url)
+        next_url = re.search(
+            r'<link href="([^"]+)" rel="next">', response.content.decode()
+        ).group(1)
+        content = self.client.get(next_url).content.decode()
+        self.assertIn('Test post 0', content, 'Older post is missing')
+        self.assertNotIn('Test post 1', content)
+        self.assertNotIn('rel="next"', content)
+
+    def test_invalid_cursor(self):
+        """Cursor with null key returns the latest posts."""
+        cursor = urlsafe_b64encode(
+            json.dumps(['n', [None, None]]).encode()
+        ).decode().rstrip('=')
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('Test post 2', response.content.decode())
+
+    def test_not_found(self):
+        """Unknown feed format and group return 404."""
+        urls = (
+            reverse('posts:index_feed', args=['xml']),
+            reverse('posts:group_feed', args=['missing', 'atom']),
+            reverse('posts:profile_feed', args=['missing', 'rss']),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_feed_polling(self):
+        """Unchanged feed is answered from cache or with 304."""
+        url = reverse('posts:group_feed', args=['test-group', 'atom'])
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            not_modified = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(not_modified.status_code, 304)
+        Post.objects.create(
+            author=FeedsTests.author, group=FeedsTests.group, text='New post'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('New post', response.content.decode())
+
+    def test_pages_link_feeds(self):
+        """Pages have feed autodiscovery links."""
+        pages = {
+            reverse('posts:index'):
+                reverse('posts:index_feed', args=['atom']),
+            reverse('posts:group_list', args=['test-group']):
+                reverse('posts:group_feed', args=['test-group', 'rss']),
+            reverse('posts:profile', args=['author']):
+                reverse('posts:profile_feed', args=['author', 'atom']),
+        }
+        for page, feed_url in pages.items():
+            with self.subTest(page=page):
+                self.assertContains(self.client.get(page), feed_url)
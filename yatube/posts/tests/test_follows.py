@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .. import follows
+from ..counters import get_user_stats
+from ..follows import bulk_follow, follow, unfollow
+from ..models import FeedEntry, Follow, Post
+
+User = get_user_model()
+
+
+class FollowsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.authors = [
+            User.objects.create_user(username=f'author_{i}')
+            for i in range(3)
+        ]
+        for author in cls.authors:
+            Post.objects.create(author=author, text=f'Post of {author}')
+
+    def assertFollowing(self, count):
+        self.assertEqual(
+            Follow.objects.filter(user=FollowsTests.user).count(), count,
+            'Incorrect follows number'
+        )
+        self.assertEqual(
+            get_user_stats(
+                User.objects.get(pk=FollowsTests.user.pk)
+            ).following_count,
+            count,
+            'Incorrect following counter'
+        )
+        self.assertEqual(
+            FeedEntry.objects.filter(user=FollowsTests.user).count(), count,
+            'Incorrect feed'
+        )
+
+    def test_follow_idempotent(self):
+        """Repeated follow does not change follows and counters."""
+        author = FollowsTests.authors[0]
+        self.assertEqual(
+            follow(FollowsTests.user, author), (True, True)
+        )
+        self.assertEqual(
+            follow(FollowsTests.user, author), (True, False)
+        )
+        self.assertFollowing(1)
+
+    def test_unfollow_idempotent(self):
+        """Repeated unfollow does not change follows and counters."""
+        author = FollowsTests.authors[0]
+        follow(FollowsTests.user, author)
+        self.assertEqual(
+            unfollow(FollowsTests.user, author), (False, True)
+        )
+        self.assertEqual(
+            unfollow(FollowsTests.user, author), (False, False)
+        )
+        self.assertFollowing(0)
+        self.assertEqual(
+            get_user_stats(User.objects.get(pk=author.pk)).followers_count,
+            0,
+            'Incorrect followers counter'
+        )
+
+    def test_follow_himself(self):
+        """User can't follow himself."""
+        self.assertEqual(
+            follow(FollowsTests.user, FollowsTests.user), (False, False)
+        )
+        self.assertFollowing(0)
+
+    def test_bulk_follow(self):
+        """Bulk follow skips followed authors and the user."""
+        follow(FollowsTests.user, FollowsTests.authors[0])
+        new_authors = bulk_follow(
+            FollowsTests.user, FollowsTests.authors + [FollowsTests.user]
+        )
+        self.assertEqual(new_authors, FollowsTests.authors[1:])
+        self.assertFollowing(3)
+
+    def test_bulk_follow_queries(self):
+        """Bulk follow queries do not depend on authors number."""
+        authors = [
+            User.objects.create_user(username=f'bulk_{i}') for i in range(10)
+        ]
+        for user in [FollowsTests.user, *authors]:
+            get_user_stats(user)
+        with CaptureQueriesContext(connection) as queries:
+            bulk_follow(FollowsTests.user, authors)
+        self.assertLessEqual(len(queries), 10, 'Queries per author')
+        self.assertEqual(
+            get_user_stats(
+                User.objects.get(pk=FollowsTests.user.pk)
+            ).following_count,
+            10,
+            'Incorrect following counter'
+        )
+
+    def test_bulk_follow_race(self):
+        """Follow inserted by a concurrent request is not counted twice."""
+        author = FollowsTests.authors[0]
+        follow(FollowsTests.user, author)
+        # Concurrent follow is committed after the followed authors read
+        with mock.patch.object(
+            follows, 'get_followed_ids',
+            side_effect=[set(), {author.pk for author in FollowsTests.authors}]
+        ):
+            bulk_follow(FollowsTests.user, FollowsTests.authors)
+        self.assertFollowing(3)
+        self.assertEqual(
+            get_user_stats(User.objects.get(pk=author.pk)).followers_count,
+            1,
+            'Incorrect followers counter'
+        )
@@ -264,3 +264,19 @@ class CommentFormTests(TestCase):
             ).exists(),
             'New comment does not exist in database'
         )
+
+    def test_empty_comment_is_not_added(self):
+        """Empty comment is not saved."""
+        comments_count = Comment.objects.count()
+        self.author_client.post(
+            reverse(
+                'posts:add_comment',
+                kwargs={'post_id': CommentFormTests.post.id}
+            ),
+            data={'text': ''}
+        )
+        self.assertEqual(
+            Comment.objects.count(),
+            comments_count,
+            'Empty comment is saved'
+        )
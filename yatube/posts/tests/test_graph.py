@@ -0,0 +1,118 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .. import graph
+from ..follows import follow, unfollow
+from ..models import Follow
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = User.objects.bulk_create([
+            User(username=f'user{i}') for i in range(6)
+        ])
+        cls.users = list(User.objects.order_by('pk'))
+        user, *others = cls.users
+        # user follows others[0..1], they follow others[2..3]
+        edges = [
+            (user, others[0]), (user, others[1]),
+            (others[0], others[2]), (others[0], others[3]),
+            (others[1], others[2]), (others[1], user),
+        ]
+        Follow.objects.bulk_create([
+            Follow(user=follower, author=author)
+            for follower, author in edges
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.user, *self.others = FollowGraphTests.users
+
+    def test_adjacency(self):
+        """Followees and followers are sorted arrays of ids."""
+        self.assertEqual(
+            list(graph.get_followees(self.user.pk)),
+            [self.others[0].pk, self.others[1].pk]
+        )
+        self.assertEqual(
+            list(graph.get_followers(self.others[2].pk)),
+            [self.others[0].pk, self.others[1].pk]
+        )
+        self.assertEqual(list(graph.get_followees(self.others[4].pk)), [])
+
+    def test_cached(self):
+        """Adjacency of many users is loaded once and then cached."""
+        user_ids = [user.pk for user in FollowGraphTests.users]
+        with self.assertNumQueries(1):
+            loaded = graph.get_followees_many(user_ids)
+        with self.assertNumQueries(0):
+            cached = graph.get_followees_many(user_ids)
+        self.assertEqual(cached, loaded, 'Cached arrays differ')
+
+    def test_is_following(self):
+        """Follow status and batched status come from the graph."""
+        graph.get_followees(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                graph.is_following(self.user.pk, self.others[0].pk)
+            )
+            self.assertFalse(
+                graph.is_following(self.user.pk, self.others[2].pk)
+            )
+            followed = graph.get_followed(
+                self.user.pk, [other.pk for other in self.others]
+            )
+        self.assertEqual(followed, {self.others[0].pk, self.others[1].pk})
+
+    def test_invalidation(self):
+        """Follow and unfollow invalidate followees and followers."""
+        user, author = self.user, self.others[4]
+        graph.get_followees(user.pk)
+        graph.get_followers(author.pk)
+        follow(user, author)
+        self.assertTrue(graph.is_following(user.pk, author.pk))
+        self.assertIn(user.pk, graph.get_followers(author.pk))
+        unfollow(user, author)
+        self.assertFalse(graph.is_following(user.pk, author.pk))
+        self.assertNotIn(user.pk, graph.get_followers(author.pk))
+
+    def test_bulk_rebuild_invalidation(self):
+        """Feed rebuild after bulk inserts invalidates the whole graph."""
+        graph.get_followees(self.others[4].pk)
+        Follow.objects.bulk_create([
+            Follow(user=self.others[4], author=self.user)
+        ])
+        call_command('rebuild_feed', stdout=StringIO())
+        self.assertTrue(graph.is_following(self.others[4].pk, self.user.pk))
+
+    def test_suggestions(self):
+        """Authors followed by most followees are suggested, followed
+        authors and the user are not."""
+        self.assertEqual(
+            graph.suggest_authors(self.user.pk),
+            [self.others[2].pk, self.others[3].pk]
+        )
+        follow(self.user, self.others[2])
+        self.assertEqual(
+            graph.suggest_authors(self.user.pk), [self.others[3].pk],
+            'Suggestions are not invalidated by follow'
+        )
+
+    @override_settings(SUGGESTION_SOURCES=1)
+    def test_suggestion_sources(self):
+        """Suggestions are counted from limited number of followees."""
+        counts = graph.count_suggestions(
+            self.user.pk, graph.get_followees(self.user.pk)
+        )
+        self.assertEqual(
+            counts, {self.others[2].pk: 1, self.others[3].pk: 1},
+            'Not only the first followee is counted'
+        )
@@ -1,8 +1,9 @@
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from django.test import TestCase
 from django.conf import settings
 
-from ..models import Comment, Group, Post
+from ..models import Comment, Follow, Group, Post
 
 User = get_user_model()
 
@@ -183,3 +184,19 @@ class CommentModelTest(TestCase):
                     expected_value,
                     error_msg.format(field)
                 )
+
+
+class FollowModelTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.author = User.objects.create_user(username='author')
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def test_follow_is_unique(self):
+        """User can't follow the same author twice."""
+        with self.assertRaises(IntegrityError):
+            Follow.objects.create(
+                user=FollowModelTest.user, author=FollowModelTest.author
+            )
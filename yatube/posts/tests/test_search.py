@@ -0,0 +1,116 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post, SearchEntry
+from ..search import search
+
+User = get_user_model()
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin'
+        )
+        cls.cat_post = Post.objects.create(
+            author=cls.author, text='Кошки любят рыбу'
+        )
+        cls.cats_post = Post.objects.create(
+            author=cls.author, text='Кошка, кошка и ещё одна кошка'
+        )
+        cls.dog_post = Post.objects.create(
+            author=cls.author, text='Собака любит кость'
+        )
+        cls.url = reverse('posts:search')
+
+    def setUp(self):
+        cache.clear()
+
+    def search_ids(self, query):
+        return [result['post'] for result in search(query)]
+
+    def test_search_ranking(self):
+        """Posts with more query terms occurrences are ranked higher."""
+        self.assertEqual(
+            self.search_ids('кошкам'),
+            [PostSearchTests.cats_post.pk, PostSearchTests.cat_post.pk],
+            'Incorrect search results or ranking'
+        )
+
+    def test_search_all_terms(self):
+        """Posts must contain all query terms."""
+        cases = {
+            'кошка любит': [PostSearchTests.cat_post.pk],
+            'любить': [PostSearchTests.dog_post.pk,
+                       PostSearchTests.cat_post.pk],
+            'кошка слон': [],
+            '!!!': [],
+        }
+        for query, expected in cases.items():
+            with self.subTest(query=query):
+                self.assertCountEqual(self.search_ids(query), expected)
+
+    def test_index_updated(self):
+        """Index follows post edit and delete."""
+        post = Post.objects.create(
+            author=PostSearchTests.author, text='Слон'
+        )
+        self.assertEqual(self.search_ids('слоны'), [post.pk])
+        post.text = 'Жираф'
+        post.save()
+        self.assertEqual(self.search_ids('слоны'), [], 'Old terms kept')
+        self.assertEqual(self.search_ids('жирафы'), [post.pk])
+        post.delete()
+        self.assertEqual(self.search_ids('жирафы'), [], 'Entries kept')
+
+    def test_search_page(self):
+        """Search page shows found posts and paginates with query."""
+        response = self.client.get(PostSearchTests.url, {'q': 'кошки'})
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [PostSearchTests.cats_post, PostSearchTests.cat_post],
+            "Incorrect context['page_obj'] at search page"
+        )
+        self.assertEqual(
+            response.context['page_query'], 'q=%D0%BA%D0%BE%D1%88%D0%BA%D0%B8&'
+        )
+        response = self.client.get(PostSearchTests.url)
+        self.assertIsNone(
+            response.context['page_obj'], 'Search without query'
+        )
+
+    def test_admin_search(self):
+        """Admin posts search uses index."""
+        client = Client()
+        client.force_login(PostSearchTests.admin)
+        response = client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'кость'}
+        )
+        self.assertEqual(
+            list(response.context['cl'].queryset),
+            [PostSearchTests.dog_post],
+            'Incorrect admin search results'
+        )
+
+    def test_rebuild_search_index(self):
+        """Command indexes posts created in bulk."""
+        Post.objects.bulk_create(
+            [Post(author=PostSearchTests.author, text='Черепаха')]
+        )
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search_ids('черепахи')), 1)
+        self.assertEqual(
+            SearchEntry.objects.filter(
+                post=PostSearchTests.cat_post
+            ).count(),
+            3,
+            'Incorrect number of post terms'
+        )
@@ -0,0 +1,96 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post
+from ..thumbnails import generate_thumbnails, get_ready_thumbnail
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ThumbnailsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        small_gif = (
+            b'\x47\x49\x46\x38\x39\x61\x02\x00'
+            b'\x01\x00\x80\x00\x00\x00\x00\x00'
+            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+            b'\x0A\x00\x3B'
+        )
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Post with image',
+            image=SimpleUploadedFile(
+                'small.gif', small_gif, content_type='image/gif'
+            )
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_original_image_until_thumbnail_ready(self):
+        """Page shows original image while thumbnail is not generated."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertIsNone(
+            get_ready_thumbnail(ThumbnailsTests.post.image, 'card'),
+            'Thumbnail is generated inside request'
+        )
+        self.assertContains(response, ThumbnailsTests.post.image.url)
+
+    def test_generate_thumbnails(self):
+        """Generated thumbnails replace original image at cached pages of
+        the post, other post lists are not invalidated."""
+        urls = (
+            reverse('posts:profile', kwargs={'username': 'author'}),
+            reverse(
+                'posts:post_detail',
+                kwargs={'post_id': ThumbnailsTests.post.pk}
+            ),
+        )
+        for url in urls:
+            self.client.get(url)
+        index_etag = self.client.get(reverse('posts:index'))['ETag']
+        self.assertTrue(
+            generate_thumbnails(ThumbnailsTests.post.pk),
+            'Thumbnails are not generated'
+        )
+        self.assertFalse(
+            generate_thumbnails(ThumbnailsTests.post.pk),
+            'Ready thumbnails are generated again'
+        )
+        for size in settings.POST_THUMBNAILS:
+            with self.subTest(size=size):
+                self.assertIsNotNone(
+                    get_ready_thumbnail(ThumbnailsTests.post.image, size)
+                )
+        thumbnail = get_ready_thumbnail(ThumbnailsTests.post.image, 'card')
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, thumbnail.url)
+                self.assertNotContains(
+                    response, ThumbnailsTests.post.image.url
+                )
+        response = self.client.get(
+            reverse('posts:index'), HTTP_IF_NONE_MATCH=index_etag
+        )
+        self.assertEqual(
+            response.status_code, 304, 'Thumbnails flush all post lists'
+        )
@@ -0,0 +1,171 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+
+from ..management.transfer import KINDS
+from ..models import Comment, Follow, Group, Post, SearchEntry
+
+User = get_user_model()
+
+
+class TransferCommandsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='author', first_name='Лев', password='pass'
+        )
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа, "с кавычками"',
+            slug='test-group',
+            description='Строка 1\nСтрока 2'
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.author, group=group, text=f'Пост {i}'
+            ) for i, group in enumerate((cls.group, None, cls.group))
+        ]
+        Comment.objects.create(
+            post=cls.posts[0], author=cls.reader, text='Комментарий'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def dump(self):
+        return {
+            kind: list(model.objects.order_by('pk').values_list(*fields))
+            for kind, (model, fields) in KINDS.items()
+        }
+
+    def delete_all(self):
+        User.objects.all().delete()
+        Group.objects.all().delete()
+
+    def test_export_import(self):
+        """Imported data equals exported data in all formats."""
+        data = self.dump()
+        for name in ('data.jsonl', 'data.csv'):
+            with self.subTest(name=name):
+                path = os.path.join(self.directory.name, name)
+                call_command(
+                    'export_posts', path, batch_size=2, stderr=StringIO()
+                )
+                self.delete_all()
+                call_command(
+                    'import_posts', path, batch_size=2,
+                    stdout=StringIO(), stderr=StringIO()
+                )
+                self.assertEqual(self.dump(), data, 'Data is changed')
+
+    def test_import_rebuilds_derived_data(self):
+        """Counters and search index are rebuilt after import."""
+        path = os.path.join(self.directory.name, 'data.jsonl')
+        call_command('export_posts', path, stderr=StringIO())
+        self.delete_all()
+        call_command(
+            'import_posts', path, stdout=StringIO(), stderr=StringIO()
+        )
+        author = User.objects.get(username='author')
+        self.assertEqual(author.stats.posts_count, 3)
+        self.assertEqual(author.stats.followers_count, 1)
+        self.assertTrue(
+            SearchEntry.objects.exists(), 'Search index is not rebuilt'
+        )
+        self.assertTrue(
+            self.client.login(username='author', password='pass'),
+            'Password is not imported'
+        )
+
+    def test_import_invalidates_pages(self):
+        """Pages cached before import show imported posts."""
+        path = os.path.join(self.directory.name, 'data.jsonl')
+        call_command('export_posts', path, stderr=StringIO())
+        self.delete_all()
+        cache.clear()
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-group'}),
+        )
+        # Missing group page has no ETag
+        headers = {
+            url: {'HTTP_IF_NONE_MATCH': response['ETag']}
+            if response.has_header('ETag') else {}
+            for url, response in (
+                (url, self.client.get(url)) for url in urls
+            )
+        }
+        call_command(
+            'import_posts', path, stdout=StringIO(), stderr=StringIO()
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, **headers[url])
+                self.assertContains(response, 'Пост 0')
+
+    def test_import_into_not_empty_database(self):
+        """Import into database with data is refused."""
+        path = os.path.join(self.directory.name, 'data.jsonl')
+        call_command('export_posts', path, stderr=StringIO())
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_posts', path, stdout=StringIO(), stderr=StringIO()
+            )
+
+    def test_resume_skips_imported(self):
+        """Resumed import skips and reports already imported rows."""
+        path = os.path.join(self.directory.name, 'data.csv')
+        call_command('export_posts', path, stderr=StringIO())
+        data = self.dump()
+        Follow.objects.all().delete()
+        stdout = StringIO()
+        call_command(
+            'import_posts', path, resume=True,
+            stdout=stdout, stderr=StringIO()
+        )
+        self.assertEqual(self.dump(), data, 'Data is changed')
+        self.assertIn(
+            'Imported user 0, group 0, post 0, comment 0, follow 1\n'
+            'Skipped already imported user 2, group 1, post 3, comment 1\n',
+            stdout.getvalue()
+        )
+
+    def test_resume_with_different_rows(self):
+        """Resumed import stops at existing row of another record."""
+        path = os.path.join(self.directory.name, 'data.jsonl')
+        call_command('export_posts', path, stderr=StringIO())
+        Post.objects.filter(pk=self.posts[1].pk).update(text='Другой')
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_posts', path, resume=True,
+                stdout=StringIO(), stderr=StringIO()
+            )
+
+    def test_progress(self):
+        """Progress is reported every number of rows."""
+        path = os.path.join(self.directory.name, 'data.jsonl')
+        stderr = StringIO()
+        call_command('export_posts', path, progress=2, stderr=stderr)
+        self.assertIn('post: 2\n', stderr.getvalue())
+
+    def test_invalid_record(self):
+        """Unknown record type stops import."""
+        path = os.path.join(self.directory.name, 'data.jsonl')
+        with open(path, 'w') as file:
+            file.write('{"type": "unknown", "id": 1}\n')
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_posts', path, stdout=StringIO(), stderr=StringIO()
+            )
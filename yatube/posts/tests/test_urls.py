@@ -54,7 +54,7 @@ class PostsURLTests(TestCase):
 
     def tearDown(self):
         super().tearDown()
-        # Clear cache for views with @cache_page() decorator
+        # Clear cache for views with @versioned_cache_page() decorator
         cache.clear()
 
     def test_urls_exist_at_desired_location_anonymous(self):
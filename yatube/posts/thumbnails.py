@@ -0,0 +1,133 @@
+"""Post image thumbnails pre-generation.
+
+Thumbnails of all sizes in ``settings.POST_THUMBNAILS`` are generated by
+a local thread pool after the post is saved (in the committing thread
+with ``settings.THUMBNAIL_ASYNC`` off). Templates take only ready
+thumbnails from sorl key value store and show the original image until
+then, so pages never decode and resize images inline.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile
+
+from core.cache import bump_version
+
+from . import versions
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_pending = set()
+_lock = threading.Lock()
+
+
+class ReadyThumbnailBackend(ThumbnailBackend):
+    """sorl backend able to look up thumbnail without generating it."""
+
+    def get_ready_thumbnail(self, file_, geometry_string, **options):
+        """Return generated thumbnail or None."""
+        source = ImageFile(file_)
+        # Options are completed the same way get_thumbnail() does,
+        # otherwise thumbnail name would differ.
+        if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(thumbnail_settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return default.kvstore.get(ImageFile(name, default.storage))
+
+
+backend = ReadyThumbnailBackend()
+
+
+def get_ready_thumbnail(image, size):
+    """Return ready thumbnail of the image for POST_THUMBNAILS size name
+    or None."""
+    geometry, options = settings.POST_THUMBNAILS[size]
+    return backend.get_ready_thumbnail(image, geometry, **options)
+
+
+def thumbnails_ready(image):
+    return all(
+        get_ready_thumbnail(image, size) for size in settings.POST_THUMBNAILS
+    )
+
+
+def generate_thumbnails(post_id):
+    """Generate missing thumbnails of the post image.
+
+    Post cards, the post page and group and profile pages of the post
+    are invalidated when thumbnails are generated. Other post lists
+    (index, search) are not flushed for one image: they show the
+    original image until they change.
+    """
+    from .models import Post
+
+    post = Post.objects.select_related('author', 'group').filter(
+        pk=post_id
+    ).first()
+    if post is None or not post.image or thumbnails_ready(post.image):
+        return False
+    for geometry, options in settings.POST_THUMBNAILS.values():
+        get_thumbnail(post.image, geometry, **options)
+    bump_version(versions.post_version(post_id))
+    bump_version(versions.profile_version(post.author.username))
+    if post.group:
+        bump_version(versions.group_posts_version(post.group.slug))
+    return True
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.THUMBNAIL_WORKERS,
+                thread_name_prefix='thumbnails'
+            )
+        return _executor
+
+
+def _generate(post_id):
+    try:
+        generate_thumbnails(post_id)
+    except Exception:
+        logger.exception('Thumbnails of post %s are not generated', post_id)
+
+
+def _run(post_id):
+    try:
+        _generate(post_id)
+    finally:
+        with _lock:
+            _pending.discard(post_id)
+        # Worker threads do not take part in request cycle
+        # which closes connections.
+        connections.close_all()
+
+
+def enqueue_thumbnails(post_id):
+    """Generate thumbnails of the post in background after commit."""
+    def submit():
+        if not settings.THUMBNAIL_ASYNC:
+            _generate(post_id)
+            return
+        with _lock:
+            if post_id in _pending:
+                return
+            _pending.add(post_id)
+        _get_executor().submit(_run, post_id)
+
+    transaction.on_commit(submit)
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'posts'
 
@@ -8,7 +8,24 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('feeds/<str:feed_format>/', feeds.index_feed, name='index_feed'),
+    path(
+        'group/<slug:slug>/feeds/<str:feed_format>/',
+        feeds.group_feed,
+        name='group_feed'
+    ),
+    path(
+        'profile/<str:username>/feeds/<str:feed_format>/',
+        feeds.profile_feed,
+        name='profile_feed'
+    ),
+    path('search/', views.post_search, name='search'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path(
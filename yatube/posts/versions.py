@@ -0,0 +1,126 @@
+"""Cache version names of posts application data.
+
+Versions are bumped by model signals, see ``core.cache``.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Post
+
+# Version of all post lists (index, profile and search pages)
+POSTS_VERSION = 'posts'
+# Version of the whole follow graph, bumped by bulk rebuilds
+FOLLOWS_VERSION = 'follows'
+# Version of all authors shown in post lists, bumped by user changes
+AUTHORS_VERSION = 'authors'
+# Version of all follow feeds, bumped by feed rebuilds
+FEEDS_VERSION = 'feeds'
+# Version of all groups shown in post lists, bumped by group changes
+GROUPS_VERSION = 'groups'
+# (author id, group id) of the post, read by post page versions
+POST_REFS_KEY = 'post_refs:{}'
+
+
+def post_version(post_id):
+    return f'post:{post_id}'
+
+
+def group_version(group_id):
+    return f'group:{group_id}'
+
+
+def group_posts_version(slug):
+    return f'group_posts:{slug}'
+
+
+def user_version(user_id):
+    return f'user:{user_id}'
+
+
+def user_posts_version(user_id):
+    return f'user_posts:{user_id}'
+
+
+def profile_version(username):
+    return f'profile:{username}'
+
+
+def feed_version(user_id):
+    return f'feed:{user_id}'
+
+
+def comments_version(post_id):
+    return f'comments:{post_id}'
+
+
+def followees_version(user_id):
+    return f'followees:{user_id}'
+
+
+def followers_version(user_id):
+    return f'followers:{user_id}'
+
+
+def index_page_versions(request):
+    return (POSTS_VERSION,)
+
+
+def group_page_versions(request, slug):
+    # Changes of posts and the group itself bump the group posts version
+    return (AUTHORS_VERSION, group_posts_version(slug))
+
+
+def follow_page_versions(request):
+    return (POSTS_VERSION, FEEDS_VERSION, feed_version(request.user.pk))
+
+
+def search_page_versions(request):
+    return (POSTS_VERSION,)
+
+
+def set_post_refs(post):
+    cache.set(
+        POST_REFS_KEY.format(post.pk), (post.author_id, post.group_id),
+        settings.VERSION_CACHE_TIMEOUT
+    )
+
+
+def get_post_refs(post_id):
+    """Return (author id, group id) of the post, None for missing post.
+
+    Refs are cached, so unchanged post page is checked without queries.
+    """
+    key = POST_REFS_KEY.format(post_id)
+    refs = cache.get(key)
+    if refs is None:
+        refs = Post.objects.filter(pk=post_id).values_list(
+            'author_id', 'group_id'
+        ).first()
+        if refs is not None:
+            cache.set(key, refs, settings.VERSION_CACHE_TIMEOUT)
+    return refs
+
+
+def post_page_versions(request, post_id):
+    versions = (post_version(post_id), comments_version(post_id))
+    refs = get_post_refs(post_id)
+    if refs is None:
+        return versions
+    author_id, group_id = refs
+    # Author name and posts count, group title
+    return versions + (
+        user_version(author_id), user_posts_version(author_id),
+        group_version(group_id)
+    )
+
+
+def feed_page_versions(request, **kwargs):
+    if 'slug' in kwargs:
+        return group_page_versions(request, kwargs['slug'])
+    # Group and author changes bump POSTS_VERSION too
+    return (POSTS_VERSION,)
+
+
+def profile_page_versions(request, username):
+    # Author and author posts changes bump the profile version
+    return (GROUPS_VERSION, profile_version(username))
@@ -1,16 +1,31 @@
-from core.paginator import get_page_object
+from core.cache import versioned_cache_page, versioned_condition
+from core.db_router import mark_written, primary_db
+from core.concurrency import run_concurrently
+from core.paginator import (get_cursor_page_object, get_loaded_page_object,
+                            get_page_object)
+from core.transaction import atomic
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.views.decorators.cache import cache_page
-
-from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post
-
-
-@cache_page(settings.CACHE_TIMEOUT, key_prefix='index_page')
+from django.utils.http import urlencode
+
+from . import comment_buffer, graph
+from .counters import get_post_stats, get_user_stats
+from .feed import get_feed
+from .follows import follow, unfollow
+from .forms import CommentForm, PostForm, SearchForm
+from .models import Comment, Group, Post
+from .search import get_posts, search
+from .versions import (follow_page_versions, group_page_versions,
+                       index_page_versions, post_page_versions,
+                       profile_page_versions, search_page_versions)
+
+
+@versioned_condition(index_page_versions)
+@versioned_cache_page(index_page_versions, settings.PAGE_CACHE_TIMEOUT)
 def index(request):
     """Home page."""
     # Get data from database
@@ -18,21 +33,32 @@ def index(request):
     switcher_index_link_activated = True
 
     # Get paginator page object and create context
-    page_obj = get_page_object(request, posts, settings.PAGINATOR_LIMIT)
+    page_obj = get_loaded_page_object(
+        request, posts, settings.PAGINATOR_LIMIT,
+        cursor='index' in settings.CURSOR_PAGINATED_VIEWS
+    )
     context = {'page_obj': page_obj, 'index': switcher_index_link_activated}
 
     # Render page with context
     return render(request, 'posts/index.html', context)
 
 
+@versioned_condition(group_page_versions)
+@versioned_cache_page(group_page_versions, settings.PAGE_CACHE_TIMEOUT)
 def group_posts(request, slug):
     """Group posts page."""
-    # Get data from database
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.select_related('author').all()
-
-    # Get paginator page object
-    page_obj = get_page_object(request, posts, settings.PAGINATOR_LIMIT)
+    # Get group and paginator page object from database concurrently
+    # Group join of the slug filter selects group of post cards too
+    posts = Post.objects.select_related('author', 'group').filter(
+        group__slug=slug
+    )
+    group, page_obj = run_concurrently(
+        lambda: get_object_or_404(Group, slug=slug),
+        lambda: get_loaded_page_object(
+            request, posts, settings.PAGINATOR_LIMIT,
+            cursor='group_list' in settings.CURSOR_PAGINATED_VIEWS
+        )
+    )
 
     # Render page with context
     context = {
@@ -42,18 +68,26 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@versioned_condition(profile_page_versions)
+@versioned_cache_page(profile_page_versions, settings.PAGE_CACHE_TIMEOUT)
 def profile(request, username):
     """User profile page."""
-    # Get data from database
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    posts_count = len(posts)
-    following = None
-    if request.user.is_authenticated:
-        following = request.user.follower.filter(author=author).exists()
-
-    # Get paginator page object
-    page_obj = get_page_object(request, posts, settings.PAGINATOR_LIMIT)
+    # Get author and paginator page object from database concurrently,
+    # follow status from follow graph cache
+    posts = Post.objects.select_related('author', 'group').filter(
+        author__username=username
+    )
+    author, page_obj = run_concurrently(
+        lambda: get_object_or_404(
+            User.objects.select_related('stats'), username=username
+        ),
+        lambda: get_loaded_page_object(
+            request, posts, settings.PAGINATOR_LIMIT,
+            cursor='profile' in settings.CURSOR_PAGINATED_VIEWS
+        )
+    )
+    posts_count = get_user_stats(author).posts_count
+    following = get_following(request.user, author)
 
     # Render page with context
     context = {
@@ -65,23 +99,98 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+@versioned_condition(search_page_versions)
+@versioned_cache_page(search_page_versions, settings.PAGE_CACHE_TIMEOUT)
+def post_search(request):
+    """Posts search page."""
+    form = SearchForm(request.GET or None)
+    page_obj = None
+    page_query = ''
+
+    # Get ranked search results from index and posts of the page
+    if form.is_valid():
+        query = form.cleaned_data['q']
+        page_obj = get_page_object(
+            request, search(query), settings.PAGINATOR_LIMIT
+        )
+        page_obj.object_list = get_posts(page_obj.object_list)
+        page_query = urlencode({'q': query}) + '&'
+
+    # Render page with context
+    context = {
+        'form': form,
+        'page_obj': page_obj,
+        'page_query': page_query
+    }
+    return render(request, 'posts/search.html', context)
+
+
+# Page has comment form with CSRF token
+@versioned_condition(post_page_versions, vary_on_csrf=True)
 def post_detail(request, post_id):
     """Post detail page."""
-    # Get data from database
-    post = get_object_or_404(Post, pk=post_id)
-    posts_count = post.author.posts.count()
-    comments = post.comments.all()
+    # Get post and comments page from database concurrently
+    post, comments = run_concurrently(
+        lambda: get_object_or_404(
+            Post.objects.select_related('author__stats', 'group', 'stats'),
+            pk=post_id
+        ),
+        lambda: get_comments_page(request, post_id)
+    )
+    posts_count = get_user_stats(post.author).posts_count
+    comments_count = get_post_stats(post).comments_count
 
     # Render page with context
     context = {
         'post': post,
         'posts_count': posts_count,
+        'comments_count': comments_count,
         'form': CommentForm(),
         'comments': comments
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+@versioned_condition(post_page_versions, vary_on_user=False)
+def post_comments(request, post_id):
+    """Post comments JSON page for "load more" requests."""
+    # Get data from database
+    get_object_or_404(Post.objects.only('pk'), pk=post_id)
+    comments = get_comments_page(request, post_id)
+
+    # Return comments with cursor of the next page
+    return JsonResponse({
+        'comments': [
+            {
+                'id': comment.pk,
+                'author': comment.author.username,
+                'text': comment.text,
+                'created': comment.created,
+            } for comment in comments
+        ],
+        'next_cursor': comments.next_cursor()
+    })
+
+
+def get_following(user, author):
+    """Return whether the user follows the author, None for anonymous."""
+    if not user.is_authenticated:
+        return None
+    return graph.is_following(user.pk, author.pk)
+
+
+def get_comments_page(request, post_id):
+    """Return cursor page of post comments with joined authors."""
+    comments = Comment.objects.select_related('author').filter(
+        post_id=post_id
+    )
+    return get_cursor_page_object(
+        request, comments, settings.COMMENTS_PAGINATOR_LIMIT,
+        ordering=('-created', '-pk'), param='comments'
+    )
+
+
+@primary_db
 @login_required
 def post_create(request):
     """Post create page."""
@@ -101,12 +210,14 @@ def post_create(request):
         return render(request, template, {'form': form})
 
     # POST request: valid form data - create post
-    post = form.save(commit=False)
-    post.author = request.user
-    post.save()
+    with atomic(immediate=True):
+        post = form.save(commit=False)
+        post.author = request.user
+        post.save()
     return redirect(redirect_target, request.user.username)
 
 
+@primary_db
 @login_required
 def post_edit(request, post_id):
     """Post edit page."""
@@ -137,9 +248,34 @@ def post_edit(request, post_id):
         return redirect(redirect_target, post.id)
 
 
+@primary_db
 @login_required
 def add_comment(request, post_id):
     """Add comment page."""
+    if settings.COMMENT_WRITE_BUFFER:
+        return add_buffered_comment(request, post_id)
+    return add_comment_now(request, post_id)
+
+
+def add_buffered_comment(request, post_id):
+    """Add comment through the write buffer, post existence is checked
+    by the buffer writer for the whole batch."""
+    form = CommentForm(request.POST or None)
+    if form.is_valid():
+        comment = form.save(commit=False)
+        comment.author = request.user
+        comment.post_id = post_id
+        # Returns after the comment is committed
+        if not comment_buffer.write_comment(comment):
+            raise Http404
+        # Write of the buffer thread is not seen by the router
+        mark_written()
+    return redirect('posts:post_detail', post_id)
+
+
+@atomic(immediate=True)
+def add_comment_now(request, post_id):
+    """Add comment in the request transaction."""
     # View constants
     redirect_target = 'posts:post_detail'
 
@@ -148,7 +284,7 @@ def add_comment(request, post_id):
 
     # Post request
     form = CommentForm(request.POST or None)
-    if form.is_valid:
+    if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
@@ -158,24 +294,29 @@ def add_comment(request, post_id):
 
 
 @login_required
+@versioned_condition(follow_page_versions)
 def follow_index(request):
     """Follow index page."""
     # View constants
     template = 'posts/follow.html'
     switcher_follow_link_activated = True
 
-    # Get all following posts from database
-    authors = User.objects.filter(following__user=request.user)
-    posts = Post.objects.filter(author__in=authors)
+    # Get all following posts from user feed
+    posts = get_feed(request.user)
 
     # Get paginator page object and prepare context
-    page_obj = get_page_object(request, posts, settings.PAGINATOR_LIMIT)
+    page_obj = get_loaded_page_object(
+        request, posts, settings.PAGINATOR_LIMIT,
+        cursor='follow_index' in settings.CURSOR_PAGINATED_VIEWS
+    )
     context = {'page_obj': page_obj, 'follow': switcher_follow_link_activated}
 
     return render(request, template, context)
 
 
+@primary_db
 @login_required
+@atomic(immediate=True)
 def profile_follow(request, username):
     """Follow author page."""
     # View constants
@@ -184,24 +325,16 @@ def profile_follow(request, username):
     # Get author from database
     author = get_object_or_404(User, username=username)
 
-    # Check constraints
-    # User can't follow himself
-    if request.user == author:
-        return redirect(redirect_target)
-    # User can't follow author more than one time
-    if Follow.objects.filter(user=request.user, author=author).exists():
-        return redirect(redirect_target)
-
-    # Create follow object in db
-    Follow.objects.create(
-        user=request.user,
-        author=author
-    )
+    # Create follow object in db, repeated follow and following
+    # himself are ignored
+    follow(request.user, author)
 
     return redirect(redirect_target)
 
 
+@primary_db
 @login_required
+@atomic(immediate=True)
 def profile_unfollow(request, username):
     """Unfollow author page."""
     # View constants
@@ -211,6 +344,6 @@ def profile_unfollow(request, username):
     author = get_object_or_404(User, username=username)
 
     # Delete follow object in db
-    Follow.objects.filter(user=request.user, author=author).delete()
+    unfollow(request.user, author)
 
     return redirect(redirect_target)
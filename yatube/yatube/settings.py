@@ -45,10 +45,13 @@ INSTALLED_APPS = [
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
+    'api.apps.ApiConfig',
     'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,12 +65,39 @@ ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+# URL namespaces compiled at startup for fast_url tag and build_url()
+FAST_URL_NAMESPACES = ('posts',)
+
+# Production template mode: all templates are compiled at startup and
+# kept in memory with static includes inlined (see core.template_loaders)
+PRECOMPILED_TEMPLATES = (
+    os.environ.get('YATUBE_PRECOMPILED_TEMPLATES') == '1'
+)
+
+# Explicit loaders are not cached by Django, compiled templates are kept
+# by the cached loader unless templates are edited in DEBUG mode
+if PRECOMPILED_TEMPLATES:
+    TEMPLATE_LOADERS_CHAIN = [
+        ('core.template_loaders.Loader', TEMPLATE_LOADERS)
+    ]
+elif not DEBUG:
+    TEMPLATE_LOADERS_CHAIN = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)
+    ]
+else:
+    TEMPLATE_LOADERS_CHAIN = TEMPLATE_LOADERS
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS_CHAIN,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -85,13 +115,54 @@ WSGI_APPLICATION = 'yatube.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 
+# Connections are kept open by worker threads for CONN_MAX_AGE seconds
+CONN_MAX_AGE = int(os.environ.get('YATUBE_CONN_MAX_AGE', 60))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.sqlite_backend',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': CONN_MAX_AGE,
     }
 }
 
+# Read replicas: comma separated paths of SQLite files in
+# YATUBE_DB_REPLICAS (copies of the primary database), opened read-only.
+# Tests run replicas as mirrors of the test database.
+REPLICA_DATABASES = []
+for number, path in enumerate(
+    filter(None, os.environ.get('YATUBE_DB_REPLICAS', '').split(',')), 1
+):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        'ENGINE': 'core.sqlite_backend',
+        'NAME': f'file:{path}?mode=ro',
+        'OPTIONS': {'uri': True},
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(alias)
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+# Client reads go to the primary for seconds after its write
+REPLICA_STICKY_SECONDS = 10
+# Production tuning of SQLite connections (see core.sqlite): WAL journal,
+# commits synced at checkpoints, 5 s busy timeout, 64 MiB page cache,
+# 256 MiB memory-mapped reads, temporary tables in memory.
+# YATUBE_SQLITE_PRAGMAS=0 keeps SQLite defaults.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+} if os.environ.get('YATUBE_SQLITE_PRAGMAS') != '0' else {}
+# Write transactions (core.transaction.atomic(immediate=True)) take the
+# write lock at start, so writers wait for each other instead of failing
+# with "database is locked"; other transactions are DEFERRED, the SQLite
+# default
+SQLITE_TRANSACTION_MODE = 'IMMEDIATE' if SQLITE_PRAGMAS else 'DEFERRED'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -151,7 +222,76 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 # Posts application constants
 
 PAGINATOR_LIMIT = 10
+COMMENTS_PAGINATOR_LIMIT = 20
+# Page links shown before and after the current page number
+PAGE_LINKS_WINDOW = 5
+# Views using keyset (cursor) pagination instead of page numbers:
+# 'index', 'group_list', 'profile', 'follow_index'
+CURSOR_PAGINATED_VIEWS = ()
 TEXT_FIELD_LIMIT = 15
+# JSON API page size, clients may ask for up to API_MAX_LIMIT items
+API_PAGE_LIMIT = 20
+API_MAX_LIMIT = 100
+# Posts in one page of Atom and RSS feeds
+FEED_LIMIT = 20
+# Authors with more followers are merged into follow feeds at read time,
+# their posts are fanned out again when followers drop to
+# FEED_FANOUT_RESUME_LIMIT
+FEED_FANOUT_LIMIT = 1000
+FEED_FANOUT_RESUME_LIMIT = 800
+# Latest author posts delivered to a feed on follow and when the author
+# is fanned out again
+FEED_BACKFILL_LIMIT = 200
+# Follow suggestions are counted from followees of at most
+# SUGGESTION_SOURCES followees of the user
+SUGGESTIONS_LIMIT = 10
+SUGGESTION_SOURCES = 200
+# Post image thumbnails {size name: (geometry, sorl options)} generated
+# in background by THUMBNAIL_WORKERS threads after post save
+POST_THUMBNAILS = {
+    'card': ('960x339', {'crop': 'center', 'upscale': True}),
+}
+THUMBNAIL_WORKERS = 2
+# Off: thumbnails are generated after commit in the committing thread,
+# the test runner turns it off
+THUMBNAIL_ASYNC = True
+TEST_RUNNER = 'core.test_runner.TestRunner'
+# Write-behind buffer of new comments: comments of concurrent requests
+# arrived within COMMENT_BUFFER_DELAY seconds are inserted by one writer
+# thread in one transaction, at most COMMENT_BUFFER_SIZE comments wait.
+# Request not served by the writer in COMMENT_BUFFER_TIMEOUT seconds
+# writes its comment itself
+COMMENT_WRITE_BUFFER = os.environ.get('YATUBE_COMMENT_WRITE_BUFFER') == '1'
+COMMENT_BUFFER_SIZE = 1000
+COMMENT_BUFFER_DELAY = 0.005
+COMMENT_BUFFER_TIMEOUT = 2
+COMMENT_BATCH_SIZE = 200
+# Independent queries of a request run concurrently in QUERY_THREADS
+# threads, each with its own database connection. Off by default: SQLite
+# queries of one process do not overlap enough to pay for thread
+# switches (see benchmark_servers command), enable for server databases.
+CONCURRENT_QUERIES = os.environ.get('YATUBE_CONCURRENT_QUERIES') == '1'
+QUERY_THREADS = 8
+# Threads running Django requests of the ASGI application
+ASGI_THREADS = 16
+# Change log rows older than this are deleted by prune_changelog command
+CHANGELOG_RETENTION_DAYS = 30
+
+# Request metrics: SQL queries budgets by view name, exceeded budget
+# is logged or raises QueryBudgetExceeded in strict mode
+
+QUERY_BUDGETS = {
+    'posts:index': 6,
+    'posts:group_list': 6,
+    'posts:profile': 8,
+    'posts:post_detail': 8,
+    'posts:follow_index': 8,
+    'posts:post_comments': 3,
+    'api:post_list': 3,
+    'api:feed': 6,
+    'api:suggestions': 6,
+}
+QUERY_BUDGET_STRICT = False
 
 # Custom csrf failure handler view 403
 
@@ -164,4 +304,31 @@ CACHES = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
-CACHE_TIMEOUT = 20
+# Cache shared by all worker processes of the host (e.g. gunicorn workers)
+# is enabled with the path of its SQLite file in YATUBE_CACHE_PATH.
+SHARED_CACHE = bool(os.environ.get('YATUBE_CACHE_PATH'))
+if SHARED_CACHE:
+    CACHES['default'] = {
+        'BACKEND': 'core.cache_backends.SQLiteCache',
+        'LOCATION': os.environ['YATUBE_CACHE_PATH'],
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+            'CULL_FREQUENCY': 10,
+        },
+    }
+# Cached data is invalidated by data versions, with the shared cache
+# timeouts only free memory. Versions bumped in a process-local cache are
+# not seen by other worker processes, so there versions and cached data
+# expire after LOCAL_CACHE_TIMEOUT seconds.
+LOCAL_CACHE_TIMEOUT = 20
+VERSION_CACHE_TIMEOUT = None if SHARED_CACHE else LOCAL_CACHE_TIMEOUT
+PAGE_CACHE_TIMEOUT = 60 * 60 if SHARED_CACHE else LOCAL_CACHE_TIMEOUT
+POST_CARD_CACHE_TIMEOUT = (
+    60 * 60 * 24 if SHARED_CACHE else LOCAL_CACHE_TIMEOUT
+)
+# Follow graph arrays are invalidated by versions, suggestions are not
+# invalidated by follows of followees
+FOLLOW_GRAPH_CACHE_TIMEOUT = (
+    60 * 60 * 24 if SHARED_CACHE else LOCAL_CACHE_TIMEOUT
+)
+SUGGESTIONS_CACHE_TIMEOUT = 60 * 10